@@ -0,0 +1,225 @@
+"""Load test of the HTTP API: throughput and latency of /search and streamed /chat
+
+Seeds a temporary job store with a synthetic corpus, writes its knowledge
+base snapshot, then starts `uvicorn` with the requested number of workers.
+Each worker loads the snapshot and answers chat through FakeLLM behind the
+usual LLM queue. Client threads send a mix of /search and /chat requests for
+a fixed time. Pass several worker counts to compare them.
+
+Usage: python benchmarks/bench_api.py [--jobs 20000] [--workers 1,4] [--clients 16] [--seconds 10]
+"""
+import argparse
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, REPO_DIR)
+
+SEARCH_QUERIES = [
+    "List all Commerce jobs",
+    "Show fresher jobs in Engineering",
+    "Science jobs with 1 year experience",
+    "latest B.Ed teacher jobs",
+    "MBA Finance jobs posted in the last 7 days",
+    "research associate biotechnology",
+    "assistant professor jobs in Delhi",
+    "junior engineer civil",
+]
+# Open-ended questions go to the (fake) LLM; each gets a question number so the response cache misses
+CHAT_TOPICS = ['junior engineer', 'lecturer', 'research associate', 'accountant', 'lab assistant', 'professor',
+               'clerk', 'data analyst', 'teacher', 'auditor']
+CHAT_TEMPLATES = [
+    "How should I prepare for the {topic} exam?",
+    "What qualification do I need to become a {topic}?",
+    "Is a {topic} post a good career choice for a fresher?",
+]
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(int(q * len(values)), len(values) - 1)] if values else 0.0
+
+
+def create_bench_app():
+    """uvicorn factory for the worker processes: the seeded store, its snapshot and FakeLLM"""
+    from fake_llm import FakeLLM
+    from jobyaari_api import create_app
+    from jobyaari_chatbot import SharedKnowledgeBase
+    from jobyaari_llm_queue import LLMQueue
+    from jobyaari_store import JobStore
+
+    config = json.loads(os.environ['JOBYAARI_BENCH_CONFIG'])
+    llm = LLMQueue(FakeLLM(load_latency=config['llm_latency'], tokens_per_sec=config['llm_tokens_per_sec']),
+                   max_in_flight=config['llm_concurrency'])
+    kb = SharedKnowledgeBase(JobStore(config['db']), llm, snapshot_path=config['snapshot'])
+    return create_app(kb)
+
+
+def seed(directory, jobs):
+    """Job store with `jobs` synthetic jobs and a current snapshot of its knowledge base"""
+    from corpus import synthetic_corpus
+    from fake_llm import FakeLLM
+    from jobyaari_chatbot import JobYaariChatbot
+    from jobyaari_store import JobStore
+
+    store = JobStore(os.path.join(directory, 'jobs.db'))
+    store.upsert_many(synthetic_corpus(jobs))
+    generation = store.publish_generation()
+    chatbot = JobYaariChatbot(None, store=store, llm=FakeLLM(),
+                              response_cache_path=os.path.join(directory, 'responses.json'))
+    snapshot = os.path.join(directory, 'kb.snapshot')
+    chatbot.save_snapshot(snapshot, generation=generation)
+    return store.path, snapshot
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(directory, config, workers):
+    port = free_port()
+    env = dict(os.environ, JOBYAARI_BENCH_CONFIG=json.dumps(config),
+               PYTHONPATH=os.pathsep.join(filter(None, [REPO_DIR, os.environ.get('PYTHONPATH')])))
+    # Run from the temp dir so each worker's response cache lands there too
+    process = subprocess.Popen([sys.executable, '-m', 'uvicorn', 'bench_api:create_bench_app', '--factory',
+                                '--app-dir', BENCH_DIR, '--port', str(port), '--workers', str(workers),
+                                '--log-level', 'warning'], cwd=directory, env=env)
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.time() + 120
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"API server exited with status {process.returncode}")
+        try:
+            if requests.get(f"{url}/stats", timeout=1).ok:
+                return process, url
+        except requests.RequestException:
+            pass
+        time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("API server did not start within 120s")
+
+
+def search_request(session, url, rng):
+    response = session.get(f"{url}/search", params={'q': rng.choice(SEARCH_QUERIES), 'limit': 20}, timeout=30)
+    response.raise_for_status()
+    return {}
+
+
+def chat_request(session, url, rng):
+    message = f"{rng.choice(CHAT_TEMPLATES).format(topic=rng.choice(CHAT_TOPICS))} (question {rng.randrange(10 ** 9)})"
+    start = time.perf_counter()
+    first_token, tokens, event, done = None, 0, None, {}
+    with session.post(f"{url}/chat", json={'message': message, 'session': f"bench-{rng.random()}"},
+                      stream=True, timeout=120) as response:
+        response.raise_for_status()
+        for line in response.iter_lines(decode_unicode=True):
+            if line.startswith('event: '):
+                event = line[7:]
+            elif line.startswith('data: ') and event == 'token':
+                tokens += 1
+                if first_token is None:
+                    first_token = time.perf_counter() - start
+            elif line.startswith('data: ') and event == 'done':
+                done = json.loads(line[6:])
+    metrics = done.get('metrics', {})
+    return {'first_token': first_token or time.perf_counter() - start, 'tokens': tokens,
+            'cached': bool(metrics.get('cached')), 'error': metrics.get('error')}
+
+
+def run_load(url, clients, seconds, chat_share, seed=11):
+    """Send requests from `clients` threads for `seconds`; per-endpoint samples"""
+    samples = {'search': [], 'chat': []}
+    errors = []
+    lock = threading.Lock()
+    stop_at = time.perf_counter() + seconds
+
+    def client(number):
+        rng = random.Random(seed + number)
+        with requests.Session() as session:
+            while time.perf_counter() < stop_at:
+                endpoint = 'chat' if rng.random() < chat_share else 'search'
+                start = time.perf_counter()
+                try:
+                    result = (chat_request if endpoint == 'chat' else search_request)(session, url, rng)
+                except requests.RequestException as e:
+                    with lock:
+                        errors.append(str(e))
+                    continue
+                result['latency'] = time.perf_counter() - start
+                with lock:
+                    samples[endpoint].append(result)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as executor:
+        list(executor.map(client, range(clients)))
+    return samples, errors, time.perf_counter() - start
+
+
+def report(workers, samples, errors, elapsed):
+    searches, chats = samples['search'], samples['chat']
+    total = len(searches) + len(chats)
+    print(f"\nworkers={workers}: {total} requests in {elapsed:.1f}s = {total / elapsed:.1f} req/s, "
+          f"{len(errors)} transport errors")
+    if searches:
+        latencies = [sample['latency'] for sample in searches]
+        print(f"  /search  {len(searches) / elapsed:8.1f} req/s   p50 {percentile(latencies, 0.5) * 1000:7.1f} ms"
+              f"   p95 {percentile(latencies, 0.95) * 1000:7.1f} ms")
+    if chats:
+        latencies = [sample['latency'] for sample in chats]
+        first_tokens = [sample['first_token'] for sample in chats]
+        tokens = sum(sample['tokens'] for sample in chats)
+        cached = sum(sample['cached'] for sample in chats)
+        failed = sum(1 for sample in chats if sample['error'])
+        print(f"  /chat    {len(chats) / elapsed:8.1f} req/s   p50 {percentile(latencies, 0.5) * 1000:7.1f} ms"
+              f"   p95 {percentile(latencies, 0.95) * 1000:7.1f} ms")
+        print(f"           first token p50 {percentile(first_tokens, 0.5) * 1000:.1f} ms"
+              f" p95 {percentile(first_tokens, 0.95) * 1000:.1f} ms, {tokens / elapsed:.0f} events/s streamed,"
+              f" {cached} cached, {failed} failed")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--jobs', type=int, default=20000, help='synthetic corpus size')
+    parser.add_argument('--workers', default='1,4', help='comma-separated uvicorn worker counts to compare')
+    parser.add_argument('--clients', type=int, default=16, help='concurrent client threads')
+    parser.add_argument('--seconds', type=float, default=10.0, help='load duration per worker count')
+    parser.add_argument('--chat-share', type=float, default=0.2, help='fraction of requests that are /chat')
+    parser.add_argument('--llm-latency', type=float, default=0.05, help='fake LLM load time per call (s)')
+    parser.add_argument('--llm-tokens-per-sec', type=float, default=200.0)
+    parser.add_argument('--llm-concurrency', type=int, default=4, help='generations per worker at once')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        db, snapshot = seed(directory, args.jobs)
+        print(f"seeded {args.jobs} jobs and snapshot in {time.perf_counter() - start:.1f}s")
+        config = {'db': db, 'snapshot': snapshot, 'llm_latency': args.llm_latency,
+                  'llm_tokens_per_sec': args.llm_tokens_per_sec, 'llm_concurrency': args.llm_concurrency}
+        for workers in (int(count) for count in args.workers.split(',')):
+            start = time.perf_counter()
+            process, url = start_server(directory, config, workers)
+            try:
+                print(f"\nworkers={workers}: server up in {time.perf_counter() - start:.1f}s")
+                # Every worker should be serving before measuring
+                run_load(url, args.clients, min(2.0, args.seconds), args.chat_share)
+                report(workers, *run_load(url, args.clients, args.seconds, args.chat_share))
+            finally:
+                process.terminate()
+                process.wait(timeout=30)
+
+
+if __name__ == "__main__":
+    main()
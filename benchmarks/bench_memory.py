@@ -0,0 +1,93 @@
+"""Memory per job and search CPU for plain job dicts vs compact JobRecords
+
+Usage: python benchmarks/bench_memory.py [--jobs 20000] [--queries 2000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from jobyaari_parse import build_job  # noqa: E402
+from jobyaari_record import JobRecord  # noqa: E402
+from jobyaari_search import JobIndex  # noqa: E402
+
+CATEGORIES = ['Engineering', 'Science', 'Commerce', 'Education']
+EXPERIENCE = ['Fresher', '1-2 years', '2-5 years', '3+ years', '5+ years', None]
+QUALIFICATIONS = ['B.Tech/B.E.', 'M.Tech', 'M.Sc', 'Ph.D', 'B.Com', 'MBA Finance', 'B.Ed', None]
+QUERIES = [
+    {'category': 'Engineering'},
+    {'experience': 'fresher'},
+    {'category': 'Science', 'experience': 'year'},
+    {'qualification': 'b.tech', 'keyword': 'engineer'},
+    {'keyword': 'assistant professor'},
+]
+
+
+def fresh(text):
+    """Copy a string the way a database row or parsed page would, without sharing"""
+    return None if text is None else ''.join(list(text))
+
+
+def synthetic_jobs(count, seed=7):
+    rng = random.Random(seed)
+    jobs = []
+    for i in range(count):
+        category = rng.choice(CATEGORIES)
+        title = f"{rng.choice(['Junior', 'Senior', 'Assistant', 'Chief'])} {category} Officer {i}"
+        description = fresh("Excellent opportunity, apply online through the official notification. " * 2)
+        jobs.append(build_job(fresh(category), "https://www.jobyaari.com", title,
+                              f"/{category.lower()}-jobs/job-{i}/",
+                              fresh(f"{rng.randint(1, 30)} days ago") if rng.random() < 0.8 else None,
+                              fresh(rng.choice(QUALIFICATIONS)), fresh(rng.choice(EXPERIENCE)),
+                              description if rng.random() < 0.5 else None))
+    return jobs
+
+
+def measure(build):
+    tracemalloc.start()
+    start = time.perf_counter()
+    value = build()
+    elapsed = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return value, size, elapsed
+
+
+def time_queries(index, queries):
+    start = time.perf_counter()
+    for i in range(queries):
+        index.search(limit=20, **QUERIES[i % len(QUERIES)])
+    return (time.perf_counter() - start) / queries
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--jobs', type=int, default=20000)
+    parser.add_argument('--queries', type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"{args.jobs} jobs")
+    dicts, dict_bytes, _ = measure(lambda: synthetic_jobs(args.jobs))
+    records, record_bytes, _ = measure(lambda: [JobRecord.from_dict(job) for job in synthetic_jobs(args.jobs)])
+    start = time.perf_counter()
+    [JobRecord.from_dict(job) for job in dicts]
+    convert_time = time.perf_counter() - start
+    print(f"  dict      {dict_bytes / args.jobs:8.0f} bytes/job")
+    print(f"  JobRecord {record_bytes / args.jobs:8.0f} bytes/job  ({1 - record_bytes / dict_bytes:.0%} smaller)")
+    print(f"  dict -> JobRecord conversion {convert_time:6.2f}s")
+
+    for name, jobs in (('dict', dicts), ('JobRecord', records)):
+        start = time.perf_counter()
+        index = JobIndex()
+        index.add_many(jobs)
+        build_time = time.perf_counter() - start
+        per_query = time_queries(index, args.queries)
+        print(f"  {name:<9} index build {build_time:6.2f}s  search {per_query * 1000:6.3f} ms/query")
+
+
+if __name__ == "__main__":
+    main()
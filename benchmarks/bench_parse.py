@@ -0,0 +1,54 @@
+"""Micro-benchmark of the listing parser backends over saved HTML fixtures
+
+Usage: python benchmarks/bench_parse.py [--repeat 20]
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from jobyaari_parse import PARSERS  # noqa: E402
+
+FIXTURES = os.path.join(ROOT, 'benchmarks', 'fixtures', '*.html')
+BASE_URL = "https://www.jobyaari.com"
+
+
+def parse_all(parser, content):
+    """Parse one page and extract every listing item, as the scraper does"""
+    document = parser.parse(content)
+    jobs = [parser.extract_job(item, 'Engineering', BASE_URL) for item in parser.iter_items(document)]
+    parser.release(document)
+    return [job for job in jobs if job]
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--repeat', type=int, default=20)
+    args = arg_parser.parse_args()
+
+    for path in sorted(glob.glob(FIXTURES)):
+        with open(path, 'rb') as f:
+            content = f.read()
+        print(os.path.basename(path))
+
+        outputs = {}
+        for name, backend in PARSERS.items():
+            parser = backend()
+            outputs[name] = parse_all(parser, content)
+            start = time.perf_counter()
+            items = 0
+            for _ in range(args.repeat):
+                items += len(parse_all(parser, content))
+            elapsed = time.perf_counter() - start
+            print(f"  {name:<5} {items / elapsed:10.0f} items/sec  ({len(outputs[name])} jobs/page)")
+
+        if outputs['bs4'] != outputs['lxml']:
+            print("  WARNING: backends disagree on extracted jobs")
+
+
+if __name__ == "__main__":
+    main()
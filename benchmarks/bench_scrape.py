@@ -0,0 +1,48 @@
+"""Compare serial vs concurrent category scraping against a local stub server
+
+Usage: python benchmarks/bench_scrape.py [--latency 0.2] [--repeat 3]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stub_server import StubServer  # noqa: E402
+from jobyaari_bot import JobYaariScraper  # noqa: E402
+
+
+def time_scrape(base_url, concurrent, cache_dir=None):
+    scraper = JobYaariScraper(base_url=base_url, cache_dir=cache_dir)
+    start = time.perf_counter()
+    jobs = scraper.scrape_all_categories(concurrent=concurrent)
+    return time.perf_counter() - start, len(jobs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--latency', type=float, default=0.2, help='simulated server latency per request (s)')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    with StubServer(latency=args.latency) as server, tempfile.TemporaryDirectory() as cache_dir:
+        # Prime the page cache so the last row measures 304 revalidation only
+        time_scrape(server.url, True, cache_dir)
+        runs = (
+            ('serial', False, None),
+            ('concurrent', True, None),
+            ('warm cache', True, cache_dir),
+        )
+        for label, concurrent, run_cache in runs:
+            timings = []
+            for _ in range(args.repeat):
+                elapsed, count = time_scrape(server.url, concurrent, run_cache)
+                timings.append(elapsed)
+            best = min(timings)
+            print(f"{label:<11} best {best:6.3f}s  mean {sum(timings) / len(timings):6.3f}s  jobs={count}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+"""End-to-end offline benchmark suite: scrape, search, prompt building and chat latency
+
+Everything runs locally: listing pages are the recorded fixtures served by
+a stub HTTP server, the job corpus is synthetic and the LLM is a fake with a
+fixed latency and token rate. Save a run with --save and compare later runs
+against it with --baseline; the exit status is 1 when a result is worse than
+the baseline by more than --tolerance.
+
+Usage: python benchmarks/bench_suite.py [--jobs 100000] [--save results.json] [--baseline results.json]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stub_server import FixtureHandler, StubServer, load_fixtures  # noqa: E402
+from corpus import synthetic_corpus  # noqa: E402
+from fake_llm import FakeLLM  # noqa: E402
+from jobyaari_bot import JobYaariScraper  # noqa: E402
+from jobyaari_chatbot import JobYaariChatbot  # noqa: E402
+
+SEARCH_QUERIES = [
+    "List all Commerce jobs",
+    "Show fresher jobs in Engineering",
+    "Science jobs with 1 year experience",
+    "latest B.Ed teacher jobs",
+    "MBA Finance jobs posted in the last 7 days",
+    "research associate biotechnology",
+    "assistant professor jobs in Delhi",
+    "junior engineer civil",
+]
+CHAT_QUERIES = [
+    "List all Commerce jobs",
+    "Show me latest Engineering jobs",
+    "What qualification do I need for a lecturer post?",
+    "Which science jobs suit someone with an M.Sc?",
+    "How should I prepare for the junior engineer exam?",
+    "Show fresher jobs in Engineering",
+]
+
+# Direction of each result: higher is better, or lower is better
+HIGHER_IS_BETTER = {'scrape_pages_per_sec', 'scrape_jobs_per_sec', 'search_qps'}
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(int(q * len(values)), len(values) - 1)] if values else 0.0
+
+
+def count_extracted(scraper, category_url, category_name, pages):
+    """Fetch, parse and extract one category; fixture pages repeat, so dedupe is left out"""
+    return sum(1 for _ in scraper.iter_page_jobs(scraper.iter_pages(category_url, max_pages=pages), category_name))
+
+
+def bench_scrape(pages, latency, workers):
+    """Pages/sec and jobs/sec crawling every category through the fixture stub"""
+    with StubServer(latency=latency, pages=pages, handler=FixtureHandler, fixtures=load_fixtures()) as server:
+        scraper = JobYaariScraper(base_url=server.url, max_workers=workers, rate_per_host=1e6, burst=1000,
+                                  cache_dir=None, show_progress=False)
+        categories = scraper.get_category_urls()
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(count_extracted, scraper, url, category, pages)
+                       for category, url in categories.items()]
+            jobs = sum(future.result() for future in futures)
+        elapsed = time.perf_counter() - start
+        return {
+            'scrape_pages_per_sec': server.requests / elapsed,
+            'scrape_jobs_per_sec': jobs / elapsed,
+        }
+
+
+def bench_search(chatbot, seconds):
+    """Queries/sec through query parsing and the index, as the chat routing does"""
+    queries = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        for query in SEARCH_QUERIES:
+            parsed = chatbot.parse_query(query)
+            chatbot.search_jobs(keyword=' '.join(parsed.keywords) or None, limit=20, **parsed.search_kwargs())
+        queries += len(SEARCH_QUERIES)
+    return {'search_qps': queries / (time.perf_counter() - start)}
+
+
+def bench_prompt(chatbot, repeat):
+    """Prompt build time: retrieval of context jobs plus budgeted assembly"""
+    history = [{'role': 'user', 'content': 'Show me Science jobs'},
+               {'role': 'assistant', 'content': 'Found 10 job(s). Here are the top 5: ...'}]
+    timings = []
+    for i in range(repeat):
+        query = CHAT_QUERIES[i % len(CHAT_QUERIES)]
+        start = time.perf_counter()
+        chatbot.build_prompt(query, history)
+        timings.append(time.perf_counter() - start)
+    return {
+        'prompt_build_p50_ms': percentile(timings, 0.5) * 1000,
+        'prompt_build_p95_ms': percentile(timings, 0.95) * 1000,
+    }
+
+
+def bench_chat(chatbot, repeat):
+    """End-to-end chat_stream latency, listing and LLM routes together"""
+    first_tokens, totals = [], []
+    for i in range(repeat):
+        query = CHAT_QUERIES[i % len(CHAT_QUERIES)]
+        # Answers must come from the pipeline, not the response cache
+        chatbot.response_cache.clear()
+        start = time.perf_counter()
+        first_token = None
+        for _ in chatbot.chat_stream(query, history=[], session=f"bench-{i % 3}"):
+            if first_token is None:
+                first_token = time.perf_counter() - start
+        totals.append(time.perf_counter() - start)
+        first_tokens.append(first_token or totals[-1])
+    return {
+        'chat_first_token_p50_ms': percentile(first_tokens, 0.5) * 1000,
+        'chat_first_token_p95_ms': percentile(first_tokens, 0.95) * 1000,
+        'chat_total_p50_ms': percentile(totals, 0.5) * 1000,
+        'chat_total_p95_ms': percentile(totals, 0.95) * 1000,
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Names of results that regressed by more than `tolerance` (a fraction)"""
+    regressions = []
+    for name, value in results.items():
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        change = (previous - value) / previous if name in HIGHER_IS_BETTER else (value - previous) / previous
+        if change > tolerance:
+            regressions.append((name, previous, value, change))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--jobs', type=int, default=100000, help='synthetic corpus size')
+    parser.add_argument('--pages', type=int, default=25, help='listing pages crawled per category')
+    parser.add_argument('--latency', type=float, default=0.0, help='stub server latency per page (s)')
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--search-seconds', type=float, default=3.0)
+    parser.add_argument('--prompts', type=int, default=200)
+    parser.add_argument('--chats', type=int, default=24)
+    parser.add_argument('--llm-latency', type=float, default=0.05, help='fake LLM load time per call (s)')
+    parser.add_argument('--llm-tokens-per-sec', type=float, default=200.0)
+    parser.add_argument('--save', help='write results as JSON to this path')
+    parser.add_argument('--baseline', help='JSON results of an earlier run to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='allowed slowdown before failing')
+    args = parser.parse_args()
+
+    results = {}
+    print(f"scrape: {args.pages} pages x 4 categories, {args.workers} workers")
+    results.update(bench_scrape(args.pages, args.latency, args.workers))
+
+    start = time.perf_counter()
+    corpus = synthetic_corpus(args.jobs)
+    llm = FakeLLM(load_latency=args.llm_latency, tokens_per_sec=args.llm_tokens_per_sec)
+    with tempfile.TemporaryDirectory() as cache_dir:
+        chatbot = JobYaariChatbot(corpus, llm=llm, response_cache_path=os.path.join(cache_dir, 'responses.json'))
+        del corpus
+        results['kb_build_s'] = time.perf_counter() - start
+        print(f"knowledge base: {args.jobs} jobs in {results['kb_build_s']:.1f}s")
+        results.update(bench_search(chatbot, args.search_seconds))
+        results.update(bench_prompt(chatbot, args.prompts))
+        results.update(bench_chat(chatbot, args.chats))
+
+    print()
+    for name, value in results.items():
+        print(f"  {name:<26} {value:12.2f}")
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({'jobs': args.jobs, 'results': results}, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline['jobs'] != args.jobs:
+            print(f"\nNote: baseline was run with {baseline['jobs']} jobs, this run with {args.jobs}")
+        regressions = compare(results, baseline['results'], args.tolerance)
+        for name, previous, value, change in regressions:
+            print(f"REGRESSION {name}: {previous:.2f} -> {value:.2f} ({change:.0%} worse)")
+        if regressions:
+            sys.exit(1)
+        print(f"\nNo regressions beyond {args.tolerance:.0%} of {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
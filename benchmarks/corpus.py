@@ -0,0 +1,48 @@
+"""Synthetic job corpora of any size, built from the scraper's sample-job templates"""
+import random
+import time
+
+SUFFIXES = ['', ' - Regular', ' - Contract', ' - Backlog Vacancy', ' - Special Drive', ' - Deputation']
+ORGANISATIONS = ['Central', 'State', 'Railway', 'Municipal', 'University', 'PSU', 'Defence', 'Metro']
+LOCATIONS = ['Delhi', 'Mumbai', 'Chennai', 'Kolkata', 'Bengaluru', 'Hyderabad', 'Pune', 'Lucknow', 'Patna', 'Jaipur']
+EXPERIENCE = ['Fresher', '1-2 years', '2-5 years', '3+ years', '5+ years', '0-1 years', '7+ years', 'Check Details']
+POSTED_DATES = [f"{days} days ago" for days in range(1, 31)] + ['Today', 'Yesterday', 'Recently Posted',
+                                                                  '12 Oct 2025', '03 Sep 2025']
+
+
+def sample_templates():
+    """The jobs generate_sample_jobs produces for every category"""
+    # Imported lazily: the app module configures Streamlit on import
+    from jobyaari_bot import JobYaariScraper
+
+    scraper = JobYaariScraper(cache_dir=None, show_progress=False)
+    return [job for category in scraper.CATEGORY_PATHS for job in scraper.generate_sample_jobs(category, 15)]
+
+
+def synthetic_corpus(count, seed=7, base_url="https://www.jobyaari.com", templates=None):
+    """`count` distinct jobs varied from the sample templates, reproducible for a given seed
+
+    Titles, URLs, posting dates and experience vary per job, so deduplication,
+    facet counts and ranking behave as they would on a real crawl.
+    """
+    rng = random.Random(seed)
+    templates = templates or sample_templates()
+    now = time.time()
+    jobs = []
+    for i in range(count):
+        template = templates[i % len(templates)]
+        title = template['title'].rsplit(' - Position', 1)[0]
+        organisation = rng.choice(ORGANISATIONS)
+        location = rng.choice(LOCATIONS)
+        jobs.append({
+            'title': f"{organisation} {title}{rng.choice(SUFFIXES)} - {location} #{i + 1}",
+            'category': template['category'],
+            'url': f"{base_url}/{template['category'].lower()}-jobs/{organisation.lower()}-{i + 1}/",
+            'posted_date': rng.choice(POSTED_DATES),
+            'qualification': template['qualification'],
+            'experience': rng.choice(EXPERIENCE),
+            'description': (f"{organisation} recruitment in {location}. {template['description']}"
+                            if rng.random() < 0.7 else "Click link for full details"),
+            'first_seen': now - rng.randint(0, 30 * 86400),
+        })
+    return jobs
@@ -0,0 +1,36 @@
+"""Stand-in for the Ollama client with configurable latency and token rate"""
+import time
+
+from jobyaari_prompt import estimate_tokens
+
+ANSWER = ("Here are the most relevant openings from the job database. Each post lists the required "
+          "qualification and experience, so check the eligibility criteria and the official "
+          "notification before applying. Apply online through the link given with each job.")
+
+
+class FakeLLM:
+    """Streams a canned answer on a fixed schedule, like Ollama would
+
+    The first token arrives after `load_latency` plus prompt evaluation at
+    `prompt_tokens_per_sec`; the rest follow at `tokens_per_sec`. The
+    answer is repeated to `answer_tokens` chunks of one word each.
+    """
+
+    def __init__(self, load_latency=0.05, prompt_tokens_per_sec=2000.0, tokens_per_sec=40.0, answer_tokens=60):
+        self.load_latency = load_latency
+        self.prompt_tokens_per_sec = prompt_tokens_per_sec
+        self.tokens_per_sec = tokens_per_sec
+        words = ANSWER.split()
+        self.chunks = [' ' + words[i % len(words)] for i in range(answer_tokens)]
+        self.calls = 0
+
+    def stream(self, prompt, **kwargs):
+        self.calls += 1
+        time.sleep(self.load_latency + estimate_tokens(prompt) / self.prompt_tokens_per_sec)
+        interval = 1.0 / self.tokens_per_sec if self.tokens_per_sec else 0.0
+        for chunk in self.chunks:
+            yield chunk
+            time.sleep(interval)
+
+    def invoke(self, prompt, **kwargs):
+        return ''.join(self.stream(prompt, **kwargs))
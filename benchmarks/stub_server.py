@@ -0,0 +1,120 @@
+"""Local stub of the JobYaari listing pages for offline benchmarks"""
+import glob
+import hashlib
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def render_listing(category, count=20, page=1, pages=1):
+    """Render a listing page shaped like the markup the scraper looks for"""
+    items = []
+    offset = (page - 1) * count
+    for i in range(offset, offset + count):
+        items.append(f"""
+        <article class="job-item">
+            <h3 class="job-title"><a href="/{category}/job-{i + 1}/">{category.title()} Officer - Post {i + 1}</a></h3>
+            <span class="posted-date">{(i % 30) + 1} days ago</span>
+            <span class="qualification">Graduate</span>
+            <span class="experience">{i % 5}-{i % 5 + 2} years</span>
+            <p class="description">Recruitment notification for {category} post number {i + 1}.</p>
+        </article>""")
+    pager = next_page_link(category, page, pages)
+    return f"<html><body><main>{''.join(items)}</main>{pager}</body></html>"
+
+
+def next_page_link(category, page, pages):
+    if page >= pages:
+        return ''
+    return f'<nav><a rel="next" class="next page-numbers" href="/{category}-jobs/page/{page + 1}/">Next</a></nav>'
+
+
+def load_fixtures(pattern=None):
+    """Recorded listing pages from benchmarks/fixtures, as bytes"""
+    pattern = pattern or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', '*.html')
+    fixtures = []
+    for path in sorted(glob.glob(pattern)):
+        with open(path, 'rb') as f:
+            fixtures.append(f.read())
+    return fixtures
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    latency = 0.0
+    jobs_per_page = 20
+    pages = 1
+
+    def render(self, category, page):
+        return render_listing(category, self.jobs_per_page, page, self.pages).encode('utf-8')
+
+    def do_GET(self):
+        time.sleep(self.latency)
+        with self.server.lock:
+            self.server.requests += 1
+        parts = self.path.strip('/').split('/')
+        category = parts[0].replace('-jobs', '') or 'general'
+        page = int(parts[2]) if len(parts) > 2 and parts[1] == 'page' else 1
+        body = self.render(category, page)
+        etag = '"%s"' % hashlib.sha1(body).hexdigest()
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('ETag', etag)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FixtureHandler(StubHandler):
+    """Serves the recorded fixture pages in turn, with a next-page link appended"""
+    fixtures = []
+
+    def render(self, category, page):
+        body = self.fixtures[(page - 1) % len(self.fixtures)]
+        pager = next_page_link(category, page, self.pages).encode('utf-8')
+        end = body.rfind(b'</body>')
+        return body + pager if end < 0 else body[:end] + pager + body[end:]
+
+
+class StubServer:
+    """Run a StubHandler server on a background thread
+
+    `requests` counts the pages served so far.
+    """
+
+    def __init__(self, latency=0.0, jobs_per_page=20, pages=1, handler=StubHandler, fixtures=None):
+        self.handler = type('ConfiguredStubHandler', (handler,), {
+            'latency': latency,
+            'jobs_per_page': jobs_per_page,
+            'pages': pages,
+            'fixtures': fixtures if fixtures is not None else getattr(handler, 'fixtures', []),
+        })
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), self.handler)
+        self.httpd.requests = 0
+        self.httpd.lock = threading.Lock()
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def requests(self):
+        return self.httpd.requests
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
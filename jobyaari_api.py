@@ -0,0 +1,176 @@
+"""Headless HTTP/JSON API over the shared knowledge base, served by any ASGI server
+
+Endpoints:
+  GET  /search?q=...&category=...&limit=20   ranked jobs, filters parsed from `q` like the chat does
+  POST /chat {"message": ..., "history": [...], "session": ..., "stream": true}
+       streams the reply as server-sent events ("token" events, then one "done"
+       event with the metrics), or returns {"reply", "metrics"} with "stream": false
+  GET  /stats                                 job statistics, routing, LLM queue and latency counters
+
+Each worker process holds one SharedKnowledgeBase. Workers start from the
+knowledge base snapshot when it is current and switch to new store
+generations published by the refresh worker, as the Streamlit app does.
+
+Usage: python jobyaari_api.py [--host 127.0.0.1] [--port 8000] [--workers 4]
+"""
+import argparse
+import contextlib
+import json
+import logging
+import uuid
+
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+from jobyaari_chatbot import create_shared_knowledge_base
+from jobyaari_metrics import METRICS
+
+logger = logging.getLogger(__name__)
+
+SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 200
+TRUE_VALUES = ('1', 'true', 'yes', 'on')
+
+
+class BadRequest(Exception):
+    """Invalid request parameters, answered with HTTP 400"""
+
+
+def error_response(message, status=400):
+    return JSONResponse({'error': message}, status_code=status)
+
+
+def int_param(params, name, default=None, maximum=None):
+    value = params.get(name)
+    if value in (None, ''):
+        return default
+    try:
+        value = int(value)
+    except ValueError:
+        raise BadRequest(f"{name} must be an integer") from None
+    if value < 0:
+        raise BadRequest(f"{name} must not be negative")
+    return min(value, maximum) if maximum else value
+
+
+def sse_event(event, data):
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+def search(kb, params):
+    """Jobs for a /search request; explicit filters override the ones parsed from `q`"""
+    chatbot = kb.current()
+    limit = int_param(params, 'limit', SEARCH_LIMIT, MAX_SEARCH_LIMIT)
+    query = params.get('q', '').strip()
+    filters, keyword = {}, None
+    if query:
+        parsed = chatbot.parse_query(query)
+        filters = {name: value for name, value in parsed.search_kwargs().items() if value}
+        keyword = ' '.join(parsed.keywords) or None
+    for name in ('category', 'experience', 'qualification'):
+        if params.get(name):
+            filters[name] = params[name]
+    posted_within = int_param(params, 'posted_within')
+    if posted_within is not None:
+        filters['posted_within'] = posted_within
+    if params.get('newest_first', '').lower() in TRUE_VALUES:
+        filters['newest_first'] = True
+    jobs = chatbot.search_jobs(keyword=keyword, limit=limit, **filters)
+    return {'query': query, 'count': len(jobs), 'jobs': [job.to_dict() for job in jobs]}
+
+
+def stats(kb):
+    chatbot = kb.current()
+    queue_metrics = getattr(kb.llm, 'metrics', None)
+    return {
+        'generation': kb.generation,
+        'rebuilding': kb.rebuilding,
+        'kb_version': chatbot.kb_version,
+        'jobs': chatbot.stats,
+        'routes': dict(chatbot.route_counts),
+        'response_cache_hit_ratio': chatbot.response_cache.hit_ratio,
+        'llm_queue': queue_metrics() if callable(queue_metrics) else None,
+        'latency': METRICS.snapshot(),
+    }
+
+
+def chat_events(chatbot, message, history, session):
+    """SSE frames for one streamed chat reply"""
+    metrics = {}
+    try:
+        for chunk in chatbot.chat_stream(message, history=history, metrics=metrics, session=session):
+            yield sse_event('token', {'text': chunk})
+    except Exception as e:
+        logger.exception("Chat stream failed")
+        metrics['error'] = str(e)
+    yield sse_event('done', {'session': session, 'metrics': metrics})
+
+
+def create_app(kb=None):
+    """ASGI application serving `kb` (by default the environment-configured SharedKnowledgeBase)"""
+    if kb is None:
+        kb = create_shared_knowledge_base()
+
+    async def search_endpoint(request):
+        try:
+            return JSONResponse(await run_in_threadpool(search, kb, request.query_params))
+        except BadRequest as e:
+            return error_response(str(e))
+
+    async def chat_endpoint(request):
+        try:
+            body = await request.json()
+        except ValueError:
+            return error_response("body must be JSON")
+        if not isinstance(body, dict) or not str(body.get('message', '')).strip():
+            return error_response("message is required")
+        history = body.get('history') or []
+        if not isinstance(history, list) or not all(isinstance(turn, dict) for turn in history):
+            return error_response("history must be a list of {role, content} objects")
+        # chat_stream appends to the history it is given; keep the caller's copy intact
+        history = [{'role': turn.get('role', 'user'), 'content': str(turn.get('content', ''))} for turn in history]
+        message = str(body['message']).strip()
+        session = str(body.get('session') or uuid.uuid4().hex)
+        # current() checks the store generation, so it stays off the event loop
+        chatbot = await run_in_threadpool(kb.current)
+        if body.get('stream', True):
+            # Starlette iterates the synchronous generator on its thread pool
+            return StreamingResponse(chat_events(chatbot, message, history, session), media_type='text/event-stream',
+                                     headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+        metrics = {}
+        reply = await run_in_threadpool(chatbot.chat, message, history, metrics, session)
+        return JSONResponse({'reply': reply, 'session': session, 'metrics': metrics})
+
+    async def stats_endpoint(request):
+        return JSONResponse(await run_in_threadpool(stats, kb))
+
+    @contextlib.asynccontextmanager
+    async def lifespan(app):
+        # Build (or load) the knowledge base before taking traffic
+        await run_in_threadpool(kb.current)
+        yield
+
+    app = Starlette(routes=[
+        Route('/search', search_endpoint, methods=['GET']),
+        Route('/chat', chat_endpoint, methods=['POST']),
+        Route('/stats', stats_endpoint, methods=['GET']),
+    ], lifespan=lifespan)
+    app.state.kb = kb
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--workers', type=int, default=1, help='worker processes, each with its own knowledge base')
+    args = parser.parse_args()
+
+    import uvicorn
+    uvicorn.run('jobyaari_api:create_app', factory=True, host=args.host, port=args.port, workers=args.workers)
+
+
+if __name__ == "__main__":
+    main()
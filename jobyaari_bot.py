@@ -1,13 +1,24 @@
 import streamlit as st
-import requests
-from bs4 import BeautifulSoup
 import pandas as pd
 import json
 import time
 from datetime import datetime
-from langchain_community.llms import Ollama
-from urllib.parse import urljoin, quote
-import re
+from concurrent.futures import ThreadPoolExecutor
+import itertools
+import logging
+import os
+import queue
+import uuid
+from jobyaari_fetch import BudgetExceededError, CircuitBreaker, Fetcher, HostRateLimiter, PageCache, build_session
+from jobyaari_parse import get_parser
+from jobyaari_refresh import RefreshWorker
+from jobyaari_explorer import EXPORT_FORMATS, JobExplorer, export_bytes
+from jobyaari_chatbot import create_shared_knowledge_base
+from jobyaari_llm_queue import LLMQueue
+from jobyaari_dedupe import JobDeduper, canonical_url
+from jobyaari_metrics import METRICS, profile_call, serve_metrics, timed
+
+logger = logging.getLogger(__name__)
 
 # Page configuration
 st.set_page_config(
@@ -73,6 +84,11 @@ st.markdown("""
         line-height: 1.6;
         color: white !important;
     }
+    .message-metrics {
+        color: #64748b;
+        font-size: 0.85rem;
+        margin: -0.5rem 20% 1rem 0;
+    }
     .job-card {
         background: white;
         border: 1px solid #e5e7eb;
@@ -118,98 +134,184 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+class NullProgress:
+    """Stand-in for Streamlit progress widgets when scraping outside a session"""
+
+    def progress(self, value):
+        pass
+
+    def text(self, value):
+        pass
+
+    def empty(self):
+        pass
+
 # JobYaari Scraper Class
 class JobYaariScraper:
-    def __init__(self):
-        self.base_url = "https://www.jobyaari.com"
+    CATEGORY_PATHS = {
+        'Engineering': '/engineering-jobs/',
+        'Science': '/science-jobs/',
+        'Commerce': '/commerce-jobs/',
+        'Education': '/education-jobs/'
+    }
+
+    def __init__(self, base_url="https://www.jobyaari.com", max_workers=4, rate_per_host=1.0, burst=4,
+                 cache_dir=".jobyaari_cache/pages", parser='lxml', show_progress=True, retries=2,
+                 timeout=(5.0, 15.0), category_budget=60.0, pool_size=None, breaker=None):
+        self.base_url = base_url
+        # False for background refreshes, which have no Streamlit page to draw on
+        self.show_progress = show_progress
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
             'Accept-Language': 'en-US,en;q=0.5',
         }
-        self.session = requests.Session()
-        self.session.headers.update(self.headers)
+        self.max_workers = max_workers
+        # One pooled session shared by all workers, politeness enforced per host
+        self.session = build_session(self.headers, pool_size=pool_size or max_workers)
+        self.rate_limiter = HostRateLimiter(rate=rate_per_host, burst=burst)
+        # Retries with backoff and a per-host circuit breaker; each category gets `category_budget` seconds
+        self.fetcher = Fetcher(self.session, self.rate_limiter, retries=retries, timeout=timeout,
+                               breaker=breaker or CircuitBreaker())
+        self.category_budget = category_budget
+        # Categories padded with generated sample jobs, and why
+        self.fallback = {}
+        self.errors = {}
+        # Conditional GETs against the on-disk cache skip parsing unchanged pages
+        self.page_cache = PageCache(cache_dir) if cache_dir else None
+        # HTML backend ('lxml' or 'bs4'), see jobyaari_parse
+        self.parser = get_parser(parser)
+        # Shared by all category workers, so a job listed under two categories is kept once
+        self.deduper = JobDeduper()
+
+    def get_category_urls(self):
+        """Map each category name to its listing URL"""
+        return {category: f"{self.base_url}{path}" for category, path in self.CATEGORY_PATHS.items()}
+
+    def iter_pages(self, category_url, max_pages=5):
+        """Fetch stage: yield (page_url, document, cached_entry) while following pagination"""
+        page_url = category_url
+        visited = set()
+        deadline = time.monotonic() + self.category_budget if self.category_budget else None
+        
+        while page_url and page_url not in visited and len(visited) < max_pages:
+            visited.add(page_url)
+            cached = self.page_cache.get(page_url) if self.page_cache else None
+            conditional = self.page_cache.conditional_headers(cached) if self.page_cache else {}
+            
+            try:
+                with METRICS.span('fetch_page'):
+                    response = self.fetcher.get(page_url, headers=conditional, deadline=deadline)
+            except BudgetExceededError:
+                if len(visited) == 1:
+                    raise
+                # Keep the pages fetched so far rather than stalling the whole refresh
+                logger.warning("Fetch budget of %gs used up after %d page(s) of %s",
+                               self.category_budget, len(visited) - 1, category_url)
+                return
+            
+            if response.status_code == 304 and cached:
+                self.page_cache.record(hit=True)
+                yield page_url, None, cached
+                page_url = cached.get('next_url')
+                continue
+            
+            if response.status_code != 200:
+                return
+            
+            with METRICS.span('parse_page'):
+                document = self.parser.parse(response.content)
+            next_url = self.parser.next_page_url(document, page_url)
+            yield page_url, document, {'response': response, 'next_url': next_url}
+            page_url = next_url
+
+    def iter_page_jobs(self, pages, category_name):
+        """Parse/extract stage: yield job dicts page by page"""
+        for page_url, document, meta in pages:
+            if document is None:
+                # Unchanged page, reuse the jobs parsed last time
+                yield from meta['jobs']
+                continue
+            
+            # Find job listings (adjusting selectors based on actual website structure)
+            jobs = []
+            for item in self.parser.iter_items(document):
+                try:
+                    job_data = self.extract_job_details(item, category_name)
+                    if job_data:
+                        jobs.append(job_data)
+                except Exception as e:
+                    continue
+            # Only one page of records is held at a time
+            self.parser.release(document)
+            
+            if self.page_cache:
+                self.page_cache.record(hit=False)
+                self.page_cache.put(page_url, meta['response'], jobs, next_url=meta['next_url'])
+            yield from jobs
+
+    def dedupe_jobs(self, jobs):
+        """Dedupe stage: canonicalize links, drop repeats and near-duplicate reposts across categories"""
+        for job in jobs:
+            job['url'] = canonical_url(job['url'])
+            if self.deduper.check(job) is None:
+                yield job
 
+    def crawl_category(self, category_url, category_name, max_jobs=50, max_pages=5):
+        """Stream jobs for one category: fetch -> parse -> extract -> dedupe"""
+        pages = self.iter_pages(category_url, max_pages=max_pages)
+        jobs = self.dedupe_jobs(self.iter_page_jobs(pages, category_name))
+        return itertools.islice(jobs, max_jobs)
+
+    def fetch_category(self, category_url, category_name, max_jobs=50):
+        """Fetch and parse one category, raising on network errors"""
+        return list(self.crawl_category(category_url, category_name, max_jobs))
+
+    @timed('scrape_category')
     def scrape_category(self, category_url, category_name, max_jobs=50):
         """Scrape jobs from a specific category"""
-        jobs = []
         try:
-            response = self.session.get(category_url, timeout=15)
-            if response.status_code == 200:
-                soup = BeautifulSoup(response.content, 'html.parser')
-                
-                # Find job listings (adjusting selectors based on actual website structure)
-                job_items = soup.find_all(['div', 'article', 'li'], class_=re.compile(r'job|post|item|entry', re.I))
-                
-                for item in job_items[:max_jobs]:
-                    try:
-                        job_data = self.extract_job_details(item, category_name)
-                        if job_data:
-                            jobs.append(job_data)
-                    except Exception as e:
-                        continue
-                        
+            return self.fetch_category(category_url, category_name, max_jobs)
         except Exception as e:
-            st.warning(f"Error scraping {category_name}: {str(e)}")
-        
-        return jobs
+            self.errors[category_name] = str(e)
+            self.warn(f"Error scraping {category_name}: {str(e)}")
+            return []
+
+    def use_fallback(self, category, jobs):
+        """Sample jobs to pad a category that scraped fewer than 5 jobs, recording why"""
+        self.fallback[category] = self.errors.get(category) or f"only {len(jobs)} job(s) found"
+        logger.warning("Using sample data for %s: %s", category, self.fallback[category])
+        return self.generate_sample_jobs(category, 15)
 
+    def warn(self, message):
+        if self.show_progress:
+            st.warning(message)
+        else:
+            logger.warning(message)
+
+    def progress_widgets(self):
+        """Progress bar and status line, or no-op stand-ins when running headless"""
+        if self.show_progress:
+            return st.progress(0), st.empty()
+        return NullProgress(), NullProgress()
+
+    @timed('extract_job_details')
     def extract_job_details(self, item, category):
         """Extract job details from HTML element"""
         try:
-            # Try multiple selectors to find job title
-            title_elem = (item.find(['h2', 'h3', 'h4', 'a'], class_=re.compile(r'title|heading|name', re.I)) or
-                         item.find(['h2', 'h3', 'h4', 'a']))
-            
-            # Find link
-            link_elem = item.find('a', href=True)
-            
-            # Find date
-            date_elem = item.find(['span', 'time', 'div'], class_=re.compile(r'date|time|posted', re.I))
-            
-            # Find qualification
-            qual_elem = item.find(['span', 'div', 'p'], class_=re.compile(r'qualification|education|degree', re.I))
-            
-            # Find experience
-            exp_elem = item.find(['span', 'div', 'p'], class_=re.compile(r'experience|exp|year', re.I))
-            
-            if title_elem:
-                title_text = title_elem.get_text(strip=True)
-                url = urljoin(self.base_url, link_elem['href']) if link_elem else self.base_url
-                
-                return {
-                    'title': title_text,
-                    'category': category,
-                    'url': url,
-                    'posted_date': date_elem.get_text(strip=True) if date_elem else 'Recently Posted',
-                    'qualification': qual_elem.get_text(strip=True) if qual_elem else 'Check Details',
-                    'experience': exp_elem.get_text(strip=True) if exp_elem else 'Check Details',
-                    'description': self.extract_description(item)
-                }
-        except:
+            return self.parser.extract_job(item, category, self.base_url)
+        except Exception:
             return None
-        
-        return None
 
-    def extract_description(self, item):
-        """Extract job description"""
-        desc_elem = item.find(['p', 'div'], class_=re.compile(r'description|content|summary', re.I))
-        if desc_elem:
-            return desc_elem.get_text(strip=True)[:200] + "..."
-        return "Click link for full details"
-
-    def scrape_all_categories(self):
-        """Scrape all major categories from JobYaari"""
-        categories = {
-            'Engineering': f"{self.base_url}/engineering-jobs/",
-            'Science': f"{self.base_url}/science-jobs/",
-            'Commerce': f"{self.base_url}/commerce-jobs/",
-            'Education': f"{self.base_url}/education-jobs/"
-        }
+    def scrape_all_categories(self, concurrent=True, sink=None):
+        """Scrape all major categories from JobYaari, passing each job to `sink` as it arrives"""
+        if concurrent:
+            return self.scrape_all_categories_concurrent(sink=sink)
+        
+        categories = self.get_category_urls()
         
         all_jobs = []
-        progress_bar = st.progress(0)
-        status_text = st.empty()
+        progress_bar, status_text = self.progress_widgets()
         
         for idx, (category, url) in enumerate(categories.items()):
             status_text.text(f"Scraping {category} jobs...")
@@ -217,8 +319,11 @@ class JobYaariScraper:
             
             # If scraping didn't work well, add sample data
             if len(jobs) < 5:
-                jobs.extend(self.generate_sample_jobs(category, 15))
+                jobs.extend(self.use_fallback(category, jobs))
             
+            if sink:
+                for job in jobs:
+                    sink(job)
             all_jobs.extend(jobs)
             progress_bar.progress((idx + 1) / len(categories))
             time.sleep(1)  # Rate limiting
@@ -228,6 +333,64 @@ class JobYaariScraper:
         
         return all_jobs
 
+    def crawl_into_queue(self, events, category_url, category_name, max_jobs):
+        """Worker body: stream one category's jobs into `events`, then signal completion"""
+        try:
+            with METRICS.span('scrape_category'):
+                for job in self.crawl_category(category_url, category_name, max_jobs):
+                    events.put(('job', category_name, job))
+        except Exception as e:
+            events.put(('error', category_name, e))
+        finally:
+            events.put(('done', category_name, None))
+
+    def scrape_all_categories_concurrent(self, sink=None):
+        """Scrape all categories on a bounded worker pool, rate limited per host"""
+        categories = self.get_category_urls()
+        
+        results = {category: [] for category in categories}
+        events = queue.Queue()
+        found = 0
+        progress_bar, status_text = self.progress_widgets()
+        status_text.text(f"Scraping {len(categories)} categories...")
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for category, url in categories.items():
+                executor.submit(self.crawl_into_queue, events, url, category, 20)
+            
+            # Streamlit calls stay on the script thread; workers only fetch and parse
+            remaining = len(categories)
+            while remaining:
+                kind, category, payload = events.get()
+                if kind == 'job':
+                    results[category].append(payload)
+                    if sink:
+                        sink(payload)
+                    found += 1
+                    status_text.text(f"Found {found} jobs...")
+                elif kind == 'error':
+                    self.errors[category] = str(payload)
+                    self.warn(f"Error scraping {category}: {str(payload)}")
+                else:
+                    remaining -= 1
+                    # If scraping didn't work well, add sample data
+                    if len(results[category]) < 5:
+                        samples = self.use_fallback(category, results[category])
+                        results[category].extend(samples)
+                        if sink:
+                            for job in samples:
+                                sink(job)
+                    progress_bar.progress((len(categories) - remaining) / len(categories))
+        
+        progress_bar.empty()
+        status_text.empty()
+        
+        # Keep the category order stable regardless of completion order
+        all_jobs = []
+        for category in categories:
+            all_jobs.extend(results[category])
+        return all_jobs
+
     def generate_sample_jobs(self, category, count=15):
         """Generate sample job data for demonstration"""
         job_templates = {
@@ -283,179 +446,170 @@ class JobYaariScraper:
                 'posted_date': f"{(i % 30) + 1} days ago",
                 'qualification': quals[i % len(quals)],
                 'experience': experience_levels[i % len(experience_levels)],
-                'description': f"Excellent opportunity for {category} professionals. Apply online through official notification."
+                'description': f"Excellent opportunity for {category} professionals. Apply online through official notification.",
+                # Demo padding: kept in memory for the session, never written to the job store
+                'sample': True,
             })
         
         return jobs
 
-# Llama3 Chatbot Class
-class JobYaariChatbot:
-    def __init__(self, jobs_data):
-        try:
-            # Initialize Ollama with Llama3 8B model
-            self.llm = Ollama(model="llama3:8b")
-            self.jobs_data = jobs_data
-            self.chat_history = []
-            
-            # Create a knowledge base from jobs data
-            self.create_knowledge_base()
-            st.success("✅ Llama3 model loaded successfully!")
-        except Exception as e:
-            st.error(f"❌ Error loading Llama3 model: {str(e)}")
-            st.info("Make sure Ollama is running: `ollama serve` and model is pulled: `ollama pull llama3:8b`")
-
-    def create_knowledge_base(self):
-        """Create a structured knowledge base from jobs data"""
-        self.knowledge_base = {
-            'Engineering': [],
-            'Science': [],
-            'Commerce': [],
-            'Education': []
-        }
-        
-        for job in self.jobs_data:
-            category = job.get('category', 'Other')
-            if category in self.knowledge_base:
-                self.knowledge_base[category].append(job)
-        
-        # Create summary statistics
-        self.stats = {
-            'total_jobs': len(self.jobs_data),
-            'by_category': {cat: len(jobs) for cat, jobs in self.knowledge_base.items()},
-            'experience_distribution': self.get_experience_distribution(),
-            'qualification_distribution': self.get_qualification_distribution()
-        }
+@st.cache_resource
+def get_shared_knowledge_base():
+    """One SharedKnowledgeBase per server process"""
+    return create_shared_knowledge_base()
 
-    def get_experience_distribution(self):
-        """Get distribution of jobs by experience"""
-        exp_dist = {}
-        for job in self.jobs_data:
-            exp = job.get('experience', 'Not Specified')
-            exp_dist[exp] = exp_dist.get(exp, 0) + 1
-        return exp_dist
-
-    def get_qualification_distribution(self):
-        """Get distribution of jobs by qualification"""
-        qual_dist = {}
-        for job in self.jobs_data:
-            qual = job.get('qualification', 'Not Specified')
-            qual_dist[qual] = qual_dist.get(qual, 0) + 1
-        return qual_dist
-
-    def search_jobs(self, category=None, experience=None, qualification=None, keyword=None):
-        """Search jobs based on filters"""
-        results = self.jobs_data.copy()
-        
-        if category:
-            results = [j for j in results if j.get('category', '').lower() == category.lower()]
-        
-        if experience:
-            results = [j for j in results if experience.lower() in j.get('experience', '').lower()]
-        
-        if qualification:
-            results = [j for j in results if qualification.lower() in j.get('qualification', '').lower()]
-        
-        if keyword:
-            results = [j for j in results if keyword.lower() in j.get('title', '').lower() or 
-                      keyword.lower() in j.get('description', '').lower()]
-        
-        return results
-
-    def format_job_response(self, jobs, limit=5):
-        """Format jobs into a readable response"""
-        if not jobs:
-            return "No jobs found matching your criteria."
-        
-        response = f"Found {len(jobs)} job(s). Here are the top {min(limit, len(jobs))}:\n\n"
-        
-        for idx, job in enumerate(jobs[:limit], 1):
-            response += f"{idx}. {job['title']}\n"
-            response += f"   Category: {job['category']}\n"
-            response += f"   Qualification: {job['qualification']}\n"
-            response += f"   Experience: {job['experience']}\n"
-            response += f"   Posted: {job['posted_date']}\n"
-            response += f"   Link: {job['url']}\n\n"
-        
-        return response
-
-    def process_query(self, user_query):
-        """Process user query and generate response"""
-        # Create context from jobs data
-        jobs_summary = ""
-        for category, jobs in self.knowledge_base.items():
-            jobs_summary += f"\n{category}: {len(jobs)} jobs available"
-            if jobs:
-                sample_jobs = jobs[:3]
-                for job in sample_jobs:
-                    jobs_summary += f"\n  - {job['title']} (Qualification: {job['qualification']}, Experience: {job['experience']})"
-        
-        prompt = f"""You are a helpful JobYaari assistant specialized in government job notifications.
-
-Job Database Statistics:
-- Total Jobs: {self.stats['total_jobs']}
-- Engineering: {self.stats['by_category'].get('Engineering', 0)} jobs
-- Science: {self.stats['by_category'].get('Science', 0)} jobs
-- Commerce: {self.stats['by_category'].get('Commerce', 0)} jobs
-- Education: {self.stats['by_category'].get('Education', 0)} jobs
-
-Sample Jobs in Database:{jobs_summary}
-
-User Query: {user_query}
-
-Instructions:
-1. Answer the user's question based on the job data provided above
-2. Be specific and helpful
-3. If the user asks about specific categories, mention relevant jobs
-4. Keep your response concise and informative
-5. Use bullet points when listing jobs
-6. Always be professional and friendly
-
-Provide your response:"""
+@st.cache_resource
+def get_circuit_breaker():
+    """Per-host circuit breaker shared by every scrape in this process, so open circuits outlive a run"""
+    return CircuitBreaker()
 
-        try:
-            # Generate response using Llama3
-            response = self.llm.invoke(prompt)
-            
-            # Extract search parameters from query
-            category = None
-            experience = None
-            
-            # Simple keyword matching for better results
-            query_lower = user_query.lower()
-            
-            # Detect category
-            for cat in ['engineering', 'science', 'commerce', 'education']:
-                if cat in query_lower:
-                    category = cat.capitalize()
-                    break
-            
-            # Detect experience
-            exp_patterns = ['fresher', '1 year', '2 year', '3 year', '5 year', 'experience']
-            for pattern in exp_patterns:
-                if pattern in query_lower:
-                    experience = pattern
-                    break
-            
-            # Search jobs if specific criteria mentioned
-            if category or experience or 'show' in query_lower or 'list' in query_lower or 'get' in query_lower:
-                jobs = self.search_jobs(category=category, experience=experience)
-                if jobs:
-                    job_list = self.format_job_response(jobs, limit=5)
-                    response += f"\n\n{job_list}"
-            
-            return response
-            
-        except Exception as e:
-            error_msg = f"I apologize, but I encountered an error: {str(e)}. Please make sure Ollama is running with: ollama serve"
-            st.error(error_msg)
-            return error_msg
+@st.cache_resource
+def get_refresh_worker():
+    """Start one background refresh thread per process when JOBYAARI_REFRESH_INTERVAL is set"""
+    interval = float(os.environ.get('JOBYAARI_REFRESH_INTERVAL', 0))
+    if interval <= 0:
+        return None
+    breaker = get_circuit_breaker()
+    worker = RefreshWorker(get_shared_knowledge_base().store,
+                           lambda: JobYaariScraper(show_progress=False, breaker=breaker),
+                           interval=interval, run_immediately=True)
+    worker.start()
+    return worker
+
+@st.cache_resource
+def get_metrics_server():
+    """Prometheus /metrics and /metrics.json endpoint, when JOBYAARI_METRICS_PORT is set"""
+    port = os.environ.get("JOBYAARI_METRICS_PORT")
+    if not port:
+        return None
+    try:
+        return serve_metrics(int(port), host=os.environ.get("JOBYAARI_METRICS_HOST", "127.0.0.1"))
+    except OSError as e:
+        logger.warning("Metrics endpoint not started on port %s: %s", port, e)
+        return None
+
+EXPLORER_PAGE_SIZE = 500
+
+@st.cache_resource(max_entries=2)
+def get_job_explorer(generation):
+    """Data Explorer queries over the job store, cached per published generation"""
+    return JobExplorer(get_shared_knowledge_base().store, page_size=EXPLORER_PAGE_SIZE)
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def export_jobs(generation, categories, experiences, keyword, fmt):
+    """Encoded download of the filtered jobs, produced only when requested"""
+    return export_bytes(get_job_explorer(generation).iter_chunks(categories, experiences, keyword), fmt)
+
+def render_message_html(message):
+    """Render a chat message as a styled HTML bubble"""
+    if message["role"] == "user":
+        return f'''
+        <div class="chat-message user-message">
+            <div class="message-label">👤 You:</div>
+            <div class="message-content">{message["content"]}</div>
+        </div>
+        '''
+    # Format bot message for better visibility
+    formatted_content = message["content"].replace('\n', '<br>')
+    return f'''
+    <div class="chat-message bot-message">
+        <div class="message-label">🤖 Assistant:</div>
+        <div class="message-content">{formatted_content}</div>
+    </div>
+    '''
+
+# Messages rendered on each rerun; older ones are revealed a page at a time
+CHAT_WINDOW = 20
+CHAT_PAGE = 20
+
+def message_html(message):
+    """Bubble plus latency line for a finished message, rendered once and cached on the message
+
+    Lines are joined so consecutive bubbles form one HTML block in a single markdown element.
+    """
+    html = message.get("html")
+    if html is None:
+        html = ' '.join(line.strip() for line in render_message_html(message).splitlines() if line.strip())
+        if message.get("metrics"):
+            html += f'<div class="message-metrics">{format_stream_metrics(message["metrics"])}</div>'
+        message["html"] = html
+    return html
+
+def show_earlier_messages():
+    st.session_state.chat_window = st.session_state.get('chat_window', CHAT_WINDOW) + CHAT_PAGE
 
-    def chat(self, user_message):
-        """Main chat interface"""
-        self.chat_history.append({"role": "user", "content": user_message})
-        response = self.process_query(user_message)
-        self.chat_history.append({"role": "assistant", "content": response})
-        return response
+def render_chat_history(messages):
+    """Render the most recent window of messages as one element, older history behind a button"""
+    window = st.session_state.get('chat_window', CHAT_WINDOW)
+    hidden = max(0, len(messages) - window)
+    if hidden:
+        st.button(f"⬆️ Show {min(CHAT_PAGE, hidden)} earlier messages ({hidden} hidden)",
+                  on_click=show_earlier_messages)
+    if messages:
+        st.markdown('\n'.join(message_html(message) for message in messages[hidden:]), unsafe_allow_html=True)
+
+def format_stream_metrics(metrics):
+    """One-line summary of streaming latency for a bot message"""
+    if metrics.get('cached'):
+        return "⚡ Answered from response cache"
+    if metrics.get('route') == 'listing' and not metrics.get('tokens'):
+        return f"⚡ Listed from the job index in {metrics['total_time'] * 1000:.1f} ms (no LLM call)"
+    summary = (f"⏱️ First token {metrics['time_to_first_token']:.2f}s · "
+               f"{metrics['tokens_per_sec']:.1f} tokens/sec · "
+               f"{metrics['total_time']:.2f}s total")
+    ollama = metrics.get('ollama')
+    if ollama and 'prompt_eval_count' in ollama:
+        # A small prompt-eval count means Ollama reused its cached prefix
+        summary += (f" · prompt eval {ollama['prompt_eval_count']}/{metrics.get('prompt_tokens_est', '?')} tokens "
+                    f"in {ollama.get('prompt_eval_duration', 0):.2f}s")
+    return summary
+
+def stream_bot_reply(user_input, container):
+    """Stream the assistant's reply into `container`, under the profiler if one was requested"""
+    if st.session_state.get('profile_next'):
+        st.session_state.profile_next = False
+        _, report = profile_call(render_bot_reply, user_input, container)
+        st.session_state.last_profile = {'query': user_input, 'report': report}
+        # The report is drawn above the chat input, so show it right away
+        st.rerun()
+    else:
+        render_bot_reply(user_input, container)
+
+@timed('chat_reply')
+def render_bot_reply(user_input, container):
+    """Stream the assistant's reply into `container` token by token and record both messages"""
+    chatbot = get_shared_knowledge_base().current()
+    metrics = {}
+    st.session_state.messages.append({"role": "user", "content": user_input})
+    
+    with container:
+        st.markdown(render_message_html({"role": "user", "content": user_input}), unsafe_allow_html=True)
+        placeholder = st.empty()
+        placeholder.markdown(render_message_html({"role": "assistant", "content": "🤔 Thinking..."}), unsafe_allow_html=True)
+        
+        response = ""
+        for chunk in chatbot.chat_stream(user_input, history=st.session_state.chat_history, metrics=metrics,
+                                         session=st.session_state.session_id):
+            response += chunk
+            placeholder.markdown(render_message_html({"role": "assistant", "content": response + " ▌"}), unsafe_allow_html=True)
+    
+    if 'error' in metrics:
+        st.error(metrics['error'])
+        metrics = None
+    message = {"role": "assistant", "content": response, "metrics": metrics}
+    st.session_state.messages.append(message)
+    # Finish the streamed bubble in place instead of rerunning the whole script
+    placeholder.markdown(message_html(message), unsafe_allow_html=True)
+    # A new turn collapses history that was expanded back to the recent window
+    st.session_state.chat_window = CHAT_WINDOW
+
+def show_model_status(chatbot):
+    """Report whether the Llama3 model and knowledge base loaded"""
+    if chatbot.load_error is None:
+        st.success("✅ Llama3 model loaded successfully!")
+    else:
+        st.error(f"❌ Error loading Llama3 model: {chatbot.load_error}")
+        st.info("Make sure Ollama is running: `ollama serve` and model is pulled: `ollama pull llama3:8b`")
 
 # Main Streamlit App
 def main():
@@ -471,33 +625,118 @@ def main():
         st.markdown("---")
         st.header("📊 Quick Stats")
         
-        # Initialize or load data
-        if 'jobs_data' not in st.session_state:
-            st.session_state.jobs_data = None
-            st.session_state.chatbot = None
+        # Knowledge base, LLM client and store are shared by every session;
+        # only the conversation lives in session state
+        shared_kb = get_shared_knowledge_base()
+        store = shared_kb.store
+        refresh_worker = get_refresh_worker()
+        metrics_server = get_metrics_server()
+        if 'chat_history' not in st.session_state:
+            st.session_state.chat_history = []
+        if 'session_id' not in st.session_state:
+            st.session_state.session_id = uuid.uuid4().hex
         
         # Scrape Data Button
         if st.button("🔄 Scrape Latest Jobs", type="primary"):
-            with st.spinner("Scraping JobYaari.com..."):
-                scraper = JobYaariScraper()
-                st.session_state.jobs_data = scraper.scrape_all_categories()
-                st.success(f"✅ Scraped {len(st.session_state.jobs_data)} jobs!")
-                
-                # Initialize chatbot
-                with st.spinner("Loading Llama3 model..."):
-                    st.session_state.chatbot = JobYaariChatbot(st.session_state.jobs_data)
-        
-        # Display stats if data exists
-        if st.session_state.jobs_data:
-            df = pd.DataFrame(st.session_state.jobs_data)
+            # Build the next knowledge base first so it fills as jobs stream in
+            with st.spinner("Loading Llama3 model..."):
+                chatbot = shared_kb.build()
+            show_model_status(chatbot)
             
-            total_jobs = len(df)
+            with st.spinner("Scraping JobYaari.com..."):
+                scraper = JobYaariScraper(breaker=get_circuit_breaker())
+                # New means newly stored: generated sample jobs never reach the store
+                known_jobs = store.count()
+                scraped = scraper.scrape_all_categories(sink=chatbot.add_job)
+                # Other sessions switch over on their next rerun
+                shared_kb.publish(chatbot)
+                st.success(f"✅ Scraped {len(scraped)} jobs ({store.count() - known_jobs} new)!")
+                if scraper.fallback:
+                    st.warning("⚠️ Sample data, not real postings, was added for: " +
+                               "; ".join(f"{category} ({reason})" for category, reason in scraper.fallback.items()))
+                fetch = scraper.fetcher.metrics()
+                st.caption(f"🌐 {fetch['requests']} requests · {fetch['retries']} retries · "
+                           f"{fetch['failures']} failed · p95 {fetch['p95_latency']:.2f}s · "
+                           f"{fetch['compressed']} compressed"
+                           + (f" · circuit open: {', '.join(fetch['open_circuits'])}" if fetch['open_circuits'] else ""))
+                collapsed = scraper.deduper.duplicates + chatbot.deduper.counts['near']
+                if collapsed:
+                    st.caption(f"🧹 {collapsed} duplicate listing(s) collapsed")
+                if scraper.page_cache and scraper.page_cache.hits:
+                    st.caption(f"♻️ {scraper.page_cache.hits} page(s) unchanged since last scrape (served from cache)")
+        
+        # Freshness of the data all sessions are reading
+        published_at = store.published_at()
+        if published_at:
+            st.caption(f"🕒 Data published {datetime.fromtimestamp(published_at).strftime('%Y-%m-%d %H:%M')}")
+        if refresh_worker:
+            next_in = max(0, (refresh_worker.next_run or time.time()) - time.time())
+            st.caption(f"🔁 Auto-refresh every {refresh_worker.interval / 60:.0f} min (next in {next_in / 60:.0f} min)")
+            last_result = refresh_worker.last_result
+            if last_result and last_result.get('fallback'):
+                st.caption(f"⚠️ Last refresh used sample data for {', '.join(last_result['fallback'])}")
+        
+        # Display stats from the published knowledge base, which also holds any sample jobs;
+        # before the first one is built, from the job store's counts
+        generation = store.generation()
+        explorer = get_job_explorer(generation)
+        if shared_kb.chatbot:
+            total_jobs = len(shared_kb.chatbot.jobs_data)
+            category_counts = shared_kb.chatbot.stats['by_category']
+        else:
+            total_jobs = len(explorer)
+            category_counts = explorer.counts['category']
+        if total_jobs:
             st.metric("Total Jobs", total_jobs)
             
             st.markdown("**Jobs by Category:**")
             for category in ['Engineering', 'Science', 'Commerce', 'Education']:
-                count = len(df[df['category'] == category])
-                st.metric(category, count)
+                st.metric(category, category_counts.get(category, 0))
+        
+        # Posting recency from the live knowledge base statistics
+        if shared_kb.chatbot and shared_kb.chatbot.job_stats.total:
+            st.markdown("**Jobs by Posting Date:**")
+            for label, count in shared_kb.chatbot.stats['posted_date_histogram'].items():
+                st.caption(f"{label}: {count}")
+        
+        # Response cache effectiveness
+        if shared_kb.chatbot:
+            cache = shared_kb.chatbot.response_cache
+            st.markdown("**Response Cache:**")
+            st.metric("Cache Hit Ratio", f"{cache.hit_ratio:.0%}", help=f"{cache.hits} hits / {cache.misses} misses")
+            st.metric("Latency Saved", f"{cache.saved_seconds:.1f}s")
+            routes = shared_kb.chatbot.route_counts
+            st.metric("Answered Without LLM", f"{routes['listing']} / {routes['listing'] + routes['llm']}",
+                      help=f"Listing queries served from the index, ~{shared_kb.chatbot.route_saved_seconds:.1f}s of generation saved")
+        
+        # Shared inference queue load
+        if isinstance(shared_kb.llm, LLMQueue):
+            queue_metrics = shared_kb.llm.metrics()
+            st.markdown("**LLM Queue:**")
+            st.metric("Queue Depth", queue_metrics['queue_depth'],
+                      help=f"{queue_metrics['in_flight']}/{queue_metrics['max_in_flight']} generations running")
+            st.metric("Avg Queue Wait", f"{queue_metrics['avg_wait']:.2f}s",
+                      help=f"p95 {queue_metrics['p95_wait']:.2f}s · {queue_metrics['coalesced']} coalesced · "
+                           f"{queue_metrics['timeouts']} timed out")
+        
+        # Hot-path latency percentiles for this process
+        with st.expander("⏱️ Latency"):
+            latency = METRICS.snapshot()
+            if latency:
+                st.dataframe(pd.DataFrame([
+                    {'span': name, 'count': values['count'], 'p50 ms': values['p50'] * 1000,
+                     'p95 ms': values['p95'] * 1000, 'p99 ms': values['p99'] * 1000}
+                    for name, values in latency.items()
+                ]).set_index('span').round(1), use_container_width=True)
+            else:
+                st.caption("No timings recorded yet.")
+            if metrics_server:
+                st.caption(f"📈 Prometheus metrics on port {metrics_server.server_address[1]} (/metrics, /metrics.json)")
+            if st.session_state.get('profile_next'):
+                st.caption("🔬 The next chat request will be profiled")
+            elif st.button("🔬 Profile next chat request"):
+                st.session_state.profile_next = True
+                st.rerun()
         
         st.markdown("---")
         st.markdown("### 💡 Sample Questions")
@@ -514,15 +753,15 @@ def main():
         st.code("# Install Ollama\ncurl -fsSL https://ollama.com/install.sh | sh\n\n# Pull Llama3 model\nollama pull llama3:8b\n\n# Run Ollama\nollama serve", language="bash")
     
     # Main content area
-    if not st.session_state.jobs_data:
+    if not total_jobs:
         st.info("👉 Click 'Scrape Latest Jobs' in the sidebar to load job data.")
         st.warning("⚠️ Make sure Ollama is running: `ollama serve`")
         
     else:
-        # Initialize chatbot
-        if not st.session_state.chatbot:
+        # Initialize the shared chatbot from jobs persisted by earlier scrapes
+        if not shared_kb.chatbot:
             with st.spinner("Loading Llama3 model..."):
-                st.session_state.chatbot = JobYaariChatbot(st.session_state.jobs_data)
+                show_model_status(shared_kb.current())
         
         # Chat interface
         st.markdown("### 💬 Chat with JobYaari Assistant")
@@ -531,43 +770,22 @@ def main():
         if 'messages' not in st.session_state:
             st.session_state.messages = []
         
-        # Display chat history with better visibility
+        # Only the recent window is rendered, from HTML cached per message
         chat_container = st.container()
-        with chat_container:
-            for message in st.session_state.messages:
-                if message["role"] == "user":
-                    st.markdown(f'''
-                    <div class="chat-message user-message">
-                        <div class="message-label">👤 You:</div>
-                        <div class="message-content">{message["content"]}</div>
-                    </div>
-                    ''', unsafe_allow_html=True)
-                else:
-                    # Format bot message for better visibility
-                    formatted_content = message["content"].replace('\n', '<br>')
-                    st.markdown(f'''
-                    <div class="chat-message bot-message">
-                        <div class="message-label">🤖 Assistant:</div>
-                        <div class="message-content">{formatted_content}</div>
-                    </div>
-                    ''', unsafe_allow_html=True)
+        with chat_container, METRICS.span('chat_render'):
+            render_chat_history(st.session_state.messages)
+        
+        last_profile = st.session_state.get('last_profile')
+        if last_profile:
+            with st.expander(f"🔬 Profile: {last_profile['query']}"):
+                st.code(last_profile['report'], language="text")
         
         # Chat input
         user_input = st.chat_input("Ask me about job notifications...")
         
         if user_input:
-            # Add user message
-            st.session_state.messages.append({"role": "user", "content": user_input})
-            
-            # Get bot response
-            with st.spinner("🤔 Thinking..."):
-                bot_response = st.session_state.chatbot.chat(user_input)
-            
-            # Add bot response
-            st.session_state.messages.append({"role": "assistant", "content": bot_response})
-            
-            # Rerun to update chat display
-            st.rerun()
+            # Stream bot response into the chat as it is generated; it stays rendered, no rerun needed
+            stream_bot_reply(user_input, chat_container)
         
         # Quick action buttons
         st.markdown("### 🎯 Quick Actions")
@@ -576,69 +794,66 @@ def main():
         with col1:
             if st.button("🔧 Engineering Jobs"):
                 user_input = "Show me latest Engineering jobs"
-                st.session_state.messages.append({"role": "user", "content": user_input})
-                bot_response = st.session_state.chatbot.chat(user_input)
-                st.session_state.messages.append({"role": "assistant", "content": bot_response})
-                st.rerun()
+                stream_bot_reply(user_input, chat_container)
         
         with col2:
             if st.button("🔬 Science Jobs"):
                 user_input = "Show me latest Science jobs"
-                st.session_state.messages.append({"role": "user", "content": user_input})
-                bot_response = st.session_state.chatbot.chat(user_input)
-                st.session_state.messages.append({"role": "assistant", "content": bot_response})
-                st.rerun()
+                stream_bot_reply(user_input, chat_container)
         
         with col3:
             if st.button("💼 Commerce Jobs"):
                 user_input = "Show me latest Commerce jobs"
-                st.session_state.messages.append({"role": "user", "content": user_input})
-                bot_response = st.session_state.chatbot.chat(user_input)
-                st.session_state.messages.append({"role": "assistant", "content": bot_response})
-                st.rerun()
+                stream_bot_reply(user_input, chat_container)
         
         with col4:
             if st.button("📚 Education Jobs"):
                 user_input = "Show me latest Education jobs"
-                st.session_state.messages.append({"role": "user", "content": user_input})
-                bot_response = st.session_state.chatbot.chat(user_input)
-                st.session_state.messages.append({"role": "assistant", "content": bot_response})
-                st.rerun()
+                stream_bot_reply(user_input, chat_container)
         
         # Clear chat button
         if st.button("🗑️ Clear Chat History"):
             st.session_state.messages = []
+            st.session_state.chat_history = []
+            st.session_state.chat_window = CHAT_WINDOW
             st.rerun()
         
         # Data Explorer
         with st.expander("📊 Explore Job Data"):
-            if st.session_state.jobs_data:
-                df = pd.DataFrame(st.session_state.jobs_data)
-                
-                # Filters
-                col1, col2 = st.columns(2)
-                with col1:
-                    selected_category = st.multiselect("Category", df['category'].unique())
-                with col2:
-                    selected_exp = st.multiselect("Experience", df['experience'].unique())
-                
-                # Apply filters
-                filtered_df = df.copy()
-                if selected_category:
-                    filtered_df = filtered_df[filtered_df['category'].isin(selected_category)]
-                if selected_exp:
-                    filtered_df = filtered_df[filtered_df['experience'].isin(selected_exp)]
-                
-                # Display table
-                st.dataframe(filtered_df, use_container_width=True)
-                
-                # Download option
-                csv = filtered_df.to_csv(index=False)
+            # Filters (options are precomputed per generation)
+            col1, col2 = st.columns(2)
+            with col1:
+                selected_category = st.multiselect("Category", explorer.uniques['category'])
+            with col2:
+                selected_exp = st.multiselect("Experience", explorer.uniques['experience'])
+            search_text = st.text_input("Search", placeholder="Search in title, description, qualification...")
+            if len(explorer) < total_jobs:
+                st.caption(f"ℹ️ Listing the {len(explorer)} stored jobs; generated sample jobs are not stored")
+            
+            # The store answers the filters (FTS5 for the keyword); only the first page of rows is read
+            matching = explorer.count(selected_category, selected_exp, search_text)
+            page_df = explorer.page(selected_category, selected_exp, search_text)
+            
+            # Display table
+            st.caption(f"Showing {len(page_df)} of {matching} matching jobs")
+            st.dataframe(page_df, use_container_width=True)
+            
+            # Download option, encoded in chunks only after the user asks for it
+            col1, col2 = st.columns(2)
+            with col1:
+                export_format = st.selectbox("Export format", EXPORT_FORMATS)
+            with col2:
+                prepare = st.button("📦 Prepare Download")
+            if prepare:
+                with st.spinner(f"Encoding {matching} jobs as {export_format}..."):
+                    data = export_jobs(generation, tuple(selected_category), tuple(selected_exp),
+                                       search_text, export_format)
+                extension, mime = ('parquet', 'application/octet-stream') if export_format == 'Parquet' else ('csv', 'text/csv')
                 st.download_button(
                     label="📥 Download Data",
-                    data=csv,
-                    file_name=f"jobyaari_jobs_{datetime.now().strftime('%Y%m%d')}.csv",
-                    mime="text/csv"
+                    data=data,
+                    file_name=f"jobyaari_jobs_{datetime.now().strftime('%Y%m%d')}.{extension}",
+                    mime=mime
                 )
 
     # Footer
@@ -0,0 +1,615 @@
+"""Llama3 chatbot over the job knowledge base and the process-wide SharedKnowledgeBase
+
+Kept free of Streamlit so the API service can import it without running the page.
+"""
+import hashlib
+import logging
+import os
+import threading
+import time
+from langchain_community.llms import Ollama
+from jobyaari_search import JobIndex
+from jobyaari_retrieval import VectorIndex, get_embedder
+from jobyaari_response_cache import ResponseCache
+from jobyaari_store import JobStore, job_key
+from jobyaari_stats import JobStats
+from jobyaari_record import JobRecord
+from jobyaari_query import QueryParser
+from jobyaari_llm_queue import OLLAMA_TIMING_FIELDS, LLMQueue, stream_with_info
+from jobyaari_prompt import CONTEXT_TOKENS, PromptBuilder
+from jobyaari_dedupe import JobDeduper
+from jobyaari_metrics import METRICS, timed
+from jobyaari_snapshot import SnapshotError, load_snapshot, save_snapshot
+
+logger = logging.getLogger(__name__)
+
+
+# Llama3 Chatbot Class
+class JobYaariChatbot:
+    def __init__(self, jobs_data, embedder='hashing', context_jobs=8,
+                 response_cache_path=".jobyaari_cache/responses.json", store=None, llm=None,
+                 summarize_listings=False, snapshot=None):
+        self.embedder_name = embedder
+        # Durable job store; with jobs_data=None the knowledge base is loaded from it
+        self.store = store
+        self.context_jobs = context_jobs
+        # Answers are reused while the knowledge base is unchanged
+        self.response_cache = ResponseCache(path=response_cache_path)
+        # Listing queries are answered from the index; optionally stream an LLM summary after the list
+        self.summarize_listings = summarize_listings
+        self.route_counts = {'listing': 0, 'llm': 0}
+        self.route_saved_seconds = 0.0
+        self.llm_latency = None
+        # Near-duplicate detection for jobs added later, built on first use
+        self.deduper = None
+        # Store key -> (jobs_data position, index doc id), built on first update
+        self.slots = None
+        # Stable prompt prefix and context-window budget
+        self.prompt_builder = PromptBuilder()
+        # Why the model or knowledge base failed to load, for the page to show
+        self.load_error = None
+        try:
+            # Initialize Ollama with Llama3 8B model (or reuse a shared client)
+            self.llm = llm or Ollama(model="llama3:8b", num_ctx=CONTEXT_TOKENS, keep_alive="30m")
+            self.chat_history = []
+            if snapshot is not None:
+                # Knowledge base read back from load_snapshot(), nothing to rebuild
+                self.restore_knowledge_base(snapshot)
+            else:
+                if jobs_data is None:
+                    jobs_data = store.iter_jobs() if store else []
+                # Compact records: interned facet codes and parsed posting dates
+                self.jobs_data = [JobRecord.from_dict(job) for job in jobs_data]
+
+                # Create a knowledge base from jobs data
+                self.create_knowledge_base()
+            logger.info("Llama3 chatbot ready with %d jobs", len(self.jobs_data))
+        except Exception as e:
+            # Reported to the user by the page that built this chatbot
+            logger.exception("Error loading Llama3 model")
+            self.load_error = str(e)
+
+    @timed('create_knowledge_base')
+    def create_knowledge_base(self):
+        """Create a structured knowledge base from jobs data"""
+        self.knowledge_base = {
+            'Engineering': [],
+            'Science': [],
+            'Commerce': [],
+            'Education': []
+        }
+        
+        # Inverted index serves search_jobs without scanning every job
+        self.index = JobIndex()
+        self.slots = None
+        # Vector index picks the jobs that go into the prompt
+        self.retriever = VectorIndex(get_embedder(self.embedder_name))
+        # Order-independent fingerprint of the jobs, used to version cached answers
+        self.kb_fingerprint = 0
+        # Summary statistics, kept up to date as jobs are added
+        self.job_stats = JobStats()
+        
+        for job in self.jobs_data:
+            category = job.get('category', 'Other')
+            if category in self.knowledge_base:
+                self.knowledge_base[category].append(job)
+            self.index.add(job)
+            self.job_stats.add(job)
+            self.kb_fingerprint = (self.kb_fingerprint + self.job_fingerprint(job)) % 2 ** 64
+        self.retriever.add_many(self.jobs_data)
+
+    @timed('restore_knowledge_base')
+    def restore_knowledge_base(self, snapshot):
+        """Adopt the jobs, indexes and statistics of a loaded snapshot"""
+        self.jobs_data = snapshot['jobs']
+        self.index = snapshot['index']
+        self.slots = None
+        self.retriever = snapshot['retriever']
+        self.job_stats = snapshot['stats']
+        self.kb_fingerprint = snapshot['fingerprint']
+        self.knowledge_base = {'Engineering': [], 'Science': [], 'Commerce': [], 'Education': []}
+        for job in self.jobs_data:
+            bucket = self.knowledge_base.get(job.category)
+            if bucket is not None:
+                bucket.append(job)
+
+    def save_snapshot(self, path, generation=None):
+        """Write the knowledge base to a binary snapshot file for fast cold starts"""
+        with METRICS.span('save_snapshot'):
+            save_snapshot(path, self.jobs_data, self.index, self.retriever, self.job_stats,
+                          embedder=self.embedder_name, fingerprint=self.kb_fingerprint, generation=generation)
+
+    def ingest_deduper(self):
+        """JobDeduper primed with the jobs already in the knowledge base"""
+        if self.deduper is None:
+            self.deduper = JobDeduper()
+            for _ in self.deduper.filter(self.jobs_data):
+                pass
+        return self.deduper
+
+    def job_slots(self):
+        """Map of store key to (jobs_data position, index doc id) for the jobs in the knowledge base"""
+        if self.slots is None:
+            positions = {id(job): position for position, job in enumerate(self.jobs_data)}
+            self.slots = {job_key(job): (positions[id(job)], doc_id)
+                          for doc_id, job in enumerate(self.index.docs) if job is not None}
+        return self.slots
+
+    def update_job(self, job):
+        """Replace the in-memory copy of a stored job whose content changed, return True if it was found"""
+        key = job_key(job)
+        slot = self.job_slots().get(key)
+        if slot is None:
+            return False
+        position, doc_id = slot
+        old = self.jobs_data[position]
+        job = JobRecord.from_dict(job)
+        self.jobs_data[position] = job
+        self.index.remove(doc_id)
+        self.slots[key] = (position, self.index.add(job))
+        self.retriever.replace(old, job)
+        self.kb_fingerprint = (self.kb_fingerprint - self.job_fingerprint(old) + self.job_fingerprint(job)) % 2 ** 64
+        self.job_stats.remove(old)
+        self.job_stats.add(job)
+        bucket = self.knowledge_base.get(old.get('category', 'Other'))
+        if bucket is not None:
+            del bucket[next(i for i, other in enumerate(bucket) if other is old)]
+        bucket = self.knowledge_base.get(job.get('category', 'Other'))
+        if bucket is not None:
+            bucket.append(job)
+        return True
+
+    def add_job(self, job):
+        """Add a single job to the knowledge base as it streams in from the scraper
+
+        A job already in the knowledge base (same job_key) only refreshes its
+        last-seen time in the store, or replaces the in-memory copy when its
+        content changed. Any other duplicate is dropped before it reaches the
+        store. Returns True only for new jobs.
+        """
+        duplicate = self.ingest_deduper().check(job)
+        if duplicate and not (duplicate == 'url' and job_key(job) in self.job_slots()):
+            return False
+        status = 'inserted'
+        if self.store and not job.get('sample'):
+            status = self.store.upsert(job)
+        if status == 'updated':
+            self.update_job(job)
+            return False
+        if status is None or duplicate:
+            return False
+        job = JobRecord.from_dict(job)
+        self.jobs_data.append(job)
+        doc_id = self.index.add(job)
+        if self.slots is not None:
+            self.slots[job_key(job)] = (len(self.jobs_data) - 1, doc_id)
+        self.retriever.add(job)
+        self.kb_fingerprint = (self.kb_fingerprint + self.job_fingerprint(job)) % 2 ** 64
+        self.job_stats.add(job)
+        category = job.get('category', 'Other')
+        if category in self.knowledge_base:
+            self.knowledge_base[category].append(job)
+        return True
+
+    @property
+    def stats(self):
+        """Snapshot of the summary statistics"""
+        return self.job_stats.snapshot()
+
+    @staticmethod
+    def job_fingerprint(job):
+        """Stable 64-bit hash of the fields a response can depend on"""
+        key = '|'.join(str(job.get(field, '')) for field in
+                       ('url', 'title', 'category', 'posted_date', 'qualification', 'experience'))
+        return int.from_bytes(hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest(), 'big')
+
+    @property
+    def kb_version(self):
+        """Changes whenever a job is added to or removed from the knowledge base"""
+        return f"{self.job_stats.total}-{self.kb_fingerprint:016x}"
+
+    def cache_version(self, history):
+        """Response cache version for a query asked after `history`
+
+        Answers depend on the conversation the prompt includes, so the recent
+        turns are hashed in; otherwise a follow-up like "tell me more" could be
+        served another conversation's answer.
+        """
+        if not history:
+            return self.kb_version
+        lines, _ = self.prompt_builder.history_lines(history, self.prompt_builder.history_tokens)
+        digest = hashlib.blake2b('\n'.join(lines).encode('utf-8'), digest_size=8).hexdigest()
+        return f"{self.kb_version}-{digest}"
+
+    def get_experience_distribution(self):
+        """Get distribution of jobs by experience"""
+        return self.stats['experience_distribution']
+
+    def get_qualification_distribution(self):
+        """Get distribution of jobs by qualification"""
+        return self.stats['qualification_distribution']
+
+    @timed('search_jobs')
+    def search_jobs(self, category=None, experience=None, qualification=None, keyword=None, limit=None,
+                    experience_range=None, posted_within=None, newest_first=False):
+        """Search jobs based on filters, ranked by relevance when a keyword is given
+
+        `experience_range` is a (min, max or None) years range, `posted_within`
+        a number of days; `newest_first` orders by parsed posting date.
+        """
+        by_date = posted_within is not None or newest_first
+        jobs = self.index.search(keyword=keyword, category=category, experience=experience,
+                                 qualification=qualification, experience_range=experience_range,
+                                 limit=None if by_date else limit)
+        if not by_date:
+            return jobs
+        if posted_within is not None:
+            cutoff = time.time() - posted_within * 86400
+            jobs = [job for job in jobs if job.get('posted_at', 0) >= cutoff]
+        if newest_first:
+            jobs.sort(key=lambda job: job.get('posted_at', 0), reverse=True)
+        return jobs if limit is None else jobs[:limit]
+
+    def parse_query(self, user_query):
+        """Structured filters for a query, using the current knowledge base vocabulary"""
+        stats = self.stats
+        if getattr(self, 'query_parser_stats', None) is not stats:
+            # Snapshots are replaced only when jobs change, so this rebuilds rarely
+            self.query_parser = QueryParser.from_stats(stats)
+            self.query_parser_stats = stats
+        return self.query_parser.parse(user_query)
+
+    def format_job_response(self, jobs, limit=5):
+        """Format jobs into a readable response"""
+        if not jobs:
+            return "No jobs found matching your criteria."
+        
+        response = f"Found {len(jobs)} job(s). Here are the top {min(limit, len(jobs))}:\n\n"
+        
+        for idx, job in enumerate(jobs[:limit], 1):
+            response += f"{idx}. {job['title']}\n"
+            response += f"   Category: {job['category']}\n"
+            response += f"   Qualification: {job['qualification']}\n"
+            response += f"   Experience: {job['experience']}\n"
+            response += f"   Posted: {job['posted_date']}\n"
+            response += f"   Link: {job['url']}\n\n"
+        
+        return response
+
+    @timed('build_prompt')
+    def build_prompt(self, user_query, history=None, usage=None):
+        """Build the LLM prompt for a user query
+
+        `history` holds the earlier turns of the conversation; `usage`, if
+        given, receives the prompt's token estimates.
+        """
+        # Context from the jobs most relevant to this query, fitted to the token budget
+        jobs = [job for job, score in self.retriever.search(user_query, k=self.context_jobs)]
+        prompt, prompt_usage = self.prompt_builder.build(self.stats, user_query, jobs, history or [])
+        if usage is not None:
+            usage.update(prompt_usage)
+        return prompt
+
+    def find_job_results(self, user_query, parsed=None):
+        """Search jobs matching filters mentioned in the query and format them, or return None"""
+        parsed = parsed or self.parse_query(user_query)
+        if not (parsed.has_filters or parsed.listing):
+            return None
+        
+        filters = parsed.search_kwargs()
+        jobs = self.search_jobs(keyword=' '.join(parsed.keywords) or None, **filters)
+        if not jobs and parsed.keywords and parsed.has_filters:
+            # Leftover words may be conversational rather than search terms
+            jobs = self.search_jobs(**filters)
+        if jobs:
+            return self.format_job_response(jobs, limit=5)
+        return None
+
+    @timed('route_query')
+    def route_query(self, user_query):
+        """Classify a query as ('listing', formatted jobs) or ('llm', None)
+
+        Pure retrieval requests ("List all Commerce jobs") are answered from
+        the index; open-ended questions and queries with no matching jobs go
+        to the model.
+        """
+        start = time.perf_counter()
+        parsed = self.parse_query(user_query)
+        job_list = self.find_job_results(user_query, parsed) if parsed.is_listing else None
+        route = 'listing' if job_list else 'llm'
+        self.route_counts[route] += 1
+        if route == 'listing':
+            saved = self.llm_latency or 0.0
+            self.route_saved_seconds += saved
+            logger.info("Routed %r to listing in %.1f ms (~%.1fs of LLM time saved)",
+                        user_query, (time.perf_counter() - start) * 1000, saved)
+        else:
+            logger.info("Routed %r to llm (%r)", user_query, parsed)
+        return route, job_list
+
+    def record_llm_latency(self, seconds):
+        """Moving average of full LLM answers, used to estimate time saved by routing"""
+        self.llm_latency = seconds if self.llm_latency is None else 0.8 * self.llm_latency + 0.2 * seconds
+
+    def llm_stream(self, prompt, session=None, info=None):
+        """Stream the model answer, through the shared inference queue when there is one
+
+        `info` receives Ollama's prompt-eval and generation timings.
+        """
+        info = {} if info is None else info
+        if isinstance(self.llm, LLMQueue):
+            return self.llm.stream(prompt, session=session, info=info)
+        return stream_with_info(self.llm, prompt, info)
+
+    @staticmethod
+    def record_ollama_timings(metrics, info):
+        """Add Ollama's reported timings (nanoseconds) to `metrics` in seconds"""
+        if not info:
+            return
+        timings = {field: info[field] for field in OLLAMA_TIMING_FIELDS if field in info}
+        for field in ('total_duration', 'load_duration', 'prompt_eval_duration', 'eval_duration'):
+            if field in timings:
+                timings[field] /= 1e9
+        metrics['ollama'] = timings
+
+    def process_query(self, user_query, metrics=None, session=None, history=None):
+        """Process user query and generate response
+
+        On failure the error message is returned and also stored in metrics['error'].
+        `session` identifies the caller to the inference queue for fair scheduling;
+        `history` holds the earlier turns of the conversation.
+        """
+        metrics = {} if metrics is None else metrics
+        start = time.perf_counter()
+        route, job_list = self.route_query(user_query)
+        metrics['route'] = route
+        if route == 'listing':
+            metrics['total_time'] = time.perf_counter() - start
+            return job_list
+        prompt = self.build_prompt(user_query, history, usage=metrics)
+        info = {}
+
+        try:
+            # Generate response using Llama3
+            start = time.perf_counter()
+            response = ''.join(self.llm_stream(prompt, session, info))
+            metrics['total_time'] = time.perf_counter() - start
+            METRICS.observe('llm_generate', metrics['total_time'])
+            self.record_llm_latency(metrics['total_time'])
+            self.record_ollama_timings(metrics, info)
+            
+            job_list = self.find_job_results(user_query)
+            if job_list:
+                response += f"\n\n{job_list}"
+            
+            return response
+            
+        except Exception as e:
+            error_msg = f"I apologize, but I encountered an error: {str(e)}. Please make sure Ollama is running with: ollama serve"
+            metrics['error'] = error_msg
+            logger.error(error_msg)
+            return error_msg
+
+    def stream_query(self, user_query, metrics=None, session=None, history=None):
+        """Process user query, yielding response chunks as Llama3 generates them
+
+        Timing for the finished stream is written into the `metrics` dict.
+        """
+        metrics = {} if metrics is None else metrics
+        start = time.perf_counter()
+        route, job_list = self.route_query(user_query)
+        metrics['route'] = route
+        if route == 'listing':
+            # The list is the answer; it is shown before any model output
+            listed_at = time.perf_counter()
+            metrics.update({'time_to_first_token': listed_at - start, 'total_time': listed_at - start,
+                            'tokens': 0, 'tokens_per_sec': 0.0})
+            yield job_list
+            if not self.summarize_listings:
+                return
+            yield "\n\n"
+        prompt = self.build_prompt(user_query, history, usage=metrics)
+        info = {}
+        
+        first_token_at = None
+        tokens = 0
+        llm_start = time.perf_counter()
+        try:
+            # Ollama streams roughly one token per chunk
+            for chunk in self.llm_stream(prompt, session, info):
+                if first_token_at is None:
+                    first_token_at = time.perf_counter()
+                    METRICS.observe('llm_first_token', first_token_at - llm_start)
+                tokens += 1
+                yield chunk
+        except Exception as e:
+            error_msg = f"I apologize, but I encountered an error: {str(e)}. Please make sure Ollama is running with: ollama serve"
+            metrics['error'] = error_msg
+            logger.error(error_msg)
+            yield error_msg
+            return
+        end = time.perf_counter()
+        METRICS.observe('llm_generate', end - llm_start)
+        
+        generation_time = end - (first_token_at or end)
+        self.record_ollama_timings(metrics, info)
+        if route == 'listing':
+            # Summary streamed after the list: first output was the list itself
+            metrics.update({'total_time': end - start, 'tokens': tokens,
+                            'tokens_per_sec': tokens / generation_time if generation_time > 0 else 0.0})
+            return
+        metrics.update({
+            'time_to_first_token': (first_token_at or end) - start,
+            'total_time': end - start,
+            'tokens': tokens,
+            'tokens_per_sec': tokens / generation_time if generation_time > 0 else 0.0,
+        })
+        self.record_llm_latency(metrics['total_time'])
+        
+        # Job results are deterministic, so they are appended once the stream finishes
+        job_list = self.find_job_results(user_query)
+        if job_list:
+            yield f"\n\n{job_list}"
+
+    def chat(self, user_message, history=None, metrics=None, session=None):
+        """Main chat interface
+
+        `history` is the caller's conversation list; sessions sharing one
+        chatbot pass their own so conversations don't mix.
+        """
+        history = self.chat_history if history is None else history
+        metrics = {} if metrics is None else metrics
+        version = self.cache_version(history)
+        # A near-duplicate cached answer must be for the same filters
+        filters = self.parse_query(user_message).search_kwargs()
+        history.append({"role": "user", "content": user_message})
+        response = self.response_cache.get(user_message, version, filters)
+        if response is not None:
+            metrics['cached'] = True
+        else:
+            response = self.process_query(user_message, metrics, session, history=history[:-1])
+            # Listings come straight from the index, caching them saves nothing
+            if 'error' not in metrics and metrics['route'] == 'llm':
+                self.response_cache.put(user_message, version, response, metrics['total_time'], filters)
+        history.append({"role": "assistant", "content": response})
+        return response
+
+    def chat_stream(self, user_message, history=None, metrics=None, session=None):
+        """Streaming variant of chat(): yields chunks, records the full reply in history"""
+        history = self.chat_history if history is None else history
+        metrics = {} if metrics is None else metrics
+        version = self.cache_version(history)
+        # A near-duplicate cached answer must be for the same filters
+        filters = self.parse_query(user_message).search_kwargs()
+        history.append({"role": "user", "content": user_message})
+        response = self.response_cache.get(user_message, version, filters)
+        if response is not None:
+            metrics['cached'] = True
+            yield response
+        else:
+            response = ""
+            for chunk in self.stream_query(user_message, metrics, session, history=history[:-1]):
+                response += chunk
+                yield chunk
+            if 'error' not in metrics and (metrics['route'] == 'llm' or self.summarize_listings):
+                self.response_cache.put(user_message, version, response, metrics['total_time'], filters)
+        history.append({"role": "assistant", "content": response})
+
+class SharedKnowledgeBase:
+    """Process-wide chatbot, LLM client and job store shared by all browser sessions
+
+    Sessions read current() on every rerun. A finished scrape builds a fresh
+    chatbot and swaps it in with publish(), so readers never see a
+    half-built knowledge base and nothing is rebuilt per session. Snapshots
+    published to the store by a background refresh (a newer store
+    generation) are rebuilt on a worker thread while sessions keep using
+    the current chatbot.
+
+    With `snapshot_path` set, each knowledge base that becomes current is
+    also written to a binary snapshot in the background, and a cold start
+    whose store still matches the snapshot loads it instead of rebuilding.
+    """
+
+    def __init__(self, store, llm, snapshot_path=None):
+        self.store = store
+        self.llm = llm
+        self.snapshot_path = snapshot_path
+        self.chatbot = None
+        self.generation = 0
+        self.rebuilding = False
+        self.lock = threading.Lock()
+        # Store generation the snapshot file holds; writes are serialized
+        self.snapshot_generation = None
+        self.snapshot_lock = threading.Lock()
+
+    def build(self):
+        """Create a new chatbot over the stored jobs (not yet visible to sessions)
+
+        Nothing is written to the snapshot file here: the caller may still add
+        jobs to the chatbot. current(), rebuild() and publish() write it once
+        the chatbot is swapped in.
+        """
+        snapshot = self.load_snapshot(self.store_generation())
+        return JobYaariChatbot(None, store=self.store, llm=self.llm, snapshot=snapshot)
+
+    def load_snapshot(self, generation):
+        """Snapshot contents if one was written for this store generation and job count, else None"""
+        if not self.snapshot_path or not self.store or not os.path.exists(self.snapshot_path):
+            return None
+        try:
+            snapshot = load_snapshot(self.snapshot_path)
+        except (SnapshotError, KeyError, ValueError) as e:
+            logger.warning("Ignoring knowledge base snapshot %s: %s", self.snapshot_path, e)
+            return None
+        meta = snapshot['meta']
+        if meta['generation'] != generation or meta['jobs'] != self.store.count():
+            logger.info("Knowledge base snapshot is stale (generation %s, store at %s)", meta['generation'], generation)
+            return None
+        self.snapshot_generation = generation
+        return snapshot
+
+    def write_snapshot(self, chatbot, generation):
+        """Save the current `chatbot`'s knowledge base to the snapshot file on a background thread"""
+        if not self.snapshot_path or not self.store or generation == self.snapshot_generation:
+            return
+
+        def write():
+            with self.snapshot_lock:
+                # A chatbot swapped out meanwhile must not overwrite its successor's snapshot
+                if chatbot is not self.chatbot:
+                    return
+                try:
+                    chatbot.save_snapshot(self.snapshot_path, generation=generation)
+                    self.snapshot_generation = generation
+                except Exception:
+                    logger.exception("Writing knowledge base snapshot failed")
+
+        threading.Thread(target=write, name="jobyaari-kb-snapshot", daemon=True).start()
+
+    def store_generation(self):
+        return self.store.generation() if self.store else self.generation
+
+    def current(self):
+        with self.lock:
+            if self.chatbot is None:
+                self.generation = self.store_generation()
+                self.chatbot = self.build()
+                self.write_snapshot(self.chatbot, self.generation)
+            elif not self.rebuilding and self.store_generation() > self.generation:
+                self.rebuilding = True
+                threading.Thread(target=self.rebuild, name="jobyaari-kb-rebuild", daemon=True).start()
+            return self.chatbot
+
+    def rebuild(self):
+        """Build a chatbot for the newest store snapshot and swap it in"""
+        try:
+            generation = self.store_generation()
+            chatbot = self.build()
+            with self.lock:
+                if generation <= self.generation:
+                    return
+                self.chatbot = chatbot
+                self.generation = generation
+            self.write_snapshot(chatbot, generation)
+        except Exception:
+            logger.exception("Knowledge base rebuild failed")
+        finally:
+            self.rebuilding = False
+
+    def publish(self, chatbot):
+        """Make `chatbot` the knowledge base every session uses from its next rerun"""
+        with self.lock:
+            self.chatbot = chatbot
+            self.generation = self.store.publish_generation() if self.store else self.generation + 1
+            generation = self.generation
+        self.write_snapshot(chatbot, generation)
+
+def create_shared_knowledge_base():
+    """SharedKnowledgeBase over the default job store and Ollama, configured from the environment"""
+    # Every session's generations go through one queue in front of the local Ollama server
+    # keep_alive holds the model (and its prompt cache) in memory between turns
+    llm = LLMQueue(Ollama(model="llama3:8b", num_ctx=CONTEXT_TOKENS, keep_alive="30m"),
+                   max_in_flight=int(os.environ.get('JOBYAARI_LLM_CONCURRENCY', 1)),
+                   timeout=float(os.environ.get('JOBYAARI_LLM_QUEUE_TIMEOUT', 120)))
+    return SharedKnowledgeBase(JobStore(), llm,
+                               snapshot_path=os.environ.get('JOBYAARI_SNAPSHOT', '.jobyaari_cache/kb.snapshot'))
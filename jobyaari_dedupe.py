@@ -0,0 +1,208 @@
+"""Ingest-time dedupe: canonical URLs and MinHash/LSH near-duplicate detection"""
+import threading
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import numpy as np
+
+from jobyaari_record import DEFAULT_VALUES
+from jobyaari_search import tokenize
+
+TRACKING_PARAMS = frozenset(['fbclid', 'gclid', 'msclkid', 'ref', 'ref_src', 'source', 'amp'])
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+# 64-bit multiply-shift hash family; numpy uint64 arithmetic wraps modulo 2**64
+MASK64 = (1 << 64) - 1
+
+
+def canonical_parts(url):
+    """(scheme, host, path, query) with the host lowercased, default port and tracking parameters dropped"""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    query = parts.query
+    if query:
+        query = urlencode(sorted((name, value) for name, value in parse_qsl(query, keep_blank_values=True)
+                                 if not name.lower().startswith('utm_') and name.lower() not in TRACKING_PARAMS))
+    return scheme, host, parts.path or '/', query
+
+
+def canonical_url(url):
+    """Same address, normalized: lowercase host, no default port, fragment or tracking parameters"""
+    if not url:
+        return url
+    return urlunsplit(canonical_parts(url) + ('',))
+
+
+def job_key(job):
+    """Identity of a posting, shared by the deduper and the job store
+
+    The canonical URL without scheme, leading "www." or trailing slash,
+    plus the lowercased title when the listing had no link of its own.
+    """
+    _, host, path, query = canonical_parts(job.get('url') or '')
+    if host.startswith('www.'):
+        host = host[4:]
+    path = path.rstrip('/') or '/'
+    key = urlunsplit(('', host, path, query, ''))
+    if path == '/' and not query:
+        return f"{key}#{job.get('title', '').lower()}"
+    return key
+
+
+# Below this many shingles a similarity estimate says little about whether two postings match
+MIN_SHINGLES = 12
+
+
+def shingles(job):
+    """Word unigrams and bigrams of the title and bigrams of the description
+
+    Empty when the description is missing, a placeholder or too short: a
+    generic title like "Assistant Professor" alone can't tell an IIT Delhi
+    posting from an AIIMS one, so such jobs are deduplicated by URL only.
+    """
+    description = job.get('description', '')
+    if not description or description in DEFAULT_VALUES:
+        return set()
+    words = tokenize(description)
+    title = tokenize(job.get('title', ''))
+    features = set(title)
+    features.update(zip(title, title[1:]))
+    features.update(zip(words, words[1:]))
+    return features if len(features) >= MIN_SHINGLES else set()
+
+
+def title_numbers(job):
+    """Numbers in the title; "Post 3" and "Post 4", or 2024 and 2025 notices, are different jobs"""
+    return frozenset(token for token in tokenize(job.get('title', '')) if token.isdigit())
+
+
+class NearDuplicateIndex:
+    """MinHash signatures bucketed by LSH bands
+
+    Two jobs whose shingle sets have Jaccard similarity `s` share at least
+    one of `bands` bands with probability 1 - (1 - s**rows)**bands, so a
+    lookup only compares against the few jobs in matching buckets instead of
+    the whole corpus. Candidates are confirmed when the fraction of equal
+    signature values (an estimate of `s`) reaches `threshold`.
+    """
+
+    def __init__(self, num_perm=64, bands=8, threshold=0.8, seed=1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        rng = np.random.default_rng(seed)
+        self.multipliers = rng.integers(1, 2 ** 63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+        self.offsets = rng.integers(0, 2 ** 63, size=num_perm, dtype=np.uint64)
+        # Folds each band of a signature into one integer bucket key
+        self.band_mixers = rng.integers(1, 2 ** 63, size=num_perm // bands, dtype=np.uint64) | np.uint64(1)
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.buckets = [{} for _ in range(bands)]
+        self.entries = []  # (signature, title numbers, key) per indexed job
+
+    def sketches(self, shingle_sets):
+        """(MinHash signature, band keys) per shingle set, None for empty sets, computed in one batch"""
+        hashes, starts = [], []
+        for features in shingle_sets:
+            if features:
+                starts.append(len(hashes))
+                hashes.extend(hash(feature) & MASK64 for feature in features)
+            else:
+                starts.append(None)
+        present = [start for start in starts if start is not None]
+        if not present:
+            return [None] * len(starts)
+        values = np.array(hashes, dtype=np.uint64)
+        permuted = (self.multipliers[:, None] * values[None, :] + self.offsets[:, None]) >> np.uint64(32)
+        minimums = np.minimum.reduceat(permuted, present, axis=1).T
+        band_keys = (minimums.reshape(len(present), self.bands, self.rows) * self.band_mixers).sum(axis=2).tolist()
+        rows = iter(zip(minimums.astype(np.uint32), band_keys))
+        return [None if start is None else next(rows) for start in starts]
+
+    def find(self, sketch, numbers):
+        """Key of an indexed near-duplicate, or None
+
+        Title numbers must match exactly, so they are mixed into every bucket key.
+        """
+        signature, band_keys = sketch
+        salt = hash(numbers)
+        checked = set()
+        for band, band_key in enumerate(band_keys):
+            for entry in self.buckets[band].get(band_key ^ salt, ()):
+                if entry in checked:
+                    continue
+                checked.add(entry)
+                other, other_numbers, key = self.entries[entry]
+                if other_numbers == numbers and np.count_nonzero(other == signature) >= self.threshold * len(signature):
+                    return key
+        return None
+
+    def add(self, sketch, numbers, key):
+        signature, band_keys = sketch
+        salt = hash(numbers)
+        entry = len(self.entries)
+        self.entries.append((signature, numbers, key))
+        for bucket, band_key in zip(self.buckets, band_keys):
+            bucket.setdefault(band_key ^ salt, []).append(entry)
+
+
+class JobDeduper:
+    """Admits each job once: exact matches by canonical URL, reposts by MinHash similarity
+
+    Thread-safe, so concurrent category workers can share one instance and
+    the same notification listed under two categories is kept only once.
+    `counts` records how many jobs were dropped for each reason.
+    """
+
+    def __init__(self, threshold=0.8, batch_size=2048):
+        self.urls = set()
+        self.near = NearDuplicateIndex(threshold=threshold)
+        self.batch_size = batch_size
+        self.counts = {'url': 0, 'near': 0}
+        self.lock = threading.Lock()
+
+    @property
+    def duplicates(self):
+        return self.counts['url'] + self.counts['near']
+
+    def _check(self, job, key, sketch):
+        """Duplicate reason for `job`, or None after remembering it; call with lock held"""
+        if key in self.urls:
+            self.counts['url'] += 1
+            return 'url'
+        if sketch is not None:
+            numbers = title_numbers(job)
+            if self.near.find(sketch, numbers) is not None:
+                self.counts['near'] += 1
+                return 'near'
+            self.near.add(sketch, numbers, key)
+        self.urls.add(key)
+        return None
+
+    def check(self, job):
+        """'url' or 'near' if `job` duplicates one already admitted, else None (and admit it)"""
+        key = job_key(job)
+        sketch = self.near.sketches([shingles(job)])[0]
+        with self.lock:
+            return self._check(job, key, sketch)
+
+    def filter(self, jobs):
+        """Yield the jobs that are not duplicates, hashing them in batches"""
+        batch = []
+        for job in jobs:
+            batch.append(job)
+            if len(batch) >= self.batch_size:
+                yield from self._filter_batch(batch)
+                batch = []
+        if batch:
+            yield from self._filter_batch(batch)
+
+    def _filter_batch(self, batch):
+        keys = [job_key(job) for job in batch]
+        sketches = self.near.sketches([shingles(job) for job in batch])
+        with self.lock:
+            admitted = [job for job, key, sketch in zip(batch, keys, sketches)
+                        if self._check(job, key, sketch) is None]
+        return admitted
@@ -0,0 +1,127 @@
+"""Store-backed Data Explorer: cached queries and chunked exports"""
+import io
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet export is optional
+    pa = None
+
+FACET_COLUMNS = ('category', 'experience', 'qualification')
+DISPLAY_COLUMNS = ('title', 'category', 'url', 'posted_date', 'qualification', 'experience',
+                   'description', 'first_seen', 'last_seen')
+EXPORT_FORMATS = ('CSV', 'Parquet') if pa is not None else ('CSV',)
+SEEN_COLUMNS = ('first_seen', 'last_seen')
+
+
+def jobs_frame(jobs, categorical=True):
+    """DataFrame of stored job dicts, facets as categoricals and seen times as datetimes"""
+    df = pd.DataFrame(jobs, columns=DISPLAY_COLUMNS)
+    if categorical:
+        for column in FACET_COLUMNS:
+            df[column] = df[column].astype('category')
+    for column in SEEN_COLUMNS:
+        df[column] = pd.to_datetime(df[column], unit='s')
+    return df
+
+
+class JobExplorer:
+    """Data Explorer queries answered by the job store, built once per data version
+
+    Facet values and counts come from GROUP BY over the indexed columns and
+    keyword search from the FTS5 index, so only the rows on screen (or in
+    the export chunk being encoded) are read into pandas. Results are
+    memoized per filter combination, so a Streamlit rerun with unchanged
+    filters runs no SQL.
+    """
+
+    def __init__(self, store, page_size=500):
+        self.store = store
+        self.page_size = page_size
+        self.total = store.count()
+        self.counts = {column: store.value_counts(column) for column in FACET_COLUMNS}
+        self.uniques = {column: [value for value in counts if value is not None]
+                        for column, counts in self.counts.items()}
+        self.cache = {}
+
+    def __len__(self):
+        return self.total
+
+    def _cached(self, key, build):
+        value = self.cache.get(key)
+        if value is None:
+            if len(self.cache) > 64:
+                self.cache.clear()
+            value = self.cache[key] = build()
+        return value
+
+    @staticmethod
+    def _filters(categories, experiences, keyword):
+        keyword = (keyword or '').strip()
+        return {'categories': list(categories) or None, 'experiences': list(experiences) or None,
+                'keyword': keyword or None}
+
+    @staticmethod
+    def _key(kind, categories, experiences, keyword):
+        return kind, tuple(sorted(categories)), tuple(sorted(experiences)), (keyword or '').strip().lower()
+
+    def count(self, categories=(), experiences=(), keyword=''):
+        """Number of jobs matching every given filter"""
+        if not (categories or experiences or (keyword or '').strip()):
+            return self.total
+        filters = self._filters(categories, experiences, keyword)
+        return self._cached(self._key('count', categories, experiences, keyword),
+                            lambda: self.store.count(**filters))
+
+    def page(self, categories=(), experiences=(), keyword=''):
+        """First `page_size` matching jobs as a DataFrame, ranked by relevance when a keyword is given"""
+        filters = self._filters(categories, experiences, keyword)
+        return self._cached(self._key('page', categories, experiences, keyword),
+                            lambda: jobs_frame(self.store.search(limit=self.page_size, **filters)))
+
+    def iter_chunks(self, categories=(), experiences=(), keyword='', chunk_size=5000):
+        """Yield every matching job as DataFrames of up to `chunk_size` rows (at least one, maybe empty)"""
+        filters = self._filters(categories, experiences, keyword)
+        offset = 0
+        while True:
+            jobs = self.store.search(limit=chunk_size, offset=offset, **filters)
+            if jobs or not offset:
+                yield jobs_frame(jobs, categorical=False)
+            if len(jobs) < chunk_size:
+                return
+            offset += chunk_size
+
+
+def iter_csv_chunks(chunks):
+    """Yield the CSV encoding of each DataFrame in `chunks`, with the header once"""
+    for number, df in enumerate(chunks):
+        buffer = io.StringIO()
+        df.to_csv(buffer, index=False, header=number == 0)
+        yield buffer.getvalue().encode('utf-8')
+
+
+def to_csv_bytes(chunks):
+    return b''.join(iter_csv_chunks(chunks))
+
+
+def to_parquet_bytes(chunks):
+    """Parquet file with one row group per chunk"""
+    if pa is None:
+        raise RuntimeError("Parquet export requires pyarrow")
+    # Fixed schema: a chunk whose column is all empty must not change its type
+    schema = pa.schema([(column, pa.timestamp('ns') if column in SEEN_COLUMNS else pa.string())
+                        for column in DISPLAY_COLUMNS])
+    buffer = io.BytesIO()
+    with pq.ParquetWriter(buffer, schema) as writer:
+        for df in chunks:
+            writer.write_table(pa.Table.from_pandas(df, schema=schema, preserve_index=False))
+    return buffer.getvalue()
+
+
+def export_bytes(chunks, fmt):
+    """Encode DataFrame `chunks` for download as 'CSV' or 'Parquet'"""
+    if fmt == 'Parquet':
+        return to_parquet_bytes(chunks)
+    return to_csv_bytes(chunks)
@@ -0,0 +1,339 @@
+"""HTTP fetch helpers for the JobYaari scraper"""
+import hashlib
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:  # urllib3 decodes Brotli only when one of these is installed
+    import brotli  # noqa: F401
+    ACCEPT_ENCODING = 'gzip, deflate, br'
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        ACCEPT_ENCODING = 'gzip, deflate, br'
+    except ImportError:
+        ACCEPT_ENCODING = 'gzip, deflate'
+
+# Responses worth retrying: throttling and transient server errors
+RETRY_STATUSES = frozenset([429, 500, 502, 503, 504])
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, up to `capacity` banked"""
+
+    def __init__(self, rate, capacity=1):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self, now):
+        elapsed = now - self.updated
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+        self.updated = now
+
+    def acquire(self):
+        """Block until a token is available, return the time spent waiting"""
+        waited = 0.0
+        while True:
+            with self.lock:
+                self._refill(time.monotonic())
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                wait = (1 - self.tokens) / self.rate
+            # Sleep outside the lock so other hosts/threads are not blocked
+            time.sleep(wait)
+            waited += wait
+
+
+class HostRateLimiter:
+    """One token bucket per host so politeness is enforced per site, not per thread"""
+
+    def __init__(self, rate=1.0, burst=1):
+        self.rate = rate
+        self.burst = burst
+        self.buckets = {}
+        self.lock = threading.Lock()
+
+    def bucket_for(self, url):
+        host = urlparse(url).netloc
+        with self.lock:
+            bucket = self.buckets.get(host)
+            if bucket is None:
+                bucket = self.buckets[host] = TokenBucket(self.rate, self.burst)
+            return bucket
+
+    def acquire(self, url):
+        """Wait for permission to hit the host of `url`"""
+        return self.bucket_for(url).acquire()
+
+
+def build_session(headers, pool_size=10, pool_hosts=4):
+    """Create a requests session whose connection pool is shared by all workers
+
+    Each of up to `pool_hosts` hosts keeps `pool_size` connections; workers
+    wait for a free one instead of opening throwaway extras. Retries are
+    left to Fetcher, which knows the latency budget.
+    """
+    session = requests.Session()
+    session.headers.update({'Accept-Encoding': ACCEPT_ENCODING})
+    session.headers.update(headers)
+    adapter = HTTPAdapter(pool_connections=pool_hosts, pool_maxsize=pool_size, pool_block=True, max_retries=0)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+class FetchError(Exception):
+    """A page could not be fetched"""
+
+
+class CircuitOpenError(FetchError):
+    """The host failed repeatedly and is not being contacted until its cool-down ends"""
+
+
+class BudgetExceededError(FetchError):
+    """The latency budget ran out before the page was fetched"""
+
+
+class CircuitBreaker:
+    """Per-host circuit breaker
+
+    After `failure_threshold` consecutive failed fetches a host's circuit
+    opens and requests to it fail immediately for `reset_timeout` seconds.
+    Then one trial request is let through (half-open): success closes the
+    circuit, failure opens it again.
+    """
+
+    def __init__(self, failure_threshold=3, reset_timeout=60.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.hosts = {}  # host -> [consecutive failures, opened_at or None, trial in flight]
+        self.lock = threading.Lock()
+
+    def before(self, url):
+        """Raise CircuitOpenError unless a request to the host of `url` may go ahead"""
+        host = urlparse(url).netloc
+        with self.lock:
+            state = self.hosts.get(host)
+            if state is None or state[1] is None:
+                return
+            if time.monotonic() - state[1] < self.reset_timeout or state[2]:
+                raise CircuitOpenError(f"Circuit open for {host} after {state[0]} consecutive failures")
+            state[2] = True
+
+    def record(self, url, ok):
+        host = urlparse(url).netloc
+        with self.lock:
+            state = self.hosts.setdefault(host, [0, None, False])
+            state[2] = False
+            if ok:
+                state[0], state[1] = 0, None
+            else:
+                state[0] += 1
+                if state[0] >= self.failure_threshold:
+                    state[1] = time.monotonic()
+
+    def release(self, url):
+        """End a request that neither succeeded nor failed against the host (e.g. out of budget)"""
+        host = urlparse(url).netloc
+        with self.lock:
+            state = self.hosts.get(host)
+            if state is not None:
+                state[2] = False
+
+    def open_hosts(self):
+        with self.lock:
+            return sorted(host for host, state in self.hosts.items() if state[1] is not None)
+
+
+def retry_after_seconds(response):
+    """Delay requested by a Retry-After header (seconds or HTTP date), or None"""
+    value = response.headers.get('Retry-After') if response is not None else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+
+class Fetcher:
+    """GETs with per-host rate limiting, exponential-backoff retries, latency budgets and circuit breaking
+
+    `timeout` is the (connect, read) timeout of one attempt; a `deadline`
+    (time.monotonic() value) passed to get() caps the attempts, backoff
+    sleeps and read timeouts of that request as a whole.
+    """
+
+    def __init__(self, session, rate_limiter, retries=2, backoff=0.5, max_backoff=8.0, timeout=(5.0, 15.0),
+                 breaker=None, history=512):
+        self.session = session
+        self.rate_limiter = rate_limiter
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.breaker = breaker or CircuitBreaker()
+        self.latencies = deque(maxlen=history)
+        self.counters = {'requests': 0, 'retries': 0, 'failures': 0, 'short_circuited': 0,
+                         'budget_exceeded': 0, 'compressed': 0, 'bytes': 0}
+        self.lock = threading.Lock()
+
+    def count(self, name, amount=1):
+        with self.lock:
+            self.counters[name] += amount
+
+    def remaining(self, deadline):
+        if deadline is None:
+            return None
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            self.count('budget_exceeded')
+            raise BudgetExceededError("Latency budget exhausted")
+        return remaining
+
+    def get(self, url, headers=None, deadline=None):
+        """Fetch `url`, retrying request errors (connection, timeout, broken transfer) and RETRY_STATUSES responses"""
+        try:
+            self.breaker.before(url)
+        except CircuitOpenError:
+            self.count('short_circuited')
+            raise
+        error = None
+        recorded = False
+        try:
+            for attempt in range(self.retries + 1):
+                remaining = self.remaining(deadline)
+                self.rate_limiter.acquire(url)
+                connect, read = self.timeout
+                if remaining is not None:
+                    connect, read = min(connect, remaining), min(read, remaining)
+                self.count('requests')
+                start = time.perf_counter()
+                response = None
+                try:
+                    response = self.session.get(url, timeout=(connect, read), headers=headers)
+                except requests.RequestException as e:
+                    error = e
+                else:
+                    if response.status_code not in RETRY_STATUSES:
+                        with self.lock:
+                            self.latencies.append(time.perf_counter() - start)
+                            self.counters['bytes'] += len(response.content)
+                            if response.headers.get('Content-Encoding'):
+                                self.counters['compressed'] += 1
+                        self.breaker.record(url, True)
+                        recorded = True
+                        return response
+                    error = FetchError(f"HTTP {response.status_code} from {url}")
+                if attempt == self.retries:
+                    break
+                self.count('retries')
+                delay = retry_after_seconds(response)
+                if delay is None:
+                    delay = min(self.max_backoff, self.backoff * 2 ** attempt) * random.uniform(0.5, 1.0)
+                remaining = self.remaining(deadline)
+                if remaining is not None and delay >= remaining:
+                    break
+                time.sleep(delay)
+            self.count('failures')
+            self.breaker.record(url, False)
+            recorded = True
+            raise error
+        finally:
+            if not recorded:
+                # Budget ran out (or an unexpected error): don't leave a half-open trial in flight forever
+                self.breaker.release(url)
+
+    def metrics(self):
+        """Request counters, latency percentiles and hosts whose circuit is open"""
+        with self.lock:
+            latencies = sorted(self.latencies)
+            counters = dict(self.counters)
+        return {
+            **counters,
+            'p50_latency': latencies[len(latencies) // 2] if latencies else 0.0,
+            'p95_latency': latencies[int(0.95 * (len(latencies) - 1))] if latencies else 0.0,
+            'open_circuits': self.breaker.open_hosts(),
+        }
+
+
+class PageCache:
+    """On-disk cache of HTTP validators and parsed jobs, one JSON file per URL"""
+
+    def __init__(self, cache_dir=".jobyaari_cache/pages"):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def path_for(self, url):
+        digest = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.json")
+
+    def get(self, url):
+        """Return the cached entry for `url`, or None"""
+        try:
+            with open(self.path_for(url), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return entry if entry.get('url') == url else None
+
+    def conditional_headers(self, entry):
+        """Build If-None-Match / If-Modified-Since headers from a cached entry"""
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def put(self, url, response, jobs, next_url=None):
+        """Store validators from `response` together with the jobs parsed from it"""
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if not etag and not last_modified:
+            # Nothing to revalidate with, so a cached copy would never be used
+            return
+        entry = {
+            'url': url,
+            'etag': etag,
+            'last_modified': last_modified,
+            'next_url': next_url,
+            'fetched_at': time.time(),
+            'jobs': jobs,
+        }
+        # Write to a temp file and rename so readers never see a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, self.path_for(url))
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def record(self, hit):
+        with self.lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
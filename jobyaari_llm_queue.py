@@ -0,0 +1,232 @@
+"""Shared inference queue in front of the local LLM: admission control, fairness, coalescing"""
+import threading
+import time
+from collections import deque
+
+try:
+    from langchain_core.callbacks import BaseCallbackHandler
+except ImportError:  # plain clients without LangChain callbacks
+    BaseCallbackHandler = object
+
+# Ollama reports these in nanoseconds on the final chunk of a generation
+OLLAMA_TIMING_FIELDS = ('total_duration', 'load_duration', 'prompt_eval_count', 'prompt_eval_duration',
+                        'eval_count', 'eval_duration')
+
+
+class GenerationInfoCollector(BaseCallbackHandler):
+    """Copies the provider's final generation_info (Ollama timings) into a dict"""
+
+    def __init__(self, info):
+        self.info = info
+
+    def on_llm_end(self, response, **kwargs):
+        for generations in response.generations:
+            for generation in generations:
+                self.info.update({field: value for field, value in (generation.generation_info or {}).items()
+                                  if field in OLLAMA_TIMING_FIELDS})
+
+
+def stream_with_info(llm, prompt, info):
+    """llm.stream(prompt), also filling `info` with Ollama's timings when the client reports them"""
+    if BaseCallbackHandler is object or not hasattr(llm, 'with_config'):
+        return llm.stream(prompt)
+    return llm.stream(prompt, config={'callbacks': [GenerationInfoCollector(info)]})
+
+
+class QueueTimeout(Exception):
+    """A request waited longer than its timeout for a free generation slot"""
+
+
+class Generation:
+    """One model generation whose chunks can be read by several requests at once"""
+
+    def __init__(self, prompt, session):
+        self.prompt = prompt
+        self.session = session
+        self.chunks = []
+        self.done = False
+        self.error = None
+        self.started_at = None
+        self.enqueued_at = time.perf_counter()
+        self.readers = 0
+        self.cancelled = False
+        self.info = {}
+        self.cond = threading.Condition()
+
+    def append(self, chunk):
+        with self.cond:
+            self.chunks.append(chunk)
+            self.cond.notify_all()
+
+    def finish(self, error=None):
+        with self.cond:
+            self.done = True
+            self.error = error
+            self.cond.notify_all()
+
+
+class LLMQueue:
+    """Runs at most `max_in_flight` generations on the wrapped client at a time
+
+    Waiting requests are grouped per session and the least recently served
+    session goes next, so one user firing several questions can't starve the
+    others. A prompt identical to one that is already queued or running
+    attaches to that generation instead of starting another. Requests give
+    up with QueueTimeout after waiting `timeout` seconds for a slot, and a
+    generation nobody is reading any more is cancelled.
+
+    `invoke` and `stream` mirror the LangChain LLM methods used by the
+    chatbot, with an extra `session` argument.
+    """
+
+    def __init__(self, llm, max_in_flight=1, timeout=120.0, history=256):
+        self.llm = llm
+        self.max_in_flight = max_in_flight
+        self.timeout = timeout
+        self.cond = threading.Condition()
+        self.waiting = {}  # session -> deque of queued generations
+        self.active = {}  # prompt -> queued or running generation
+        self.in_flight = 0
+        self.served = 0
+        self.last_served = {}  # session -> turn it was last served
+        self.workers = []
+        self.wait_times = deque(maxlen=history)
+        self.counters = {'requests': 0, 'coalesced': 0, 'completed': 0, 'timeouts': 0, 'cancelled': 0, 'errors': 0}
+
+    def _start_workers(self):
+        while len(self.workers) < self.max_in_flight:
+            worker = threading.Thread(target=self._work, name=f"llm-queue-{len(self.workers)}", daemon=True)
+            self.workers.append(worker)
+            worker.start()
+
+    def _next(self):
+        """Pop the next generation; call with cond held
+
+        The waiting session that was served least recently goes first.
+        """
+        if not self.waiting:
+            return None
+        session = min(self.waiting, key=lambda name: self.last_served.get(name, -1))
+        queued = self.waiting[session]
+        generation = queued.popleft()
+        if not queued:
+            del self.waiting[session]
+        self.served += 1
+        self.last_served[session] = self.served
+        if len(self.last_served) > 1024:
+            self.last_served = {name: turn for name, turn in self.last_served.items() if name in self.waiting}
+        return generation
+
+    def _work(self):
+        while True:
+            with self.cond:
+                generation = self._next()
+                while generation is None:
+                    self.cond.wait()
+                    generation = self._next()
+                self.in_flight += 1
+            generation.started_at = time.perf_counter()
+            self.wait_times.append(generation.started_at - generation.enqueued_at)
+            error = None
+            try:
+                for chunk in stream_with_info(self.llm, generation.prompt, generation.info):
+                    if generation.cancelled:
+                        break
+                    generation.append(chunk)
+            except Exception as e:
+                error = e
+            with self.cond:
+                self.in_flight -= 1
+                if error is not None:
+                    self.counters['errors'] += 1
+                if self.active.get(generation.prompt) is generation:
+                    del self.active[generation.prompt]
+                if generation.cancelled:
+                    self.counters['cancelled'] += 1
+                else:
+                    self.counters['completed'] += 1
+            generation.finish(error)
+
+    def submit(self, prompt, session=None):
+        """Queue `prompt` (or join the identical one in flight) and return its Generation"""
+        with self.cond:
+            self._start_workers()
+            self.counters['requests'] += 1
+            generation = self.active.get(prompt)
+            if generation is not None and not generation.cancelled:
+                self.counters['coalesced'] += 1
+            else:
+                generation = self.active[prompt] = Generation(prompt, session)
+                self.waiting.setdefault(session, deque()).append(generation)
+                self.cond.notify()
+            generation.readers += 1
+        return generation
+
+    def _detach(self, generation):
+        with self.cond:
+            generation.readers -= 1
+            if generation.readers or generation.done:
+                return
+            generation.cancelled = True
+            queued = self.waiting.get(generation.session)
+            if queued and generation in queued:
+                # Never started: drop it from the queue
+                queued.remove(generation)
+                if not queued:
+                    del self.waiting[generation.session]
+                if self.active.get(generation.prompt) is generation:
+                    del self.active[generation.prompt]
+                self.counters['cancelled'] += 1
+
+    def stream(self, prompt, session=None, timeout=None, info=None):
+        """Yield chunks of the generation for `prompt` as they are produced
+
+        `info`, if given, receives the generation's Ollama timings once it finishes.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        generation = self.submit(prompt, session)
+        deadline = time.perf_counter() + timeout if timeout else None
+        position = 0
+        try:
+            while True:
+                with generation.cond:
+                    while position == len(generation.chunks) and not generation.done:
+                        if generation.started_at is None and deadline is not None:
+                            remaining = deadline - time.perf_counter()
+                            if remaining <= 0:
+                                with self.cond:
+                                    self.counters['timeouts'] += 1
+                                raise QueueTimeout(f"LLM queue wait exceeded {timeout:.0f}s")
+                            generation.cond.wait(remaining)
+                        else:
+                            generation.cond.wait()
+                    chunks = generation.chunks[position:]
+                    done, error = generation.done, generation.error
+                position += len(chunks)
+                yield from chunks
+                if done and position == len(generation.chunks):
+                    if error is not None:
+                        raise error
+                    if info is not None:
+                        info.update(generation.info)
+                    return
+        finally:
+            self._detach(generation)
+
+    def invoke(self, prompt, session=None, timeout=None, info=None):
+        return ''.join(self.stream(prompt, session=session, timeout=timeout, info=info))
+
+    def metrics(self):
+        """Queue depth, in-flight count, wait times and request counters"""
+        with self.cond:
+            depth = sum(len(queued) for queued in self.waiting.values())
+            waits = sorted(self.wait_times)
+            return {
+                'queue_depth': depth,
+                'waiting_sessions': len(self.waiting),
+                'in_flight': self.in_flight,
+                'max_in_flight': self.max_in_flight,
+                'avg_wait': sum(waits) / len(waits) if waits else 0.0,
+                'p95_wait': waits[int(0.95 * (len(waits) - 1))] if waits else 0.0,
+                **self.counters,
+            }
@@ -0,0 +1,161 @@
+"""Latency spans with p50/p95/p99 summaries, Prometheus/JSON export and one-off profiling"""
+import functools
+import io
+import json
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+class LatencySummary:
+    """Count and sum of all observations plus a window of recent ones for quantiles"""
+
+    def __init__(self, window=2048):
+        self.count = 0
+        self.total = 0.0
+        self.recent = deque(maxlen=window)
+
+    def observe(self, seconds):
+        self.count += 1
+        self.total += seconds
+        self.recent.append(seconds)
+
+    def quantiles(self):
+        values = sorted(self.recent)
+        if not values:
+            return {q: 0.0 for q in QUANTILES}
+        return {q: values[min(int(q * len(values)), len(values) - 1)] for q in QUANTILES}
+
+
+class Span:
+    """Context manager that records its wall time under `name`"""
+    __slots__ = ('registry', 'name', 'start')
+
+    def __init__(self, registry, name):
+        self.registry = registry
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.registry.observe(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class LatencyRegistry:
+    """Process-wide latency summaries keyed by span name"""
+
+    def __init__(self, window=2048):
+        self.window = window
+        self.summaries = {}
+        self.lock = threading.Lock()
+
+    def span(self, name):
+        return Span(self, name)
+
+    def observe(self, name, seconds):
+        with self.lock:
+            summary = self.summaries.get(name)
+            if summary is None:
+                summary = self.summaries[name] = LatencySummary(self.window)
+            summary.observe(seconds)
+
+    def reset(self):
+        with self.lock:
+            self.summaries.clear()
+
+    def snapshot(self):
+        """{span: {'count', 'sum', 'p50', 'p95', 'p99'}} in seconds"""
+        with self.lock:
+            items = [(name, summary.count, summary.total, summary.quantiles())
+                     for name, summary in sorted(self.summaries.items())]
+        return {name: {'count': count, 'sum': total,
+                       **{f"p{int(q * 100)}": value for q, value in quantiles.items()}}
+                for name, count, total, quantiles in items}
+
+    def to_json(self):
+        return json.dumps({'timestamp': time.time(), 'spans': self.snapshot()})
+
+    def prometheus_text(self, metric="jobyaari_latency_seconds"):
+        """Prometheus text exposition format, one summary per span"""
+        lines = [f"# HELP {metric} Latency of instrumented JobYaari code paths",
+                 f"# TYPE {metric} summary"]
+        for name, values in self.snapshot().items():
+            for q in QUANTILES:
+                lines.append(f'{metric}{{span="{name}",quantile="{q}"}} {values[f"p{int(q * 100)}"]:.6f}')
+            lines.append(f'{metric}_sum{{span="{name}"}} {values["sum"]:.6f}')
+            lines.append(f'{metric}_count{{span="{name}"}} {values["count"]}')
+        return '\n'.join(lines) + '\n'
+
+
+METRICS = LatencyRegistry()
+
+
+def timed(name):
+    """Decorator recording every call of the function under `name`"""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with METRICS.span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    registry = METRICS
+
+    def do_GET(self):
+        if self.path.startswith('/metrics.json'):
+            body, content_type = self.registry.to_json(), 'application/json'
+        elif self.path.startswith('/metrics'):
+            body, content_type = self.registry.prometheus_text(), 'text/plain; version=0.0.4'
+        else:
+            self.send_error(404)
+            return
+        body = body.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_metrics(port, host='127.0.0.1'):
+    """Serve /metrics (Prometheus text) and /metrics.json from a daemon thread"""
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
+
+
+def profile_call(func, *args, limit=30, **kwargs):
+    """Run `func` under pyinstrument (if installed) or cProfile, return (result, report text)"""
+    try:
+        from pyinstrument import Profiler
+    except ImportError:
+        Profiler = None
+
+    if Profiler is not None:
+        profiler = Profiler()
+        profiler.start()
+        try:
+            result = func(*args, **kwargs)
+        finally:
+            profiler.stop()
+        return result, profiler.output_text(unicode=True)
+
+    import cProfile
+    import pstats
+    profiler = cProfile.Profile()
+    result = profiler.runcall(func, *args, **kwargs)
+    out = io.StringIO()
+    pstats.Stats(profiler, stream=out).sort_stats('cumulative').print_stats(limit)
+    return result, out.getvalue()
@@ -0,0 +1,182 @@
+"""Listing-page parser backends for the JobYaari scraper"""
+import re
+from urllib.parse import urljoin
+
+from bs4 import BeautifulSoup
+
+try:
+    import lxml.html
+    from lxml import etree
+except ImportError:  # lxml is optional, fall back to BeautifulSoup
+    lxml = None
+
+# Listing markup patterns, compiled once
+JOB_ITEM_CLASS = re.compile(r'job|post|item|entry', re.I)
+NEXT_PAGE_CLASS = re.compile(r'next', re.I)
+TITLE_CLASS = re.compile(r'title|heading|name', re.I)
+DATE_CLASS = re.compile(r'date|time|posted', re.I)
+QUALIFICATION_CLASS = re.compile(r'qualification|education|degree', re.I)
+EXPERIENCE_CLASS = re.compile(r'experience|exp|year', re.I)
+DESCRIPTION_CLASS = re.compile(r'description|content|summary', re.I)
+
+TITLE_TAGS = frozenset(['h2', 'h3', 'h4', 'a'])
+DATE_TAGS = frozenset(['span', 'time', 'div'])
+FIELD_TAGS = frozenset(['span', 'div', 'p'])
+DESCRIPTION_TAGS = frozenset(['p', 'div'])
+
+
+def build_job(category, base_url, title, href, posted_date, qualification, experience, description):
+    """Assemble a job dict with the same defaults for every backend"""
+    return {
+        'title': title,
+        'category': category,
+        'url': urljoin(base_url, href) if href else base_url,
+        'posted_date': posted_date if posted_date is not None else 'Recently Posted',
+        'qualification': qualification if qualification is not None else 'Check Details',
+        'experience': experience if experience is not None else 'Check Details',
+        'description': description[:200] + "..." if description is not None else "Click link for full details"
+    }
+
+
+class SoupParser:
+    """BeautifulSoup backend: one `find` per field, works without lxml"""
+    name = 'bs4'
+
+    def parse(self, content):
+        return BeautifulSoup(content, 'html.parser')
+
+    def release(self, document):
+        document.decompose()
+
+    def iter_items(self, document):
+        return document.find_all(['div', 'article', 'li'], class_=JOB_ITEM_CLASS)
+
+    def next_page_url(self, document, page_url):
+        next_elem = (document.find(['a', 'link'], rel='next', href=True) or
+                     document.find('a', class_=NEXT_PAGE_CLASS, href=True))
+        if next_elem:
+            return urljoin(page_url, next_elem['href'])
+        return None
+
+    def extract_job(self, item, category, base_url):
+        # Try multiple selectors to find job title
+        title_elem = (item.find(['h2', 'h3', 'h4', 'a'], class_=TITLE_CLASS) or
+                      item.find(['h2', 'h3', 'h4', 'a']))
+        if not title_elem:
+            return None
+
+        link_elem = item.find('a', href=True)
+        date_elem = item.find(['span', 'time', 'div'], class_=DATE_CLASS)
+        qual_elem = item.find(['span', 'div', 'p'], class_=QUALIFICATION_CLASS)
+        exp_elem = item.find(['span', 'div', 'p'], class_=EXPERIENCE_CLASS)
+        desc_elem = item.find(['p', 'div'], class_=DESCRIPTION_CLASS)
+
+        def text(elem):
+            return elem.get_text(strip=True) if elem else None
+
+        return build_job(
+            category, base_url,
+            title=title_elem.get_text(strip=True),
+            href=link_elem['href'] if link_elem else None,
+            posted_date=text(date_elem),
+            qualification=text(qual_elem),
+            experience=text(exp_elem),
+            description=text(desc_elem)
+        )
+
+
+class LxmlParser:
+    """lxml backend: compiled XPath for items, a single subtree walk per item"""
+    name = 'lxml'
+
+    REGEX_NS = {'re': 'http://exslt.org/regular-expressions'}
+
+    def __init__(self):
+        self.items_xpath = etree.XPath(
+            "//*[self::div or self::article or self::li][re:test(@class, 'job|post|item|entry', 'i')]",
+            namespaces=self.REGEX_NS
+        )
+        self.rel_next_xpath = etree.XPath("(//a|//link)[@rel='next'][@href]")
+        self.class_next_xpath = etree.XPath(
+            "//a[@href][re:test(@class, 'next', 'i')]",
+            namespaces=self.REGEX_NS
+        )
+
+    def parse(self, content):
+        return lxml.html.fromstring(content)
+
+    def release(self, document):
+        document.clear()
+
+    def iter_items(self, document):
+        return self.items_xpath(document)
+
+    def next_page_url(self, document, page_url):
+        matches = self.rel_next_xpath(document) or self.class_next_xpath(document)
+        if matches:
+            return urljoin(page_url, matches[0].get('href'))
+        return None
+
+    @staticmethod
+    def text(elem):
+        # Same result as BeautifulSoup's get_text(strip=True)
+        return ''.join(part.strip() for part in elem.itertext())
+
+    def extract_job(self, item, category, base_url):
+        title_elem = fallback_title = link_elem = None
+        date_elem = qual_elem = exp_elem = desc_elem = None
+
+        # Walk the subtree once in document order, keeping the first match per field
+        for elem in item.iterdescendants():
+            tag = elem.tag
+            if not isinstance(tag, str):
+                continue
+            cls = elem.get('class', '')
+            if tag in TITLE_TAGS:
+                if fallback_title is None:
+                    fallback_title = elem
+                if title_elem is None and cls and TITLE_CLASS.search(cls):
+                    title_elem = elem
+            if tag == 'a' and link_elem is None and elem.get('href') is not None:
+                link_elem = elem
+            if not cls:
+                continue
+            if date_elem is None and tag in DATE_TAGS and DATE_CLASS.search(cls):
+                date_elem = elem
+            if tag in FIELD_TAGS:
+                if qual_elem is None and QUALIFICATION_CLASS.search(cls):
+                    qual_elem = elem
+                if exp_elem is None and EXPERIENCE_CLASS.search(cls):
+                    exp_elem = elem
+            if desc_elem is None and tag in DESCRIPTION_TAGS and DESCRIPTION_CLASS.search(cls):
+                desc_elem = elem
+
+        title_elem = title_elem if title_elem is not None else fallback_title
+        if title_elem is None:
+            return None
+
+        def text(elem):
+            return self.text(elem) if elem is not None else None
+
+        return build_job(
+            category, base_url,
+            title=self.text(title_elem),
+            href=link_elem.get('href') if link_elem is not None else None,
+            posted_date=text(date_elem),
+            qualification=text(qual_elem),
+            experience=text(exp_elem),
+            description=text(desc_elem)
+        )
+
+
+PARSERS = {
+    'bs4': SoupParser,
+    'lxml': LxmlParser,
+}
+
+
+def get_parser(name='lxml'):
+    """Return a parser backend by name, falling back to BeautifulSoup without lxml"""
+    if name == 'lxml' and lxml is None:
+        name = 'bs4'
+    return PARSERS[name]()
@@ -0,0 +1,136 @@
+"""Prompt assembly with a stable cacheable prefix and a context-window token budget"""
+import re
+
+# Context window requested from Ollama (num_ctx); prompts are budgeted to fit it
+CONTEXT_TOKENS = 4096
+
+# Roughly how a BPE tokenizer splits text: words, numbers and single symbols
+TOKEN_PIECE_RE = re.compile(r"[A-Za-z]+|\d+|[^\sA-Za-z\d]")
+
+INSTRUCTIONS = """You are a helpful JobYaari assistant specialized in government job notifications.
+
+Instructions:
+1. Answer the user's question based on the job data provided below
+2. Be specific and helpful
+3. If the user asks about specific categories, mention relevant jobs
+4. Keep your response concise and informative
+5. Use bullet points when listing jobs
+6. Always be professional and friendly"""
+
+
+def estimate_tokens(text):
+    """Local estimate of the model's token count for `text`
+
+    Long words count as several tokens (about one per 5 letters), each
+    number and symbol as one; close enough to Llama 3's tokenizer for
+    budgeting without loading it.
+    """
+    return sum((len(piece) + 4) // 5 if piece.isalpha() else 1 for piece in TOKEN_PIECE_RE.findall(text))
+
+
+def truncate_tokens(text, max_tokens):
+    """Cut `text` to about `max_tokens` tokens at a word boundary"""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    words = text.split(' ')
+    kept, used = [], 0
+    for word in words:
+        used += estimate_tokens(word)
+        if used > max_tokens:
+            break
+        kept.append(word)
+    return ' '.join(kept) + ' ...'
+
+
+def job_line(job):
+    return (f"  - {job['title']} [{job['category']}] (Qualification: {job['qualification']}, "
+            f"Experience: {job['experience']}, Posted: {job['posted_date']})")
+
+
+class PromptBuilder:
+    """Assembles prompts as [stable prefix][conversation][relevant jobs][query]
+
+    The prefix (instructions and database statistics) is byte-identical
+    across turns until the knowledge base changes, and earlier turns are
+    only ever appended after it, so Ollama can reuse its KV cache for
+    everything up to the new turn instead of re-evaluating it. The parts
+    that change per query come last and are fitted into what remains of
+    `context_tokens` after reserving `response_tokens` for the answer.
+    """
+
+    def __init__(self, context_tokens=CONTEXT_TOKENS, response_tokens=512, history_tokens=1024, message_tokens=200):
+        self.context_tokens = context_tokens
+        self.response_tokens = response_tokens
+        self.history_tokens = history_tokens
+        self.message_tokens = message_tokens
+        # (stats snapshot, prefix text, token estimate), swapped in as one tuple
+        self._prefix = (None, '', 0)
+
+    def prefix(self, stats):
+        """(text, token estimate) of instructions plus database statistics
+
+        Rebuilt only when the stats snapshot changes.
+        """
+        cached_stats, text, tokens = self._prefix
+        if stats is not cached_stats:
+            posted = ', '.join(f"{label}: {count}" for label, count in stats['posted_date_histogram'].items())
+            text = f"""{INSTRUCTIONS}
+
+Job Database Statistics:
+- Total Jobs: {stats['total_jobs']}
+- Engineering: {stats['by_category'].get('Engineering', 0)} jobs
+- Science: {stats['by_category'].get('Science', 0)} jobs
+- Commerce: {stats['by_category'].get('Commerce', 0)} jobs
+- Education: {stats['by_category'].get('Education', 0)} jobs
+- Posted: {posted or 'Unknown'}
+"""
+            tokens = estimate_tokens(text)
+            self._prefix = (stats, text, tokens)
+        return text, tokens
+
+    def history_lines(self, history, budget):
+        """Most recent turns that fit in `budget` tokens, oldest first"""
+        lines, used = [], 0
+        for message in reversed(history):
+            speaker = "User" if message['role'] == 'user' else "Assistant"
+            line = f"{speaker}: {truncate_tokens(message['content'].strip(), self.message_tokens)}"
+            cost = estimate_tokens(line)
+            if used + cost > budget:
+                break
+            lines.append(line)
+            used += cost
+        lines.reverse()
+        return lines, used
+
+    def build(self, stats, query, jobs, history=()):
+        """Return (prompt, usage) where usage holds the token estimates per section"""
+        prefix, prefix_tokens = self.prefix(stats)
+        query_section = f"\nUser Query: {truncate_tokens(query, self.message_tokens)}\n\nProvide your response:"
+        fixed = prefix_tokens + estimate_tokens(query_section) + 16  # section headers
+        remaining = max(self.context_tokens - self.response_tokens - fixed, 0)
+
+        # Relevant jobs first, but leave history a share of the window
+        job_budget = remaining - min(self.history_tokens, remaining // 3)
+        job_lines, job_used = [], 0
+        for job in jobs:
+            line = job_line(job)
+            cost = estimate_tokens(line)
+            if job_used + cost > job_budget:
+                break
+            job_lines.append(line)
+            job_used += cost
+
+        history_lines, history_used = self.history_lines(list(history), min(self.history_tokens, remaining - job_used))
+
+        sections = [prefix]
+        if history_lines:
+            sections.append("Conversation so far:\n" + '\n'.join(history_lines) + '\n')
+        sections.append("Most Relevant Jobs in Database:\n" + ('\n'.join(job_lines) or "  (no closely matching jobs)"))
+        prompt = '\n'.join(sections) + '\n' + query_section
+        usage = {
+            'prompt_tokens_est': fixed + job_used + history_used,
+            'prefix_tokens_est': prefix_tokens,
+            'context_jobs': len(job_lines),
+            'history_messages': len(history_lines),
+        }
+        return prompt, usage
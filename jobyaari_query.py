@@ -0,0 +1,195 @@
+"""Query understanding: structured job filters extracted from a chat message"""
+import re
+
+from jobyaari_response_cache import STOPWORDS
+from jobyaari_search import find_experience, tokenize
+
+CATEGORY_ALIASES = {
+    'Engineering': ['engineering', 'engineer', 'engineers'],
+    'Science': ['science', 'scientist', 'scientists'],
+    'Commerce': ['commerce', 'accounts', 'accountant'],
+    'Education': ['education', 'teacher', 'teachers', 'teaching'],
+}
+
+# Spellings without dots, mapped to the tokenized degree name
+QUALIFICATION_ALIASES = {
+    'btech': 'b.tech', 'mtech': 'm.tech', 'bsc': 'b.sc', 'msc': 'm.sc', 'bcom': 'b.com',
+    'mcom': 'm.com', 'bed': 'b.ed', 'med': 'm.ed', 'phd': 'ph.d', 'mba': 'mba', 'diploma': 'diploma',
+}
+PLACEHOLDER_VALUES = frozenset(['', 'check details', 'not specified'])
+QUALIFICATION_SPLIT_RE = re.compile(r'/|,|\bor\b|\bwith\b')
+
+RECENCY_RES = [
+    (re.compile(r'\b(?:last|past)\s+(\d+)\s+days?\b'), lambda m: int(m.group(1))),
+    (re.compile(r'\b(?:last|past)\s+(\d+)\s+weeks?\b'), lambda m: 7 * int(m.group(1))),
+    (re.compile(r'\btoday\b'), lambda m: 1),
+    (re.compile(r'\b(?:this|last|past)\s+week\b'), lambda m: 7),
+    (re.compile(r'\b(?:this|last|past)\s+month\b'), lambda m: 30),
+]
+NEWEST_WORDS = frozenset(['latest', 'recent', 'newest', 'new'])
+LISTING_WORDS = frozenset(['show', 'list', 'get', 'find', 'display'])
+# Words that ask for an explanation rather than a list of jobs
+QUESTION_WORDS = frozenset([
+    'what', 'why', 'how', 'which', 'when', 'where', 'who', 'explain', 'compare', 'difference',
+    'should', 'tell', 'eligible', 'eligibility', 'salary', 'syllabus', 'prepare', 'advice', 'suggest',
+])
+# Words that say "jobs" without narrowing the search
+FILLER_WORDS = STOPWORDS | NEWEST_WORDS | frozenset([
+    'job', 'jobs', 'post', 'posts', 'vacancy', 'vacancies', 'notification', 'notifications',
+    'opening', 'openings', 'position', 'positions', 'experience', 'experienced', 'year', 'years',
+    'qualification', 'required', 'requirement', 'available', 'there', 'want', 'need', 'looking',
+    'category', 'field', 'do', 'have', 'has', 'who', 'how', 'many', 'or', 'at', 'posted',
+])
+
+
+class PhraseTrie:
+    """Token-level trie that finds the longest known phrase at each position of a query"""
+
+    END = ''  # tokenize() never yields an empty token
+
+    def __init__(self):
+        self.root = {}
+
+    def add(self, tokens, value):
+        node = self.root
+        for token in tokens:
+            node = node.setdefault(token, {})
+        node[self.END] = value
+
+    def scan(self, tokens):
+        """Yield (start, end, value) for non-overlapping longest matches, left to right"""
+        i = 0
+        while i < len(tokens):
+            node, match = self.root, None
+            for j in range(i, len(tokens)):
+                node = node.get(tokens[j])
+                if node is None:
+                    break
+                if self.END in node:
+                    match = (i, j + 1, node[self.END])
+            if match:
+                yield match
+                i = match[1]
+            else:
+                i += 1
+
+
+class ParsedQuery:
+    """Filters, keywords and intent extracted from one query"""
+
+    def __init__(self, text):
+        self.text = text
+        self.category = None
+        self.experience = None  # (min_years, max_years or None)
+        self.qualification = None
+        self.posted_within = None  # days
+        self.newest_first = False
+        self.listing = False
+        self.question = False
+        self.keywords = []
+
+    @property
+    def has_filters(self):
+        return bool(self.category or self.experience or self.qualification or self.posted_within)
+
+    @property
+    def is_listing(self):
+        """A pure retrieval request that a formatted job list answers completely"""
+        if self.question:
+            return False
+        return self.listing or (self.has_filters and not self.keywords)
+
+    def search_kwargs(self):
+        """Keyword arguments for JobYaariChatbot.search_jobs"""
+        return {
+            'category': self.category,
+            'experience_range': self.experience,
+            'qualification': self.qualification,
+            'posted_within': self.posted_within,
+            'newest_first': self.newest_first,
+        }
+
+    def __repr__(self):
+        fields = ', '.join(f"{name}={value!r}" for name, value in vars(self).items() if value and name != 'text')
+        return f"ParsedQuery({fields})"
+
+
+class QueryParser:
+    """Compiled matcher over the knowledge base's categories and qualifications
+
+    Experience and recency phrases are read with precompiled regexes and cut
+    out of the text; the remaining tokens are matched against a phrase trie
+    built from the category and qualification vocabulary, and whatever is
+    left over becomes search keywords. Parsing a query takes microseconds.
+    """
+
+    def __init__(self, categories=CATEGORY_ALIASES, qualifications=()):
+        self.trie = PhraseTrie()
+        for category in categories:
+            for alias in [category] + CATEGORY_ALIASES.get(category, []):
+                self.trie.add(tokenize(alias), ('category', category))
+
+        known = set()
+        for value in qualifications:
+            if value.lower() in PLACEHOLDER_VALUES:
+                continue
+            self.trie.add(tokenize(value), ('qualification', value.lower()))
+            # "B.Tech/B.E." is also searchable as either degree; a fragment that is
+            # only filler ("B.Sc with experience") would swallow ordinary query words
+            for part in QUALIFICATION_SPLIT_RE.split(value.lower()):
+                tokens = tokenize(part)
+                if any(token not in FILLER_WORDS and not token.isdigit() for token in tokens):
+                    self.trie.add(tokens, ('qualification', ' '.join(tokens)))
+                    known.update(tokens)
+        for alias, degree in QUALIFICATION_ALIASES.items():
+            if degree in known:
+                self.trie.add([alias], ('qualification', degree))
+
+    @classmethod
+    def from_stats(cls, stats):
+        """Parser over the vocabulary of a JobStats snapshot"""
+        return cls(list(stats['by_category']), list(stats['qualification_distribution']))
+
+    def parse(self, query):
+        """ParsedQuery for `query`
+
+        >>> parser = QueryParser(qualifications=['B.Sc with experience', 'M.A./M.Sc with B.Ed'])
+        >>> parsed = parser.parse("Show me Science jobs with 1 year experience")
+        >>> parsed.category, parsed.experience, parsed.qualification
+        ('Science', (1, 1), None)
+        >>> parser.parse("B.Ed teacher jobs").qualification
+        'b.ed'
+        """
+        parsed = ParsedQuery(query)
+        text = query.lower()
+        parsed.question = '?' in text
+
+        parsed.experience, match = find_experience(text)
+        if match:
+            text = text[:match.start()] + ' ' + text[match.end():]
+
+        for regex, read in RECENCY_RES:
+            match = regex.search(text)
+            if match:
+                parsed.posted_within = read(match)
+                text = text[:match.start()] + ' ' + text[match.end():]
+                break
+
+        tokens = tokenize(text)
+        consumed = set()
+        for start, end, (field, value) in self.trie.scan(tokens):
+            # The first mention of a field wins ("engineering or science" -> Engineering)
+            if getattr(parsed, field) is None:
+                setattr(parsed, field, value)
+            consumed.update(range(start, end))
+
+        for position, token in enumerate(tokens):
+            if token in NEWEST_WORDS:
+                parsed.newest_first = True
+            if token in LISTING_WORDS:
+                parsed.listing = True
+            if token in QUESTION_WORDS:
+                parsed.question = True
+            if position not in consumed and token not in FILLER_WORDS and token not in LISTING_WORDS:
+                parsed.keywords.append(token)
+        return parsed
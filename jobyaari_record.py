@@ -0,0 +1,212 @@
+"""Compact job records: slotted, with interned facet codes and parsed posting dates"""
+import functools
+import re
+import sys
+import threading
+import time
+from datetime import datetime
+
+RELATIVE_DATE_RE = re.compile(r'(\d+)\s*(minute|hour|day|week|month|year)s?\s+ago', re.IGNORECASE)
+RELATIVE_UNIT_SECONDS = {'minute': 60, 'hour': 3600, 'day': 86400, 'week': 7 * 86400,
+                         'month': 30 * 86400, 'year': 365 * 86400}
+ABSOLUTE_DATE_FORMATS = ('%d %b %Y', '%d %B %Y', '%B %d, %Y', '%b %d, %Y', '%d-%m-%Y', '%d/%m/%Y', '%Y-%m-%d')
+
+# Placeholder values the parser fills in; shared instead of stored per job
+DEFAULT_VALUES = {value: value for value in ('Recently Posted', 'Check Details', "Click link for full details")}
+
+
+# Posting-date labels repeat across jobs; parse each distinct one once
+@functools.lru_cache(maxsize=4096)
+def posted_age_seconds(posted_date):
+    """Age of a relative date like "3 days ago" in seconds, or None if it isn't one"""
+    if not posted_date:
+        return None
+    text = posted_date.strip().lower()
+    if text in ('today', 'just now'):
+        return 0
+    if text == 'yesterday':
+        return 86400
+    match = RELATIVE_DATE_RE.search(text)
+    if not match:
+        return None
+    return int(match.group(1)) * RELATIVE_UNIT_SECONDS[match.group(2).lower()]
+
+
+def parse_posted_date(posted_date, now=None):
+    """Unix timestamp for a relative ("3 days ago") or absolute ("12 Oct 2025") date, or None"""
+    age = posted_age_seconds(posted_date)
+    if age is not None:
+        return (now or time.time()) - age
+    if not posted_date:
+        return None
+    return absolute_timestamp(posted_date.strip())
+
+
+@functools.lru_cache(maxsize=4096)
+def absolute_timestamp(text):
+    """Unix timestamp for an absolute date like "12 Oct 2025", or None"""
+    for fmt in ABSOLUTE_DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).timestamp()
+        except ValueError:
+            continue
+    return None
+
+
+class Interner:
+    """Two-way mapping between repeated strings and small int codes
+
+    The lowercased form of each value is computed once, when it is first seen.
+    """
+
+    def __init__(self):
+        self.values = []
+        self.lowered = []
+        self.codes = {}
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.values)
+
+    def code(self, value):
+        code = self.codes.get(value)
+        if code is None:
+            with self.lock:
+                code = self.codes.get(value)
+                if code is None:
+                    code = len(self.values)
+                    self.values.append(sys.intern(value))
+                    self.lowered.append(sys.intern(value.lower()))
+                    self.codes[value] = code
+        return code
+
+
+# Process-wide code tables for the low-cardinality facet fields
+FACETS = {
+    'category': Interner(),
+    'experience': Interner(),
+    'qualification': Interner(),
+}
+
+JOB_FIELDS = ('title', 'category', 'url', 'posted_date', 'qualification', 'experience', 'description')
+OPTIONAL_FIELDS = ('first_seen', 'last_seen', 'posted_at')
+CODE_ATTRS = {field: field + '_code' for field in FACETS}
+PLAIN_FIELDS = frozenset(JOB_FIELDS + OPTIONAL_FIELDS) - set(FACETS)
+
+
+class JobRecord:
+    """A job with `__slots__` storage that still reads like the job dicts it replaces
+
+    category/experience/qualification are stored as small-int codes into
+    `FACETS`; `job['category']`, `job.get(...)` and iteration over keys
+    behave as they do for a dict, so formatting and storage code is unchanged.
+
+    The gain is memory only (about 40% less per job in bench_memory.py).
+    Converting a dict costs ~5 us per job on ingest, reads go through
+    Python methods instead of dict lookups, and search time is the same
+    as over dicts.
+    """
+    __slots__ = ('title', 'url', 'posted_date', 'description', 'category_code', 'experience_code',
+                 'qualification_code', 'posted_at', 'first_seen', 'last_seen')
+
+    def __init__(self, title, category, url, posted_date, qualification, experience, description,
+                 first_seen=None, last_seen=None, posted_at=None):
+        self.title = title
+        self.url = url
+        self.posted_date = sys.intern(posted_date) if posted_date else posted_date
+        self.description = DEFAULT_VALUES.get(description, description)
+        self.category_code = FACETS['category'].code(category or '')
+        self.experience_code = FACETS['experience'].code(experience or '')
+        self.qualification_code = FACETS['qualification'].code(qualification or '')
+        self.first_seen = first_seen
+        self.last_seen = last_seen
+        # Parse the posting date once, relative to when the job was first seen
+        self.posted_at = posted_at if posted_at is not None else parse_posted_date(posted_date, first_seen)
+
+    @classmethod
+    def from_dict(cls, job):
+        """Convert a job dict (records are returned unchanged)"""
+        if isinstance(job, cls):
+            return job
+        return cls(*(job.get(field, '') for field in JOB_FIELDS),
+                   first_seen=job.get('first_seen'), last_seen=job.get('last_seen'),
+                   posted_at=job.get('posted_at'))
+
+    @classmethod
+    def restore(cls, title, url, posted_date, description, category_code, experience_code, qualification_code,
+                posted_at, first_seen, last_seen):
+        """Rebuild a record from stored fields and local facet codes, without re-parsing or re-interning"""
+        record = cls.__new__(cls)
+        record.title = title
+        record.url = url
+        record.posted_date = posted_date
+        record.description = DEFAULT_VALUES.get(description, description)
+        record.category_code = category_code
+        record.experience_code = experience_code
+        record.qualification_code = qualification_code
+        record.posted_at = posted_at
+        record.first_seen = first_seen
+        record.last_seen = last_seen
+        return record
+
+    @property
+    def category(self):
+        return FACETS['category'].values[self.category_code]
+
+    @property
+    def experience(self):
+        return FACETS['experience'].values[self.experience_code]
+
+    @property
+    def qualification(self):
+        return FACETS['qualification'].values[self.qualification_code]
+
+    def lowered(self, field):
+        """Precomputed lowercase value of a facet field"""
+        return FACETS[field].lowered[getattr(self, CODE_ATTRS[field])]
+
+    def keys(self):
+        return JOB_FIELDS + tuple(field for field in OPTIONAL_FIELDS if getattr(self, field) is not None)
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __contains__(self, key):
+        return key in self.keys()
+
+    def __getitem__(self, key):
+        code_attr = CODE_ATTRS.get(key)
+        if code_attr is not None:
+            return FACETS[key].values[getattr(self, code_attr)]
+        if key in PLAIN_FIELDS:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        # Inlined __getitem__: the index reads every field of every job through here
+        if key in PLAIN_FIELDS:
+            value = getattr(self, key)
+        else:
+            code_attr = CODE_ATTRS.get(key)
+            if code_attr is None:
+                return default
+            value = FACETS[key].values[getattr(self, code_attr)]
+        return default if value is None else value
+
+    def to_dict(self):
+        return {key: self[key] for key in self.keys()}
+
+    def items(self):
+        return [(key, self[key]) for key in self.keys()]
+
+    def __eq__(self, other):
+        if isinstance(other, JobRecord):
+            return self.to_dict() == other.to_dict()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"JobRecord({self.title!r}, {self.category!r}, {self.url!r})"
@@ -0,0 +1,126 @@
+"""Background refresh worker: scrape on a schedule and publish snapshots to the job store
+
+Run standalone next to the Streamlit app:
+
+    python jobyaari_refresh.py --interval 1800
+
+or let the app start one worker thread per process by setting
+JOBYAARI_REFRESH_INTERVAL (seconds).
+"""
+import argparse
+import logging
+import random
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class RefreshWorker(threading.Thread):
+    """Scrape every `interval` seconds (+/- `jitter` fraction), backing off after failures
+
+    Each run upserts the scraped jobs in one transaction and, if any job was
+    added or changed, bumps the store generation. UI processes notice the new
+    generation and rebuild their knowledge base off the request path.
+    """
+
+    def __init__(self, store, scraper_factory, interval=1800, jitter=0.1,
+                 retry_delay=60, max_backoff=3600, run_immediately=False):
+        super().__init__(name="jobyaari-refresh", daemon=True)
+        self.store = store
+        self.scraper_factory = scraper_factory
+        self.interval = interval
+        self.jitter = jitter
+        self.retry_delay = retry_delay
+        self.max_backoff = max_backoff
+        self.run_immediately = run_immediately
+        self.failures = 0
+        self.last_run = None
+        self.last_result = None
+        self.next_run = None
+        self.stop_event = threading.Event()
+
+    def next_delay(self):
+        """Seconds until the next run: the interval normally, exponential backoff after failures"""
+        if self.failures:
+            delay = min(self.retry_delay * 2 ** (self.failures - 1), self.max_backoff)
+        else:
+            delay = self.interval
+        # Jitter spreads out workers started at the same moment
+        return max(1.0, delay * random.uniform(1 - self.jitter, 1 + self.jitter))
+
+    def refresh_once(self):
+        """Scrape all categories and publish a snapshot, return a result summary"""
+        started = time.time()
+        scraper = self.scraper_factory()
+        jobs = scraper.scrape_all_categories()
+        inserted, updated = self.store.upsert_many(jobs)
+        generation = self.store.publish_generation() if inserted or updated else self.store.generation()
+        return {
+            'started': started,
+            'duration': time.time() - started,
+            'scraped': len(jobs),
+            'duplicates': scraper.deduper.duplicates,
+            'fallback': dict(scraper.fallback),
+            'fetch': scraper.fetcher.metrics(),
+            'inserted': inserted,
+            'updated': updated,
+            'generation': generation,
+        }
+
+    def run(self):
+        delay = 0 if self.run_immediately else self.next_delay()
+        while True:
+            self.next_run = time.time() + delay
+            if self.stop_event.wait(delay):
+                return
+            self.last_run = time.time()
+            try:
+                self.last_result = self.refresh_once()
+                self.failures = 0
+                logger.info("Refresh done: %(scraped)d jobs (%(duplicates)d duplicates dropped), %(inserted)d new, "
+                            "%(updated)d changed, generation %(generation)d",
+                            self.last_result)
+                logger.info("Fetch: %(requests)d requests, %(retries)d retries, %(failures)d failed, "
+                            "%(short_circuited)d short-circuited, p95 %(p95_latency).2fs", self.last_result['fetch'])
+            except Exception:
+                self.failures += 1
+                logger.exception("Refresh failed (%d consecutive failures)", self.failures)
+            delay = self.next_delay()
+
+    def stop(self):
+        self.stop_event.set()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scrape JobYaari on a schedule and publish snapshots")
+    parser.add_argument('--interval', type=float, default=1800, help='seconds between scrapes')
+    parser.add_argument('--jitter', type=float, default=0.1, help='random +/- fraction of the interval')
+    parser.add_argument('--db', default=".jobyaari_cache/jobs.db", help='job store path')
+    parser.add_argument('--once', action='store_true', help='scrape once and exit')
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    # Imported here so this module stays importable from the app without a cycle
+    from jobyaari_bot import JobYaariScraper
+    from jobyaari_fetch import CircuitBreaker
+    from jobyaari_store import JobStore
+
+    store = JobStore(args.db)
+    # One breaker for every run, so a host that keeps failing stays skipped between scrapes
+    breaker = CircuitBreaker()
+    worker = RefreshWorker(store, lambda: JobYaariScraper(show_progress=False, breaker=breaker),
+                           interval=args.interval, jitter=args.jitter, run_immediately=True)
+    if args.once:
+        print(worker.refresh_once())
+        return
+    worker.start()
+    try:
+        while worker.is_alive():
+            worker.join(1)
+    except KeyboardInterrupt:
+        worker.stop()
+
+
+if __name__ == "__main__":
+    main()
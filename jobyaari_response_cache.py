@@ -0,0 +1,172 @@
+"""Response cache for repeated and near-duplicate chat queries"""
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+from jobyaari_search import tokenize
+
+# Words that don't change what a query is asking for
+STOPWORDS = frozenset([
+    'a', 'an', 'the', 'me', 'my', 'i', 'is', 'are', 'for', 'of', 'in', 'on', 'to',
+    'show', 'list', 'get', 'tell', 'give', 'find', 'please', 'all', 'any', 'some',
+    'what', 'which', 'can', 'you', 'about', 'with', 'and',
+])
+
+PUNCTUATION_RE = re.compile(r'[^\w\s.+/-]')
+WHITESPACE_RE = re.compile(r'\s+')
+
+
+def normalize_query(query):
+    """Lowercase, drop punctuation and collapse whitespace"""
+    query = PUNCTUATION_RE.sub(' ', query.lower())
+    return WHITESPACE_RE.sub(' ', query).strip()
+
+
+def content_terms(query):
+    return frozenset(token for token in tokenize(query) if token not in STOPWORDS)
+
+
+def anchors(query, filters=None):
+    """What a near-duplicate must share exactly: numbers in the query and the detected filters
+
+    "2 years" vs "5 years", or Science vs Commerce, are different questions
+    however many other words they share.
+    """
+    numbers = sorted(token for token in tokenize(query) if any(char.isdigit() for char in token))
+    return numbers + [f"{name}={value}" for name, value in sorted((filters or {}).items()) if value]
+
+
+def jaccard(a, b):
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+class ResponseCache:
+    """LRU + TTL cache of chat responses keyed on (knowledge base version, normalized query)
+
+    With `similarity` set, a miss on the exact key falls back to the most
+    similar cached query for the same knowledge base version (Jaccard over
+    content words) that has the same numbers and filters (see `anchors`).
+    Entries are persisted to `path` so they survive restarts.
+
+    >>> cache = ResponseCache(path=None)
+    >>> cache.put("Tell me the syllabus of the junior engineer civil exam in Delhi", 'v1', 'answer', 2.0)
+    >>> cache.get("junior engineer civil exam syllabus, Delhi?", 'v1')
+    'answer'
+    >>> cache.put("jobs with 2 years experience in delhi for civil engineers", 'v1', 'two', 2.0)
+    >>> cache.get("jobs with 5 years experience in delhi for civil engineers", 'v1') is None
+    True
+    >>> cache.put("Science jobs for graduates", 'v1', 'science', 2.0, filters={'category': 'Science'})
+    >>> cache.get("Science jobs for graduates", 'v1', filters={'category': 'Commerce'}) is None
+    True
+    """
+
+    def __init__(self, path=".jobyaari_cache/responses.json", max_entries=256, ttl=6 * 3600, similarity=0.9):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.similarity = similarity
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.saved_seconds = 0.0
+        self.lock = threading.Lock()
+        self.load()
+
+    @property
+    def hit_ratio(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def _expired(self, entry, now):
+        return self.ttl is not None and now - entry['created'] > self.ttl
+
+    def _find(self, version, normalized, now, filters=None):
+        key = f"{version}|{normalized}"
+        entry = self.entries.get(key)
+        if entry is not None and not self._expired(entry, now) and entry.get('anchors') == anchors(normalized, filters):
+            return key, entry
+        if not self.similarity:
+            return None, None
+
+        terms = content_terms(normalized)
+        required = anchors(normalized, filters)
+        best_key, best_entry, best_score = None, None, self.similarity
+        for candidate_key, candidate in self.entries.items():
+            if (candidate['version'] != version or self._expired(candidate, now)
+                    or candidate.get('anchors') != required):
+                continue
+            score = jaccard(terms, frozenset(candidate['terms']))
+            if score >= best_score:
+                best_key, best_entry, best_score = candidate_key, candidate, score
+        return best_key, best_entry
+
+    def get(self, query, version, filters=None):
+        """Return the cached response for `query` (with the parsed `filters`), or None"""
+        now = time.time()
+        with self.lock:
+            key, entry = self._find(version, normalize_query(query), now, filters)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            self.saved_seconds += entry['latency']
+            return entry['response']
+
+    def put(self, query, version, response, latency, filters=None):
+        """Cache `response`, which took `latency` seconds to generate"""
+        normalized = normalize_query(query)
+        with self.lock:
+            key = f"{version}|{normalized}"
+            self.entries[key] = {
+                'version': version,
+                'query': normalized,
+                'terms': sorted(content_terms(normalized)),
+                'anchors': anchors(normalized, filters),
+                'response': response,
+                'latency': latency,
+                'created': time.time(),
+            }
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+            self.save()
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.save()
+
+    def load(self):
+        if not self.path:
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            return
+        now = time.time()
+        for key, entry in stored.get('entries', []):
+            if not self._expired(entry, now):
+                self.entries[key] = entry
+
+    def save(self):
+        if not self.path:
+            return
+        directory = os.path.dirname(self.path) or '.'
+        os.makedirs(directory, exist_ok=True)
+        # Write to a temp file and rename so a crash never leaves a truncated cache
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'entries': list(self.entries.items())}, f)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
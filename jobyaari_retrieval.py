@@ -0,0 +1,190 @@
+"""Local vector index used to pick the jobs that go into the LLM prompt"""
+import threading
+import zlib
+
+import numpy as np
+
+from jobyaari_search import tokenize
+
+
+def job_text(job):
+    """Text that represents a job for embedding"""
+    return ' '.join([
+        job.get('title', ''),
+        job.get('category', ''),
+        job.get('qualification', ''),
+        job.get('experience', ''),
+        job.get('description', ''),
+    ])
+
+
+class HashingEmbedder:
+    """Hashed term-frequency vectors (unigrams + bigrams), no model or network needed
+
+    The index applies IDF weighting on top, which makes this a hashed TF-IDF.
+    """
+    uses_idf = True
+
+    def __init__(self, dim=1024):
+        self.dim = dim
+
+    def _features(self, text):
+        tokens = tokenize(text)
+        return tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+
+    def embed(self, texts):
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature in self._features(text):
+                # crc32 is stable across processes, unlike hash()
+                matrix[row, zlib.crc32(feature.encode('utf-8')) % self.dim] += 1.0
+        # Sublinear term frequency
+        np.log1p(matrix, out=matrix)
+        return matrix
+
+
+class OllamaEmbedder:
+    """Dense embeddings from a local Ollama embedding model"""
+    uses_idf = False
+
+    def __init__(self, model="nomic-embed-text"):
+        from langchain_community.embeddings import OllamaEmbeddings
+        self.client = OllamaEmbeddings(model=model)
+        self.dim = None
+
+    def embed(self, texts):
+        matrix = np.asarray(self.client.embed_documents(list(texts)), dtype=np.float32)
+        self.dim = matrix.shape[1]
+        return matrix
+
+
+def get_embedder(name='hashing'):
+    """Return an embedder, falling back to hashed TF-IDF if Ollama embeddings are unavailable"""
+    if name == 'ollama':
+        try:
+            embedder = OllamaEmbedder()
+            embedder.embed(['probe'])
+            return embedder
+        except Exception:
+            pass
+    return HashingEmbedder()
+
+
+class VectorIndex:
+    """Job embeddings in one float32 matrix, searched with vectorized cosine similarity
+
+    New jobs are queued and embedded in a single batch before the next search,
+    so streaming adds never wait on the embedder. A lock guards that lazy
+    flush because one index is shared by concurrent sessions.
+    """
+
+    def __init__(self, embedder=None):
+        self.embedder = embedder or HashingEmbedder()
+        self.jobs = []
+        self.pending = []
+        self.vectors = None
+        self.size = 0
+        self.doc_freq = None
+        self.normalized = None
+        self.lock = threading.RLock()
+
+    def __len__(self):
+        return len(self.jobs) + len(self.pending)
+
+    def add(self, job):
+        self.pending.append(job)
+
+    def add_many(self, jobs):
+        self.pending.extend(jobs)
+
+    def _append(self, matrix):
+        if self.vectors is None:
+            self.vectors = np.zeros((max(64, len(matrix)), matrix.shape[1]), dtype=np.float32)
+        needed = self.size + len(matrix)
+        if needed > len(self.vectors):
+            # Grow geometrically so repeated adds stay amortized O(1)
+            grown = np.zeros((max(needed, 2 * len(self.vectors)), self.vectors.shape[1]), dtype=np.float32)
+            grown[:self.size] = self.vectors[:self.size]
+            self.vectors = grown
+        self.vectors[self.size:needed] = matrix
+        self.size = needed
+
+    def flush(self):
+        """Embed queued jobs and refresh the normalized search matrix"""
+        with self.lock:
+            if not self.pending:
+                return
+            batch, self.pending = self.pending, []
+            matrix = self.embedder.embed([job_text(job) for job in batch])
+            self._append(matrix)
+            self.jobs.extend(batch)
+
+            if self.embedder.uses_idf:
+                counts = (matrix > 0).sum(axis=0)
+                self.doc_freq = counts if self.doc_freq is None else self.doc_freq + counts
+            self.normalized = None
+
+    def replace(self, old, new):
+        """Swap job `old` for `new`, re-embedding only its row"""
+        with self.lock:
+            self.flush()
+            row = next(i for i, job in enumerate(self.jobs) if job is old)
+            vector = self.embedder.embed([job_text(new)])[0]
+            if not self.vectors.flags.writeable:
+                # Memory-mapped from a snapshot: copy before writing
+                self.vectors = np.array(self.vectors)
+            if self.embedder.uses_idf:
+                self.doc_freq = self.doc_freq - (self.vectors[row] > 0) + (vector > 0)
+            self.vectors[row] = vector
+            self.jobs[row] = new
+            self.normalized = None
+
+    def idf(self):
+        return np.log((1 + self.size) / (1 + self.doc_freq)).astype(np.float32) + 1.0
+
+    def search_matrix(self):
+        if self.normalized is None:
+            matrix = self.vectors[:self.size]
+            if self.embedder.uses_idf:
+                matrix = matrix * self.idf()
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            self.normalized = matrix / norms
+        return self.normalized
+
+    def embed_query(self, query):
+        vector = self.embedder.embed([query])[0]
+        if self.embedder.uses_idf:
+            vector = vector * self.idf()
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def search(self, query, k=5, min_score=0.0):
+        """Return up to `k` (job, score) pairs most similar to `query`"""
+        with self.lock:
+            self.flush()
+            if not self.size:
+                return []
+            matrix = self.search_matrix()
+            query_vector = self.embed_query(query)
+        scores = matrix @ query_vector
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind='stable')]
+        return [(self.jobs[i], float(scores[i])) for i in top if scores[i] > min_score]
+
+    def save(self, path):
+        """Write the embedding matrix to a .npy file"""
+        self.flush()
+        np.save(path, self.vectors[:self.size] if self.size else np.zeros((0, 0), dtype=np.float32))
+
+    def load(self, path, jobs, mmap=True):
+        """Attach previously saved embeddings for `jobs`, memory-mapped by default"""
+        matrix = np.load(path, mmap_mode='r' if mmap else None)
+        self.vectors = matrix
+        self.size = len(matrix)
+        self.jobs = list(jobs)
+        self.pending = []
+        if self.embedder.uses_idf:
+            self.doc_freq = (np.asarray(matrix) > 0).sum(axis=0)
+        self.normalized = None
@@ -0,0 +1,307 @@
+"""In-memory inverted index with BM25 ranking for job search"""
+import bisect
+import heapq
+import math
+import re
+
+TOKEN_RE = re.compile(r'[a-z0-9]+(?:\.[a-z0-9]+)*')
+
+# Field weights for the BM25 term frequencies (a simple BM25F)
+FIELD_WEIGHTS = {
+    'title': 2.0,
+    'description': 1.0,
+    'qualification': 1.0,
+    'experience': 1.0,
+}
+
+# Exact-value facets stored as doc-id sets; experience/qualification also serve substring filters
+FACET_FIELDS = ('category', 'experience', 'qualification')
+
+
+def tokenize(text):
+    """Lowercase `text` and split it into word tokens ("B.Tech" stays one token)"""
+    return TOKEN_RE.findall(text.lower()) if text else []
+
+
+EXPERIENCE_UNITS = r'(?:years?|yrs?)'
+FRESHER_RE = re.compile(r'\b(?:freshers?|entry[- ]level|no experience|0 ' + EXPERIENCE_UNITS + r')\b')
+EXPERIENCE_RES = [
+    (re.compile(r'(\d+)\s*(?:-|to)\s*(\d+)\s*' + EXPERIENCE_UNITS), lambda m: (int(m.group(1)), int(m.group(2)))),
+    (re.compile(r'(\d+)\s*\+\s*' + EXPERIENCE_UNITS), lambda m: (int(m.group(1)), None)),
+    (re.compile(r'(?:at least|more than|over|minimum)\s+(\d+)\s*' + EXPERIENCE_UNITS), lambda m: (int(m.group(1)), None)),
+    (re.compile(r'(?:less than|up to|upto|under|maximum)\s+(\d+)\s*' + EXPERIENCE_UNITS), lambda m: (0, int(m.group(1)))),
+    (re.compile(r'(\d+)\s*' + EXPERIENCE_UNITS), lambda m: (int(m.group(1)), int(m.group(1)))),
+]
+
+
+def find_experience(text):
+    """First experience requirement in lowercased `text` as ((min, max or None), match), else (None, None)"""
+    match = FRESHER_RE.search(text)
+    if match:
+        return (0, 0), match
+    for regex, read in EXPERIENCE_RES:
+        match = regex.search(text)
+        if match:
+            return read(match), match
+    return None, None
+
+
+def experience_overlaps(value, wanted):
+    """True if an experience value like "2-5 years" fits the (min, max) years wanted"""
+    have, _ = find_experience(value)
+    if have is None:
+        return False
+    low, high = have
+    want_low, want_high = wanted
+    return (want_high is None or low <= want_high) and (high is None or want_low <= high)
+
+
+def facet_value(job, field):
+    """Lowercased facet value; compact job records carry it precomputed"""
+    lowered = getattr(job, 'lowered', None)
+    if lowered is not None:
+        return lowered(field)
+    return job.get(field, '').lower()
+
+
+class JobIndex:
+    """Inverted index over job fields with facet postings and BM25 top-k search
+
+    Jobs get sequential doc ids in insertion order. Posting lists map each
+    token to {doc_id: weighted term frequency}. Facets map each lowercased
+    field value to the set of its doc ids, so adding a job touches three
+    sets and category/experience/qualification filters intersect sets
+    sized by their matches, not by the index.
+    """
+
+    def __init__(self, k1=1.2, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self.docs = []
+        self.doc_lengths = []
+        self.postings = {}
+        self.vocabulary = []
+        self.facets = {field: {} for field in FACET_FIELDS}
+        self.doc_count = 0
+        self.total_length = 0.0
+        # Per-term BM25 impacts, recomputed lazily after the index changes
+        self.version = 0
+        self.impact_cache = {}
+        # Facet values repeat across jobs, so their tokens are computed once per value
+        self.value_tokens = {}
+        # Substring/range filters as unions of facet sets, reused until the index changes
+        self.mask_cache = {}
+
+    def __len__(self):
+        return self.doc_count
+
+    def _tokens(self, job, field):
+        if field not in FACET_FIELDS:
+            return tokenize(job.get(field, ''))
+        value = job.get(field, '')
+        tokens = self.value_tokens.get(value)
+        if tokens is None:
+            tokens = self.value_tokens[value] = tokenize(value)
+        return tokens
+
+    def _terms(self, job):
+        terms = {}
+        for field, weight in FIELD_WEIGHTS.items():
+            for token in self._tokens(job, field):
+                terms[token] = terms.get(token, 0.0) + weight
+        return terms
+
+    def add(self, job):
+        """Index one job and return its doc id"""
+        doc_id = len(self.docs)
+        self.docs.append(job)
+
+        terms = self._terms(job)
+        length = sum(terms.values())
+        self.doc_lengths.append(length)
+        self.total_length += length
+        for token, tf in terms.items():
+            postings = self.postings.get(token)
+            if postings is None:
+                postings = self.postings[token] = {}
+                bisect.insort(self.vocabulary, token)
+            postings[doc_id] = tf
+
+        for field in FACET_FIELDS:
+            value = facet_value(job, field)
+            doc_ids = self.facets[field].get(value)
+            if doc_ids is None:
+                doc_ids = self.facets[field][value] = set()
+            doc_ids.add(doc_id)
+        self.doc_count += 1
+        self.version += 1
+        return doc_id
+
+    def add_many(self, jobs):
+        for job in jobs:
+            self.add(job)
+
+    def remove(self, doc_id):
+        """Drop a job from the index; its doc id is not reused"""
+        job = self.docs[doc_id]
+        if job is None:
+            return
+        for token in self._terms(job):
+            postings = self.postings.get(token)
+            if postings is not None:
+                postings.pop(doc_id, None)
+        for field in FACET_FIELDS:
+            values = self.facets[field]
+            value = facet_value(job, field)
+            doc_ids = values.get(value)
+            if doc_ids is not None:
+                doc_ids.discard(doc_id)
+                if not doc_ids:
+                    del values[value]
+        self.docs[doc_id] = None
+        self.total_length -= self.doc_lengths[doc_id]
+        self.doc_count -= 1
+        self.version += 1
+
+    def _union(self, key, matches):
+        """Union of the facet sets picked by `matches`, cached under `key` until the index changes"""
+        cached = self.mask_cache.get(key)
+        if cached is not None and cached[0] == self.version:
+            return cached[1]
+        if len(self.mask_cache) > 256:
+            self.mask_cache.clear()
+        sets = list(matches)
+        doc_ids = sets[0] if len(sets) == 1 else set().union(*sets)
+        self.mask_cache[key] = (self.version, doc_ids)
+        return doc_ids
+
+    def facet_mask(self, field, value, exact=False):
+        """Doc ids whose `field` equals (or contains) `value`, case-insensitive; treat it as read-only"""
+        value = value.lower()
+        values = self.facets[field]
+        if exact:
+            return values.get(value, set())
+        # Distinct values are few, so a substring scan over them is cheap
+        return self._union((field, value), (doc_ids for candidate, doc_ids in values.items() if value in candidate))
+
+    def range_mask(self, wanted):
+        """Doc ids whose experience overlaps the (min, max) years range `wanted`; treat it as read-only"""
+        return self._union(('range', wanted), (doc_ids for candidate, doc_ids in self.facets['experience'].items()
+                                               if experience_overlaps(candidate, wanted)))
+
+    def facet_counts(self, field):
+        """Number of live docs per distinct value of a facet field"""
+        return {value: len(doc_ids) for value, doc_ids in self.facets[field].items() if doc_ids}
+
+    def _expand(self, token, prefix):
+        if not prefix:
+            return [token] if token in self.postings else []
+        start = bisect.bisect_left(self.vocabulary, token)
+        matches = []
+        for term in self.vocabulary[start:]:
+            if not term.startswith(token):
+                break
+            matches.append(term)
+        return matches
+
+    def _impacts(self, term):
+        """BM25 contribution of `term` per doc, plus doc ids ordered by it"""
+        cached = self.impact_cache.get(term)
+        if cached is not None and cached[0] == self.version:
+            return cached[1], cached[2]
+        postings = self.postings[term]
+        n = max(self.doc_count, 1)
+        avg_length = self.total_length / n if self.total_length else 1.0
+        idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+        k1, b, lengths = self.k1, self.b, self.doc_lengths
+        impacts = {
+            doc_id: idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * lengths[doc_id] / avg_length))
+            for doc_id, tf in postings.items()
+        }
+        order = sorted(impacts, key=lambda doc_id: (-impacts[doc_id], doc_id))
+        self.impact_cache[term] = (self.version, impacts, order)
+        return impacts, order
+
+    def search(self, keyword=None, category=None, experience=None, qualification=None, limit=None,
+               experience_range=None):
+        """Return matching jobs, BM25-ranked when a keyword is given, else in insertion order"""
+        # Allowed doc ids, or None when unfiltered; intersect the smallest sets first
+        masks = []
+        if category:
+            masks.append(self.facet_mask('category', category, exact=True))
+        if experience:
+            masks.append(self.facet_mask('experience', experience))
+        if experience_range:
+            masks.append(self.range_mask(experience_range))
+        if qualification:
+            masks.append(self.facet_mask('qualification', qualification))
+        mask = None
+        if masks:
+            masks.sort(key=len)
+            mask = masks[0].intersection(*masks[1:]) if len(masks) > 1 else masks[0]
+            if not mask:
+                return []
+
+        tokens = tokenize(keyword) if keyword else []
+        if not tokens:
+            if mask is None:
+                doc_ids = (doc_id for doc_id, job in enumerate(self.docs) if job is not None)
+                if limit is not None:
+                    doc_ids = (doc_id for doc_id, _ in zip(doc_ids, range(limit)))
+            else:
+                doc_ids = sorted(mask) if limit is None else heapq.nsmallest(limit, mask)
+            return [self.docs[doc_id] for doc_id in doc_ids]
+
+        # Every keyword token must match; the last one may be a prefix ("eng" -> engineer)
+        groups = []
+        for position, token in enumerate(tokens):
+            terms = self._expand(token, prefix=position == len(tokens) - 1)
+            if not terms:
+                return []
+            groups.append(terms)
+
+        if len(groups) == 1 and len(groups[0]) == 1:
+            # Single term: walk the precomputed impact order and stop after `limit` hits
+            _, order = self._impacts(groups[0][0])
+            ranked = []
+            for doc_id in order:
+                if mask is not None and doc_id not in mask:
+                    continue
+                ranked.append(doc_id)
+                if limit is not None and len(ranked) >= limit:
+                    break
+            return [self.docs[doc_id] for doc_id in ranked]
+
+        # Removed docs are already gone from the posting lists and facet sets
+        candidates = mask
+        for terms in groups:
+            if len(terms) == 1:
+                docs = self.postings[terms[0]].keys()
+            else:
+                docs = set()
+                for term in terms:
+                    docs.update(self.postings[term])
+            if candidates is None:
+                candidates = set(docs)
+            elif len(docs) < len(candidates):
+                candidates = {doc_id for doc_id in docs if doc_id in candidates}
+            else:
+                candidates = {doc_id for doc_id in candidates if doc_id in docs}
+            if not candidates:
+                return []
+
+        scores = dict.fromkeys(candidates, 0.0)
+        for terms in groups:
+            for term in terms:
+                impacts, _ = self._impacts(term)
+                # Walk whichever side is shorter
+                if len(impacts) < len(scores):
+                    for doc_id, impact in impacts.items():
+                        if doc_id in scores:
+                            scores[doc_id] += impact
+                else:
+                    for doc_id in scores:
+                        scores[doc_id] += impacts.get(doc_id, 0.0)
+        keyed = [(-score, doc_id) for doc_id, score in scores.items()]
+        ranked = sorted(keyed) if limit is None else heapq.nsmallest(limit, keyed)
+        return [self.docs[doc_id] for _, doc_id in ranked]
@@ -0,0 +1,274 @@
+"""Versioned binary snapshots of the knowledge base for fast cold starts
+
+A snapshot is one file: an 8-byte magic, the length and bytes of a JSON
+header, then 64-byte aligned sections. Numeric sections (facet codes,
+dates, posting lists, embeddings) are raw little-endian NumPy arrays read
+through a memory map, so loading them copies nothing; text columns are
+JSON lists, which decode in one C call. Jobs, the BM25 index, the
+embedding matrix and the statistics counters are all restored as built,
+without re-parsing dates, re-tokenizing or re-embedding.
+"""
+import json
+import math
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from jobyaari_record import FACETS, JobRecord
+from jobyaari_retrieval import VectorIndex, get_embedder
+from jobyaari_search import FACET_FIELDS, JobIndex
+from jobyaari_stats import JobStats
+
+MAGIC = b'JYSNAP\x00\x00'
+SNAPSHOT_VERSION = 3
+ALIGN = 64
+TEXT_COLUMNS = ('title', 'url', 'description')
+DATE_COLUMNS = ('posted_at', 'first_seen', 'last_seen')
+# posted_date repeats ("3 days ago"), so it is stored as codes like the facets
+CODED_COLUMNS = FACET_FIELDS + ('posted_date',)
+
+
+class SnapshotError(Exception):
+    """A snapshot file is missing, corrupt or from an incompatible version"""
+
+
+def _json_bytes(value):
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def _encode_codes(values):
+    """(uint32 codes, table of distinct values) for a low-cardinality column"""
+    table, codes = [], {}
+    array = np.fromiter((codes.setdefault(value, len(codes)) for value in values), dtype=np.uint32, count=len(values))
+    table = [None] * len(codes)
+    for value, code in codes.items():
+        table[code] = value
+    return array, table
+
+
+def _encode_dates(values):
+    return np.array([math.nan if value is None else value for value in values], dtype=np.float64)
+
+
+def write_file(path, sections, meta):
+    """Write `sections` (name -> ndarray or bytes) and `meta` atomically to `path`"""
+    layout, blobs, offset = {}, [], 0
+    for name, value in sections.items():
+        if isinstance(value, np.ndarray):
+            array = np.ascontiguousarray(value)
+            data = array.tobytes()
+            layout[name] = {'offset': offset, 'nbytes': len(data), 'dtype': array.dtype.str, 'shape': list(array.shape)}
+        else:
+            data = bytes(value)
+            layout[name] = {'offset': offset, 'nbytes': len(data)}
+        blobs.append(data)
+        offset += len(data) + (-len(data) % ALIGN)
+    header = _json_bytes({'version': SNAPSHOT_VERSION, 'meta': meta, 'sections': layout})
+    prefix = MAGIC + len(header).to_bytes(8, 'little') + header
+
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(prefix + b'\0' * (-len(prefix) % ALIGN))
+            for data in blobs:
+                f.write(data)
+                f.write(b'\0' * (-len(data) % ALIGN))
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class SnapshotFile:
+    """Read access to a snapshot: `meta`, plus array() and blob() views over a memory map"""
+
+    def __init__(self, path):
+        try:
+            with open(path, 'rb') as f:
+                prefix = f.read(16)
+                if len(prefix) < 16 or prefix[:8] != MAGIC:
+                    raise SnapshotError(f"{path} is not a JobYaari snapshot")
+                header = json.loads(f.read(int.from_bytes(prefix[8:], 'little')))
+        except OSError as e:
+            raise SnapshotError(f"Cannot read snapshot {path}: {e}") from e
+        if header.get('version') != SNAPSHOT_VERSION:
+            raise SnapshotError(f"Snapshot version {header.get('version')} is not supported (expected {SNAPSHOT_VERSION})")
+        self.path = path
+        self.meta = header['meta']
+        self.sections = header['sections']
+        data_start = 16 + int.from_bytes(prefix[8:], 'little')
+        self.data_start = data_start + (-data_start % ALIGN)
+        self.buffer = np.memmap(path, dtype=np.uint8, mode='r')
+
+    def array(self, name):
+        section = self.sections[name]
+        dtype = np.dtype(section['dtype'])
+        count = section['nbytes'] // dtype.itemsize
+        array = np.frombuffer(self.buffer, dtype=dtype, count=count, offset=self.data_start + section['offset'])
+        return array.reshape(section['shape'])
+
+    def blob(self, name):
+        section = self.sections[name]
+        start = self.data_start + section['offset']
+        return self.buffer[start:start + section['nbytes']].tobytes()
+
+    def json(self, name):
+        return json.loads(self.blob(name))
+
+
+def save_snapshot(path, jobs, index, retriever, stats, embedder='hashing', fingerprint=0, generation=None):
+    """Write the knowledge base built from `jobs` (JobRecords, in index order) to `path`"""
+    positions = {id(job): position for position, job in enumerate(jobs)}
+    sections = {f'jobs.{column}': _json_bytes([job[column] for job in jobs]) for column in TEXT_COLUMNS}
+    tables = {}
+    for column in CODED_COLUMNS:
+        sections[f'jobs.{column}'], tables[column] = _encode_codes([job[column] for job in jobs])
+    for column in DATE_COLUMNS:
+        sections[f'jobs.{column}'] = _encode_dates([getattr(job, column) for job in jobs])
+
+    # Posting lists in CSR form: terms[i] owns doc_ids/tfs[term_offsets[i]:term_offsets[i + 1]]
+    terms = list(index.vocabulary)
+    lengths = [len(index.postings[term]) for term in terms]
+    doc_ids = np.fromiter((doc_id for term in terms for doc_id in index.postings[term]), dtype=np.int32,
+                          count=sum(lengths))
+    tfs = np.fromiter((tf for term in terms for tf in index.postings[term].values()), dtype=np.float64,
+                      count=sum(lengths))
+    sections.update({
+        'index.terms': _json_bytes(terms),
+        'index.term_offsets': np.concatenate([[0], np.cumsum(lengths, dtype=np.int64)]).astype(np.int64),
+        'index.doc_ids': doc_ids,
+        'index.tfs': tfs,
+        'index.doc_lengths': np.array(index.doc_lengths, dtype=np.float64),
+        'index.doc_map': np.array([-1 if doc is None else positions[id(doc)] for doc in index.docs], dtype=np.int64),
+    })
+    # Facet doc-id sets, concatenated: facets[i] = [field, value, offset, count]
+    facets, facet_doc_ids, offset = [], [], 0
+    for field, values in index.facets.items():
+        for value, doc_ids in values.items():
+            facets.append([field, value, offset, len(doc_ids)])
+            facet_doc_ids.extend(sorted(doc_ids))
+            offset += len(doc_ids)
+    sections['index.facet_doc_ids'] = np.array(facet_doc_ids, dtype=np.int32)
+
+    retriever.flush()
+    if retriever.size:
+        sections['vectors'] = retriever.vectors[:retriever.size]
+        if retriever.doc_freq is not None:
+            sections['vectors.doc_freq'] = np.asarray(retriever.doc_freq, dtype=np.int64)
+
+    meta = {
+        'created_at': time.time(),
+        'generation': generation,
+        'jobs': len(jobs),
+        'fingerprint': f"{fingerprint:016x}",
+        'embedder': embedder,
+        'vectors_jobs': [positions[id(job)] for job in retriever.jobs] if retriever.jobs != jobs else None,
+        'tables': tables,
+        'index': {'k1': index.k1, 'b': index.b, 'total_length': index.total_length, 'doc_count': index.doc_count,
+                  'facets': facets},
+        'stats': {'total': stats.total, 'by_category': stats.by_category, 'experience': stats.experience,
+                  'qualification': stats.qualification,
+                  # JSON object keys are strings, so posting days go as [day, count] pairs
+                  'posted_days': list(stats.posted.items())},
+    }
+    write_file(path, sections, meta)
+
+
+def load_jobs(snapshot):
+    tables = snapshot.meta['tables']
+    text = {column: snapshot.json(f'jobs.{column}') for column in TEXT_COLUMNS}
+    codes = {}
+    for column in FACET_FIELDS:
+        # Map the snapshot's codes onto this process's interners
+        local = np.array([FACETS[column].code(value or '') for value in tables[column]], dtype=np.uint32)
+        codes[column] = local[snapshot.array(f'jobs.{column}')].tolist() if len(local) else []
+    posted_table = [sys.intern(value) if value else value for value in tables['posted_date']]
+    posted_dates = [posted_table[code] for code in snapshot.array('jobs.posted_date').tolist()]
+    dates = {column: [None if math.isnan(value) else value for value in snapshot.array(f'jobs.{column}').tolist()]
+             for column in DATE_COLUMNS}
+    return [JobRecord.restore(*fields) for fields in zip(
+        text['title'], text['url'], posted_dates, text['description'],
+        codes['category'], codes['experience'], codes['qualification'],
+        dates['posted_at'], dates['first_seen'], dates['last_seen'])]
+
+
+def load_index(snapshot, jobs):
+    meta = snapshot.meta['index']
+    index = JobIndex(k1=meta['k1'], b=meta['b'])
+    index.docs = [None if position < 0 else jobs[position] for position in snapshot.array('index.doc_map').tolist()]
+    index.doc_lengths = snapshot.array('index.doc_lengths').tolist()
+    index.total_length = meta['total_length']
+    index.doc_count = meta['doc_count']
+    index.vocabulary = snapshot.json('index.terms')
+    offsets = snapshot.array('index.term_offsets').tolist()
+    doc_ids = snapshot.array('index.doc_ids').tolist()
+    tfs = snapshot.array('index.tfs').tolist()
+    index.postings = {term: dict(zip(doc_ids[offsets[i]:offsets[i + 1]], tfs[offsets[i]:offsets[i + 1]]))
+                      for i, term in enumerate(index.vocabulary)}
+    facet_doc_ids = snapshot.array('index.facet_doc_ids').tolist()
+    for field, value, start, count in meta['facets']:
+        index.facets[field][value] = set(facet_doc_ids[start:start + count])
+    index.version = 1
+    return index
+
+
+def load_retriever(snapshot, jobs, embedder=None):
+    retriever = VectorIndex(get_embedder(embedder or snapshot.meta['embedder']))
+    order = snapshot.meta['vectors_jobs']
+    retriever.jobs = list(jobs) if order is None else [jobs[position] for position in order]
+    if 'vectors' in snapshot.sections:
+        # Read-only memory map; adding jobs later copies it into a growable array
+        retriever.vectors = snapshot.array('vectors')
+        retriever.size = len(retriever.vectors)
+        if 'vectors.doc_freq' in snapshot.sections:
+            retriever.doc_freq = np.array(snapshot.array('vectors.doc_freq'))
+    return retriever
+
+
+def load_stats(snapshot):
+    stats = JobStats()
+    saved = snapshot.meta['stats']
+    stats.total = saved['total']
+    stats.by_category = saved['by_category']
+    stats.experience = saved['experience']
+    stats.qualification = saved['qualification']
+    stats.posted = {day: count for day, count in saved['posted_days']}
+    return stats
+
+
+def load_snapshot(path):
+    """Read a snapshot into a dict of jobs, index, retriever, stats, fingerprint and meta"""
+    snapshot = SnapshotFile(path)
+    jobs = load_jobs(snapshot)
+    return {
+        'jobs': jobs,
+        'index': load_index(snapshot, jobs),
+        'retriever': load_retriever(snapshot, jobs),
+        'stats': load_stats(snapshot),
+        'fingerprint': int(snapshot.meta['fingerprint'], 16),
+        'meta': snapshot.meta,
+    }
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Show what a knowledge base snapshot contains")
+    parser.add_argument('path', nargs='?', default='.jobyaari_cache/kb.snapshot')
+    args = parser.parse_args()
+    snapshot = SnapshotFile(args.path)
+    meta = snapshot.meta
+    print(f"{args.path}: version {SNAPSHOT_VERSION}, {meta['jobs']} jobs, store generation {meta['generation']}, "
+          f"embedder {meta['embedder']}, written {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(meta['created_at']))}")
+    for name, section in snapshot.sections.items():
+        shape = 'x'.join(map(str, section['shape'])) + f" {np.dtype(section['dtype'])}" if 'dtype' in section else 'bytes'
+        print(f"  {name:<22} {section['nbytes'] / 1e6:10.2f} MB  {shape}")
+
+
+if __name__ == "__main__":
+    main()
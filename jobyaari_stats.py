@@ -0,0 +1,119 @@
+"""Aggregate job statistics maintained incrementally as jobs come and go"""
+import threading
+import time
+
+from jobyaari_record import parse_posted_date
+
+CATEGORIES = ('Engineering', 'Science', 'Commerce', 'Education')
+
+# Posted-date histogram buckets: (label, max age in days)
+AGE_BUCKETS = (('Today', 0), ('Last 7 days', 7), ('Last 30 days', 30), ('Older', None))
+
+
+def posted_day(job, now=None):
+    """Day number (days since the epoch) a job was posted on, or None if its date can't be read"""
+    posted_at = job.get('posted_at')
+    if posted_at is None:
+        posted_at = parse_posted_date(job.get('posted_date'), now)
+    if posted_at is None:
+        return None
+    return int(posted_at // 86400)
+
+
+def posted_age_days(job, now=None):
+    """Age in whole days of a job posting, or None if its date can't be read"""
+    day = posted_day(job, now)
+    if day is None:
+        return None
+    return max(0, int((now or time.time()) // 86400) - day)
+
+
+def age_label(age):
+    if age is None:
+        return 'Unknown'
+    for label, max_age in AGE_BUCKETS:
+        if max_age is None or age <= max_age:
+            return label
+
+
+def age_bucket(job, now=None):
+    return age_label(posted_age_days(job, now))
+
+
+class JobStats:
+    """Category, experience, qualification and posted-date counters
+
+    `add`/`remove` adjust the counters in O(1) per job. Posting dates are
+    counted per day posted, which does not change as the job ages, and
+    `snapshot` turns those days into age buckets. It returns a read-only
+    dict that is rebuilt at most once per change or day, so the prompt
+    builder and sidebar can read it on every request for free.
+    """
+
+    def __init__(self, jobs=()):
+        self.total = 0
+        self.by_category = dict.fromkeys(CATEGORIES, 0)
+        self.experience = {}
+        self.qualification = {}
+        # Posting day (see posted_day) -> job count, None for unreadable dates
+        self.posted = {}
+        self.lock = threading.Lock()
+        self._snapshot = None
+        self._snapshot_day = None
+        for job in jobs:
+            self.add(job)
+
+    def __len__(self):
+        return self.total
+
+    @staticmethod
+    def _bump(counter, key, delta):
+        count = counter.get(key, 0) + delta
+        if count > 0:
+            counter[key] = count
+        else:
+            counter.pop(key, None)
+
+    def _update(self, job, delta):
+        with self.lock:
+            self.total += delta
+            category = job.get('category', 'Other')
+            if category in CATEGORIES:
+                # The fixed categories always stay listed, even at zero
+                self.by_category[category] = max(self.by_category[category] + delta, 0)
+            else:
+                self._bump(self.by_category, category, delta)
+            self._bump(self.experience, job.get('experience', 'Not Specified'), delta)
+            self._bump(self.qualification, job.get('qualification', 'Not Specified'), delta)
+            self._bump(self.posted, posted_day(job), delta)
+            self._snapshot = None
+
+    def add(self, job):
+        self._update(job, 1)
+
+    def remove(self, job):
+        self._update(job, -1)
+
+    def posted_histogram(self, today):
+        """Job counts per AGE_BUCKETS label (plus 'Unknown') as of day number `today`"""
+        counts = {}
+        for day, count in self.posted.items():
+            label = age_label(None if day is None else max(0, today - day))
+            counts[label] = counts.get(label, 0) + count
+        return {label: counts[label] for label, _ in AGE_BUCKETS + (('Unknown', None),) if label in counts}
+
+    def snapshot(self):
+        """Current counters as a dict; treat it as read-only"""
+        snapshot = self._snapshot
+        today = int(time.time() // 86400)
+        if snapshot is None or self._snapshot_day != today:
+            with self.lock:
+                snapshot = self._snapshot = {
+                    'total_jobs': self.total,
+                    'by_category': dict(self.by_category),
+                    'experience_distribution': dict(self.experience),
+                    'qualification_distribution': dict(self.qualification),
+                    'posted_date_histogram': self.posted_histogram(today),
+                }
+                self._snapshot_day = today
+        return snapshot
@@ -0,0 +1,299 @@
+"""Durable SQLite job store with FTS5 full-text search"""
+import os
+import sqlite3
+import threading
+import time
+
+from jobyaari_dedupe import job_key
+from jobyaari_search import tokenize
+
+JOB_FIELDS = ('title', 'category', 'url', 'posted_date', 'qualification', 'experience', 'description')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    job_key TEXT NOT NULL UNIQUE,
+    url TEXT NOT NULL,
+    title TEXT NOT NULL,
+    category TEXT,
+    posted_date TEXT,
+    qualification TEXT,
+    experience TEXT,
+    description TEXT,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_category ON jobs(category);
+CREATE INDEX IF NOT EXISTS idx_jobs_experience ON jobs(experience);
+CREATE INDEX IF NOT EXISTS idx_jobs_qualification ON jobs(qualification);
+CREATE INDEX IF NOT EXISTS idx_jobs_last_seen ON jobs(last_seen);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+    title, description, qualification, experience,
+    content='jobs', content_rowid='id'
+);
+CREATE TRIGGER IF NOT EXISTS jobs_ai AFTER INSERT ON jobs BEGIN
+    INSERT INTO jobs_fts(rowid, title, description, qualification, experience)
+    VALUES (new.id, new.title, new.description, new.qualification, new.experience);
+END;
+CREATE TRIGGER IF NOT EXISTS jobs_ad AFTER DELETE ON jobs BEGIN
+    INSERT INTO jobs_fts(jobs_fts, rowid, title, description, qualification, experience)
+    VALUES ('delete', old.id, old.title, old.description, old.qualification, old.experience);
+END;
+CREATE TRIGGER IF NOT EXISTS jobs_au AFTER UPDATE ON jobs BEGIN
+    INSERT INTO jobs_fts(jobs_fts, rowid, title, description, qualification, experience)
+    VALUES ('delete', old.id, old.title, old.description, old.qualification, old.experience);
+    INSERT INTO jobs_fts(rowid, title, description, qualification, experience)
+    VALUES (new.id, new.title, new.description, new.qualification, new.experience);
+END;
+"""
+
+UPSERT = """
+INSERT INTO jobs (job_key, url, title, category, posted_date, qualification, experience, description, first_seen, last_seen)
+VALUES (:job_key, :url, :title, :category, :posted_date, :qualification, :experience, :description, :seen, :seen)
+ON CONFLICT(job_key) DO UPDATE SET
+    url = excluded.url,
+    title = excluded.title,
+    category = excluded.category,
+    posted_date = excluded.posted_date,
+    qualification = excluded.qualification,
+    experience = excluded.experience,
+    description = excluded.description,
+    last_seen = excluded.last_seen
+"""
+
+SELECT_FIELDS = f"SELECT {', '.join(JOB_FIELDS)} FROM jobs WHERE job_key = ?"
+
+FILTER_COLUMNS = ('category', 'experience', 'qualification')
+
+# Bumped when job_key changes; stored rows are re-keyed on open
+KEY_VERSION = 2
+
+
+def fts_query(keyword):
+    """Quote each keyword token for FTS5; the last one matches as a prefix"""
+    tokens = tokenize(keyword)
+    if not tokens:
+        return None
+    terms = ['"%s"' % token.replace('"', '""') for token in tokens]
+    terms[-1] += '*'
+    return ' '.join(terms)
+
+
+class JobStore:
+    """Jobs persisted in SQLite, deduped by URL, with first/last seen timestamps
+
+    Each thread gets its own connection (Streamlit runs sessions on separate
+    threads); WAL mode lets readers proceed while a scrape is writing.
+    """
+
+    def __init__(self, path=".jobyaari_cache/jobs.db"):
+        self.path = path
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.local = threading.local()
+        self.write_lock = threading.Lock()
+        conn = self.connection()
+        conn.executescript(SCHEMA)
+        try:
+            existed = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'jobs_fts'").fetchone()
+            conn.executescript(FTS_SCHEMA)
+            if not existed:
+                # Index jobs stored before the full-text table was created
+                conn.execute("INSERT INTO jobs_fts(jobs_fts) VALUES ('rebuild')")
+            self.has_fts = True
+        except sqlite3.OperationalError:
+            # SQLite built without FTS5: keyword search falls back to LIKE
+            self.has_fts = False
+        conn.commit()
+        self.migrate_keys()
+
+    def connection(self):
+        conn = getattr(self.local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            if self.path != ':memory:':
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+            self.local.conn = conn
+        return conn
+
+    def migrate_keys(self):
+        """Re-key stored rows with the current job_key, keeping the latest seen row of any that now collide"""
+        with self.write_lock:
+            conn = self.connection()
+            row = conn.execute("SELECT value FROM meta WHERE key = 'key_version'").fetchone()
+            if row and int(row[0]) >= KEY_VERSION:
+                return
+            with conn:
+                keys, stale, changed = set(), [], []
+                for row in conn.execute("SELECT id, job_key, url, title FROM jobs ORDER BY last_seen DESC, id DESC"):
+                    key = job_key({'url': row['url'], 'title': row['title']})
+                    if key in keys:
+                        stale.append((row['id'],))
+                        continue
+                    keys.add(key)
+                    if key != row['job_key']:
+                        changed.append((key, row['id']))
+                conn.executemany("DELETE FROM jobs WHERE id = ?", stale)
+                # Park the changed keys first so no intermediate state violates the UNIQUE constraint
+                conn.executemany("UPDATE jobs SET job_key = '~' || id WHERE id = ?", [(id_,) for _, id_ in changed])
+                conn.executemany("UPDATE jobs SET job_key = ? WHERE id = ?", changed)
+                conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('key_version', ?)", (str(KEY_VERSION),))
+
+    def upsert(self, job, seen=None):
+        """Insert or refresh one job, return 'inserted', 'updated' (content changed) or None"""
+        inserted, updated = self.upsert_many([job], seen)
+        return 'inserted' if inserted else 'updated' if updated else None
+
+    def upsert_many(self, jobs, seen=None):
+        """Insert or refresh jobs in one transaction, return (inserted, updated) counts
+
+        `updated` counts stored jobs whose content changed; a job seen again
+        unchanged only has its last_seen refreshed. Sample jobs (`job['sample']`,
+        the scraper's fallback padding) are skipped.
+        """
+        seen = seen or time.time()
+        inserted = updated = 0
+        with self.write_lock:
+            conn = self.connection()
+            with conn:
+                for job in jobs:
+                    if job.get('sample'):
+                        # Generated sample jobs would look like real postings after a restart
+                        continue
+                    row = {field: job.get(field) for field in JOB_FIELDS}
+                    row['job_key'] = job_key(job)
+                    row['seen'] = seen
+                    stored = conn.execute(SELECT_FIELDS, (row['job_key'],)).fetchone()
+                    conn.execute(UPSERT, row)
+                    if stored is None:
+                        inserted += 1
+                    elif tuple(stored) != tuple(row[field] for field in JOB_FIELDS):
+                        updated += 1
+        return inserted, updated
+
+    def _where(self, keyword=None, category=None, experience=None, qualification=None,
+               categories=None, experiences=None, seen_since=None):
+        clauses, params = [], []
+        if category:
+            clauses.append("jobs.category = ? COLLATE NOCASE")
+            params.append(category)
+        # Experience/qualification keep search_jobs' substring semantics
+        if experience:
+            clauses.append("jobs.experience LIKE ?")
+            params.append(f"%{experience}%")
+        if qualification:
+            clauses.append("jobs.qualification LIKE ?")
+            params.append(f"%{qualification}%")
+        # Exact multi-value filters (Data Explorer) can use the column indexes
+        for column, values in (('category', categories), ('experience', experiences)):
+            if values:
+                clauses.append(f"jobs.{column} IN ({', '.join('?' * len(values))})")
+                params.extend(values)
+        if seen_since:
+            clauses.append("jobs.last_seen >= ?")
+            params.append(seen_since)
+
+        match = None
+        if keyword:
+            if self.has_fts:
+                match = fts_query(keyword)
+                if match:
+                    clauses.append("jobs_fts MATCH ?")
+                    params.append(match)
+            else:
+                clauses.append("(jobs.title LIKE ? OR jobs.description LIKE ?)")
+                params.extend([f"%{keyword}%"] * 2)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return where, params, match
+
+    def search(self, keyword=None, category=None, experience=None, qualification=None,
+               categories=None, experiences=None, seen_since=None, limit=50, offset=0):
+        """Return matching jobs as dicts, BM25-ranked when a keyword is given"""
+        where, params, match = self._where(keyword, category, experience, qualification,
+                                           categories, experiences, seen_since)
+        if match:
+            sql = f"SELECT jobs.* FROM jobs_fts JOIN jobs ON jobs.id = jobs_fts.rowid {where} ORDER BY bm25(jobs_fts), jobs.id"
+        else:
+            sql = f"SELECT jobs.* FROM jobs {where} ORDER BY jobs.id"
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params = params + [limit, offset]
+        return [self.row_to_job(row) for row in self.connection().execute(sql, params)]
+
+    def count(self, keyword=None, category=None, experience=None, qualification=None,
+              categories=None, experiences=None, seen_since=None):
+        where, params, match = self._where(keyword, category, experience, qualification,
+                                           categories, experiences, seen_since)
+        source = "jobs_fts JOIN jobs ON jobs.id = jobs_fts.rowid" if match else "jobs"
+        return self.connection().execute(f"SELECT COUNT(*) FROM {source} {where}", params).fetchone()[0]
+
+    def value_counts(self, column, seen_since=None):
+        """Number of jobs per distinct value of an indexed column"""
+        if column not in FILTER_COLUMNS:
+            raise ValueError(f"Unknown column: {column}")
+        sql = f"SELECT {column}, COUNT(*) FROM jobs"
+        params = []
+        if seen_since:
+            sql += " WHERE last_seen >= ?"
+            params.append(seen_since)
+        sql += f" GROUP BY {column} ORDER BY {column}"
+        return {value: count for value, count in self.connection().execute(sql, params)}
+
+    def iter_jobs(self, seen_since=None, batch_size=500):
+        """Stream every stored job in insertion order without loading them all at once"""
+        sql = "SELECT * FROM jobs"
+        params = []
+        if seen_since:
+            sql += " WHERE last_seen >= ?"
+            params.append(seen_since)
+        cursor = self.connection().execute(sql + " ORDER BY id", params)
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            for row in rows:
+                yield self.row_to_job(row)
+
+    def generation(self):
+        """Snapshot counter, bumped each time a completed scrape is published"""
+        row = self.connection().execute("SELECT value FROM meta WHERE key = 'generation'").fetchone()
+        return int(row[0]) if row else 0
+
+    def published_at(self):
+        row = self.connection().execute("SELECT value FROM meta WHERE key = 'published_at'").fetchone()
+        return float(row[0]) if row else None
+
+    def publish_generation(self):
+        """Mark the current contents as a new snapshot and return its generation"""
+        with self.write_lock:
+            conn = self.connection()
+            with conn:
+                row = conn.execute("SELECT value FROM meta WHERE key = 'generation'").fetchone()
+                generation = (int(row[0]) if row else 0) + 1
+                conn.executemany("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", [
+                    ('generation', str(generation)),
+                    ('published_at', str(time.time())),
+                ])
+        return generation
+
+    @staticmethod
+    def row_to_job(row):
+        job = {field: row[field] for field in JOB_FIELDS}
+        job['first_seen'] = row['first_seen']
+        job['last_seen'] = row['last_seen']
+        return job
+
+    def close(self):
+        conn = getattr(self.local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self.local.conn = None